@@ -0,0 +1,3 @@
+"""
+    Py-ABAC performance benchmarks
+"""
@@ -0,0 +1,67 @@
+"""
+    Run the benchmark suite writing machine-readable results
+
+    Usage::
+
+        python -m benchmarks [--suites pdp,compiler,conditions,collections,request,strings,startup] [--output results.json] [--quick]
+
+    Results are written as JSON along with the environment they were obtained in,
+    so that they can be tracked over time.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+
+import py_abac
+from . import bench_collections, bench_compiler, bench_conditions, bench_pdp, bench_request, bench_startup, bench_strings
+
+# Suite name mapped to (full run, quick run) keyword arguments
+SUITES = {
+    "pdp": (bench_pdp.run, {"policies": 1000, "requests": 500}, {"policies": 200, "requests": 100}),
+    "compiler": (bench_compiler.run, {"policies": 500, "requests": 200}, {"policies": 100, "requests": 50}),
+    "conditions": (bench_conditions.run, {"number": 20000}, {"number": 2000}),
+    "collections": (bench_collections.run, {"number": 2000}, {"sizes": [10, 1000], "number": 200}),
+    "request": (bench_request.run, {"requests": 1000, "repeat": 5}, {"requests": 200, "repeat": 2}),
+    "strings": (bench_strings.run, {"policies": [100, 1000], "requests": 200}, {"policies": [100], "requests": 20}),
+    "startup": (bench_startup.run, {"policies": 1000, "repeat": 5}, {"policies": 200, "repeat": 2}),
+}
+
+
+def main():  # pylint: disable=missing-docstring
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suites", default=",".join(SUITES), help="comma separated suites to run")
+    parser.add_argument("--output", help="file to write results to instead of standard output")
+    parser.add_argument("--quick", action="store_true", help="run reduced workloads, e.g. for smoke testing")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "py_abac": py_abac.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": {}
+    }
+    for suite in args.suites.split(","):
+        if suite not in SUITES:
+            parser.error("Unknown suite '{}'".format(suite))
+        run, full_kwargs, quick_kwargs = SUITES[suite]
+        print("Running {} benchmarks...".format(suite), file=sys.stderr)
+        results["results"][suite] = run(**(quick_kwargs if args.quick else full_kwargs))
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+    Benchmark of collection conditions against growing value lists
+
+    Usage::
+
+        python -m benchmarks.bench_collections [--sizes 10,100,1000,10000,100000] [--number 2000]
+"""
+
+import argparse
+import json
+import timeit
+from typing import Dict, List
+
+from py_abac.policy.compiler import compile_condition
+from py_abac.policy.conditions.schema import ConditionSchema
+
+SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def _attribute_values(size: int) -> Dict:
+    """
+        Attribute values checked against conditions with `size` values. Values
+        missing from the condition are the worst case of a list scan.
+    """
+    return {
+        "IsIn": "missing",
+        "IsNotIn": "missing",
+        "AllIn": ["role:0", "role:{}".format(size // 2), "role:{}".format(size - 1)],
+        "AllNotIn": ["role:0", "missing"],
+        "AnyIn": ["missing", "other", "role:{}".format(size - 1)],
+        "AnyNotIn": ["missing", "other"],
+    }
+
+
+def run(sizes: List[int] = None, number: int = 2000) -> Dict:
+    """
+        Run the benchmark returning nanoseconds per evaluation keyed by list size and condition
+    """
+    results = {}
+    for size in sizes or SIZES:
+        values = ["role:{}".format(idx) for idx in range(size)]
+        results[str(size)] = {}
+        for name, what in _attribute_values(size).items():
+            condition = ConditionSchema().load({"condition": name, "values": values})
+            predicate = compile_condition(condition, "subject", "$.roles")
+            is_satisfied = condition._is_satisfied  # pylint: disable=protected-access
+            interpreted = timeit.timeit(lambda: is_satisfied(what), number=number)
+            compiled = timeit.timeit(lambda: predicate(what, None), number=number)
+            # List scan the conditions performed before values were held in sets
+            members = list(values)
+            if name in ("IsIn", "IsNotIn"):
+                baseline = timeit.timeit(lambda: what in members, number=number)
+            else:
+                baseline = timeit.timeit(lambda: set(what).issubset(members), number=number)
+            results[str(size)][name] = {
+                "interpreted_ns": 1e9 * interpreted / number,
+                "compiled_ns": 1e9 * compiled / number,
+                "list_ns": 1e9 * baseline / number,
+            }
+    return results
+
+
+def main():  # pylint: disable=missing-docstring
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES))
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run([int(size) for size in args.sizes.split(",")], args.number), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+    Benchmark of compiled against interpreted policy evaluation
+
+    Usage::
+
+        python -m benchmarks.bench_compiler [--policies 500] [--requests 200] [--seed 0]
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Dict
+
+from py_abac.context import EvaluationContext
+from .generators import generate_policies, generate_requests
+
+
+def evaluate(policies, requests, compiled: bool):
+    """
+        Evaluate all policies for all requests returning elapsed seconds and number of fits
+    """
+    fitting = 0
+    start = time.perf_counter()
+    for request in requests:
+        ctx = EvaluationContext(request)
+        for policy in policies:
+            if policy.fits_compiled(ctx) if compiled else policy.fits(ctx):
+                fitting += 1
+    return time.perf_counter() - start, fitting
+
+
+def run(policies: int = 500, requests: int = 200, seed: int = 0) -> Dict:
+    """
+        Run the benchmark returning timings of both evaluation modes
+    """
+    rnd = random.Random(seed)
+    policy_set = generate_policies(policies, rnd)
+    request_stream = generate_requests(requests, rnd)
+    for policy in policy_set:
+        policy.compile()
+
+    interpreted, interpreted_fits = evaluate(policy_set, request_stream, compiled=False)
+    compiled, compiled_fits = evaluate(policy_set, request_stream, compiled=True)
+    assert interpreted_fits == compiled_fits, "Compiled evaluation gave different results"
+
+    evaluations = policies * requests
+    return {
+        "evaluations": evaluations,
+        "fitting": compiled_fits,
+        "interpreted_us": 1e6 * interpreted / evaluations,
+        "compiled_us": 1e6 * compiled / evaluations,
+        "speedup": interpreted / compiled,
+    }
+
+
+def main():  # pylint: disable=missing-docstring
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--policies", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.policies, args.requests, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+    Micro-benchmarks of single condition evaluation, interpreted and compiled
+
+    Usage::
+
+        python -m benchmarks.bench_conditions [--number 20000]
+"""
+
+import argparse
+import json
+import timeit
+from typing import Dict
+
+from py_abac.context import EvaluationContext
+from py_abac.policy.compiler import compile_condition
+from py_abac.policy.conditions.schema import ConditionSchema
+from py_abac.request import AccessRequest
+
+# Condition JSON along with attribute value it is evaluated against
+CONDITIONS = [
+    ({"condition": "Eq", "value": 2}, 2),
+    ({"condition": "Gt", "value": 2}, 3),
+    ({"condition": "Lte", "value": 2}, 3),
+    ({"condition": "Equals", "value": "Max"}, "Max"),
+    ({"condition": "Equals", "value": "max", "case_insensitive": True}, "MAX"),
+    ({"condition": "Contains", "value": "documents"}, "https://api.example.com/v1/documents/1"),
+    ({"condition": "StartsWith", "value": "https://api"}, "https://api.example.com/v1/documents/1"),
+    ({"condition": "EndsWith", "value": "/1"}, "https://api.example.com/v1/documents/1"),
+    ({"condition": "RegexMatch", "value": "^https://api\\.example\\.com/v1/.*$"}, "https://api.example.com/v1/"),
+    ({"condition": "IsIn", "values": ["employee", "manager", "admin", "auditor"]}, "auditor"),
+    ({"condition": "AllIn", "values": ["employee", "manager", "admin", "auditor"]}, ["admin", "manager"]),
+    ({"condition": "AnyIn", "values": ["employee", "manager", "admin", "auditor"]}, ["guest", "admin"]),
+    ({"condition": "IsEmpty"}, []),
+    ({"condition": "AnyOf", "values": [{"condition": "Equals", "value": "Ben"},
+                                       {"condition": "Equals", "value": "Max"}]}, "Max"),
+    ({"condition": "Not", "value": {"condition": "Equals", "value": "Ben"}}, "Max"),
+    ({"condition": "Exists"}, "Max"),
+    ({"condition": "EqualsObject", "value": {"a": 1, "b": [1, 2]}}, {"a": 1, "b": [1, 2]}),
+    ({"condition": "EqualsAttribute", "ace": "subject", "path": "$.name"}, "Max"),
+    ({"condition": "CIDR", "value": "10.0.0.0/8"}, "10.1.2.3"),
+]
+
+
+def _name(condition_json: dict) -> str:
+    options = "".join(" ({})".format(key) for key, value in sorted(condition_json.items())
+                      if key == "case_insensitive" and value)
+    return condition_json["condition"] + options
+
+
+def run(number: int = 20000) -> Dict:
+    """
+        Run the benchmark returning nanoseconds per evaluation keyed by condition
+    """
+    results = {}
+    for condition_json, value in CONDITIONS:
+        condition = ConditionSchema().load(condition_json)
+        request = AccessRequest.from_json({
+            "subject": {"id": "1", "attributes": {"name": "Max", "value": value}},
+            "resource": {"id": "1"},
+            "action": {"id": "1"}
+        })
+        ctx = EvaluationContext(request)
+        ctx.ace = "subject"
+        ctx.attribute_path = "$.value"
+        predicate = compile_condition(condition, "subject", "$.value")
+        attribute_value = ctx.attribute_value
+
+        interpreted = timeit.timeit(lambda: condition.is_satisfied(ctx), number=number)
+        compiled = timeit.timeit(lambda: predicate(attribute_value, ctx), number=number)
+        results[_name(condition_json)] = {
+            "interpreted_ns": 1e9 * interpreted / number,
+            "compiled_ns": 1e9 * compiled / number,
+        }
+    return results
+
+
+def main():  # pylint: disable=missing-docstring
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.number), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+    End-to-end benchmark of PDP decisions on each storage backend
+
+    Usage::
+
+        python -m benchmarks.bench_pdp [--policies 1000] [--requests 500] [--seed 0]
+
+    The MongoDB backend is benchmarked when a server is reachable at `MONGODB_HOST`.
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from typing import Dict, List
+
+from py_abac.pdp import PDP, EvaluationAlgorithm
+from py_abac.storage import MemoryStorage
+from .generators import generate_policies, generate_requests
+
+DEFAULT_MONGODB_HOST = "127.0.0.1:27017"
+BACKENDS = ("memory", "sql", "mongo")
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))]
+
+
+def _create_memory_storage():
+    return MemoryStorage(), lambda: None
+
+
+def _create_sql_storage():
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker, scoped_session
+    from py_abac.cache import PolicyCache
+    from py_abac.storage.sql import SQLStorage
+    from py_abac.storage.sql.model import Base
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine))
+    return SQLStorage(session, policy_cache=PolicyCache(maxsize=100000)), session.remove
+
+
+def _create_mongo_storage():
+    # pylint: disable=import-outside-toplevel
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+    from py_abac.cache import PolicyCache
+    from py_abac.storage.mongo import MongoStorage, MongoMigrationSet
+
+    client = MongoClient(os.getenv("MONGODB_HOST", DEFAULT_MONGODB_HOST), serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        return None, client.close
+    storage = MongoStorage(client, "py_abac_benchmarks", policy_cache=PolicyCache(maxsize=100000))
+    storage.collection.drop()
+    MongoMigrationSet(storage).up()
+
+    def cleanup():
+        storage.collection.drop()
+        client.close()
+
+    return storage, cleanup
+
+
+def benchmark_backend(storage, policies, requests, algorithm: EvaluationAlgorithm, compiled: bool) -> Dict:
+    """
+        Measure decision latency and throughput of a PDP using the storage
+    """
+    pdp = PDP(storage, algorithm, compiled=compiled)
+    # Warm up storage caches
+    for request in requests[:10]:
+        pdp.is_allowed(request)
+
+    latencies = []
+    allowed = 0
+    start = time.perf_counter()
+    for request in requests:
+        request_start = time.perf_counter()
+        allowed += pdp.is_allowed(request)
+        latencies.append(time.perf_counter() - request_start)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pdp.is_allowed_many(requests)
+    batch_elapsed = time.perf_counter() - start
+
+    return {
+        "policies": len(policies),
+        "requests": len(requests),
+        "allowed": allowed,
+        "throughput": len(requests) / elapsed,
+        "batch_throughput": len(requests) / batch_elapsed,
+        "latency_mean_us": 1e6 * elapsed / len(requests),
+        "latency_p50_us": 1e6 * _percentile(latencies, 50),
+        "latency_p95_us": 1e6 * _percentile(latencies, 95),
+        "latency_p99_us": 1e6 * _percentile(latencies, 99),
+    }
+
+
+def run(policies: int = 1000, requests: int = 500, seed: int = 0, backends=BACKENDS,
+        wildcard_density: float = 0.5, rule_depth: int = 1) -> Dict:
+    """
+        Run the benchmark returning results keyed by backend
+    """
+    rnd = random.Random(seed)
+    policy_set = generate_policies(policies, rnd, wildcard_density=wildcard_density, rule_depth=rule_depth)
+    request_stream = generate_requests(requests, rnd)
+    factories = {"memory": _create_memory_storage, "sql": _create_sql_storage, "mongo": _create_mongo_storage}
+
+    results = {}
+    for backend in backends:
+        storage, cleanup = factories[backend]()
+        if storage is None:
+            results[backend] = {"skipped": "backend not available"}
+            cleanup()
+            continue
+        try:
+            for policy in policy_set:
+                storage.add(policy)
+            for compiled in (False, True):
+                name = "{}{}".format(backend, "_compiled" if compiled else "")
+                results[name] = benchmark_backend(storage, policy_set, request_stream,
+                                                  EvaluationAlgorithm.DENY_OVERRIDES, compiled)
+        finally:
+            cleanup()
+    return results
+
+
+def main():  # pylint: disable=missing-docstring
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--policies", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--wildcard-density", type=float, default=0.5)
+    parser.add_argument("--rule-depth", type=int, default=1)
+    args = parser.parse_args()
+    results = run(args.policies, args.requests, args.seed, args.backends.split(","),
+                  args.wildcard_density, args.rule_depth)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
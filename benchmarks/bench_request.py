@@ -0,0 +1,75 @@
+"""
+    Benchmark of access request construction from JSON
+
+    Usage::
+
+        python -m benchmarks.bench_request [--requests 1000] [--repeat 5]
+"""
+
+import argparse
+import json
+import random
+import timeit
+from typing import Dict
+
+from marshmallow import Schema, fields, validate
+
+from py_abac.request import AccessRequest
+from .generators import generate_request_json
+
+
+class _AccessElementSchema(Schema):
+    """
+        JSON schema for access element
+    """
+    id = fields.String(required=True, validate=validate.Length(max=400))
+    attributes = fields.Dict(default={}, missing={})
+
+
+class _RequestSchema(Schema):
+    """
+        JSON schema for authorization request used by previous releases
+    """
+    subject = fields.Nested(_AccessElementSchema, required=True)
+    resource = fields.Nested(_AccessElementSchema, required=True)
+    action = fields.Nested(_AccessElementSchema, required=True)
+    context = fields.Dict(default={}, missing={})
+
+
+def _schema_load(request_json: dict) -> AccessRequest:
+    """
+        Construction path of previous releases running a full marshmallow load
+    """
+    return AccessRequest(**_RequestSchema().load(request_json))
+
+
+def run(requests: int = 1000, repeat: int = 5, seed: int = 0) -> Dict:
+    """
+        Run the benchmark returning microseconds per request keyed by construction path
+    """
+    request_jsons = generate_request_json(requests, random.Random(seed))
+    paths = {
+        "schema": _schema_load,
+        "validated": AccessRequest.from_json,
+        "trusted": lambda request_json: AccessRequest.from_json(request_json, trusted=True),
+    }
+    results = {"requests": requests}
+    for name, create in paths.items():
+        timing = min(timeit.repeat(
+            lambda: [create(request_json) for request_json in request_jsons], number=1, repeat=repeat
+        ))
+        results["{}_us".format(name)] = 1e6 * timing / requests
+    return results
+
+
+def main():  # pylint: disable=missing-docstring
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.repeat, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+    Benchmark of package import time and memory used per policy
+
+    Usage::
+
+        python -m benchmarks.bench_startup [--policies 1000] [--repeat 5]
+"""
+
+import argparse
+import gc
+import json
+import random
+import subprocess
+import sys
+import tracemalloc
+from typing import Dict
+
+from py_abac.storage import MemoryStorage
+from .generators import generate_policies
+
+_IMPORT_SCRIPT = "import time; start = time.perf_counter(); import py_abac; print(time.perf_counter() - start)"
+
+
+def import_time(repeat: int = 5) -> Dict:
+    """
+        Measure time of importing the package in fresh interpreters
+    """
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", _IMPORT_SCRIPT])
+        timings.append(float(output.decode().strip()))
+    return {"min_ms": 1e3 * min(timings), "max_ms": 1e3 * max(timings), "repeat": repeat}
+
+
+def memory_per_policy(policies: int = 1000, seed: int = 0) -> Dict:
+    """
+        Measure memory allocated per policy object and per policy held in memory storage
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        policy_set = generate_policies(policies, random.Random(seed))
+        gc.collect()
+        loaded = tracemalloc.get_traced_memory()[0]
+        for policy in policy_set:
+            policy.compile()
+        gc.collect()
+        compiled = tracemalloc.get_traced_memory()[0]
+        storage = MemoryStorage()
+        for policy in policy_set:
+            storage.add(policy)
+        gc.collect()
+        stored = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return {
+        "policies": policies,
+        "policy_bytes": (loaded - start) / policies,
+        "compiled_bytes": (compiled - loaded) / policies,
+        "memory_storage_bytes": (stored - compiled) / policies,
+    }
+
+
+def run(policies: int = 1000, repeat: int = 5, seed: int = 0) -> Dict:
+    """
+        Run the benchmark returning import time and memory results
+    """
+    return {"import": import_time(repeat), "memory": memory_per_policy(policies, seed)}
+
+
+def main():  # pylint: disable=missing-docstring
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--policies", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.policies, args.repeat, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+    Benchmark of compiled PDP decisions on policies with string conditions on the same attribute
+
+    Usage::
+
+        python -m benchmarks.bench_strings [--policies 100,1000] [--requests 200]
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+from typing import Dict, List
+
+from py_abac import PDP, Policy
+from py_abac.request import AccessRequest
+from py_abac.storage.memory import MemoryStorage
+
+POLICIES = [100, 1000]
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148",
+    "Googlebot/2.1 (+http://www.google.com/bot.html)",
+]
+
+
+def _policy_json(uid: int, rnd: random.Random) -> Dict:
+    """
+        Policy allowing admins with a user agent matching a random pattern
+    """
+    pattern = "".join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(4, 8)))
+    return {
+        "uid": str(uid),
+        "effect": rnd.choice(["allow", "deny"]),
+        "rules": {
+            "subject": {
+                "$.role": {"condition": "Equals", "value": "admin"},
+                "$.user_agent": {
+                    "condition": rnd.choice(["Contains", "StartsWith", "EndsWith"]),
+                    "value": pattern,
+                    "case_insensitive": rnd.random() < 0.5
+                }
+            }
+        },
+        "targets": {},
+        "priority": 0
+    }
+
+
+def run(policies: List[int] = None, requests: int = 200) -> Dict:
+    """
+        Run the benchmark returning microseconds per decision keyed by number of policies
+    """
+    rnd = random.Random(0)
+    results = {}
+    for count in policies or POLICIES:
+        storage = MemoryStorage()
+        for uid in range(count):
+            storage.add(Policy.from_json(_policy_json(uid, rnd)))
+        access_requests = [AccessRequest.from_json({
+            "subject": {"id": "user:{}".format(idx), "attributes": {
+                "role": "admin", "user_agent": USER_AGENTS[idx % len(USER_AGENTS)]
+            }},
+            "resource": {"id": "doc:1", "attributes": {}},
+            "action": {"id": "get", "attributes": {}},
+            "context": {}
+        }) for idx in range(requests)]
+        results[str(count)] = {}
+        for name, compiled in [("interpreted_us", False), ("compiled_us", True)]:
+            pdp = PDP(storage, compiled=compiled)
+            pdp.is_allowed(access_requests[0])
+            start = time.perf_counter()
+            for request in access_requests:
+                pdp.is_allowed(request)
+            results[str(count)][name] = 1e6 * (time.perf_counter() - start) / requests
+    return results
+
+
+def main():  # pylint: disable=missing-docstring
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--policies", default=",".join(str(count) for count in POLICIES))
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run([int(count) for count in args.policies.split(",")], args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
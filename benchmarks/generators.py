@@ -0,0 +1,182 @@
+"""
+    Seeded generators of synthetic policy sets and request streams
+"""
+
+import random
+from typing import Dict, List
+
+from py_abac.policy import Policy
+from py_abac.request import AccessRequest
+
+NAMES = ["Max", "Nina", "Ben", "Henry", "Sarah", "Jane"]
+METHODS = ["get", "create", "update", "delete", "print"]
+ROLES = ["employee", "manager", "admin", "auditor", "contractor"]
+TENANTS = 10
+
+# Relative weights of the condition kinds used in generated rules
+DEFAULT_CONDITION_MIX = {
+    "string": 4,
+    "numeric": 2,
+    "collection": 2,
+    "regex": 1,
+    "attribute": 1,
+    "network": 1,
+}
+
+
+def resource_id(tenant: int, idx: int) -> str:
+    """
+        URL-like resource ID
+    """
+    return "https://api.example.com/v1/tenants/{}/documents/{}".format(tenant, idx)
+
+
+def _target_id(rnd: random.Random, wildcard_density: float, exact: str, patterns: List[str]):
+    if rnd.random() < wildcard_density:
+        return rnd.choice(patterns)
+    return exact
+
+
+def _targets(rnd: random.Random, id_count: int, wildcard_density: float) -> dict:
+    user, tenant, doc = rnd.randrange(id_count), rnd.randrange(TENANTS), rnd.randrange(id_count)
+    return {
+        "subject_id": _target_id(rnd, wildcard_density, "user:{}".format(user),
+                                 ["*", "user:*", "user:{}*".format(user % 10)]),
+        "resource_id": _target_id(
+            rnd, wildcard_density, resource_id(tenant, doc),
+            ["*", "https://api.example.com/v1/tenants/{}/*".format(tenant),
+             "https://api.example.com/v1/tenants/*/documents/{}".format(doc),
+             "https://api.example.com/v1/tenants/{}/documents/{}?".format(tenant, doc % 10)]),
+        "action_id": _target_id(rnd, wildcard_density, rnd.choice(METHODS), ["*"]),
+    }
+
+
+def _leaf_condition(rnd: random.Random, kind: str, ace: str):
+    """
+        Create (attribute path, condition JSON) pair of given kind for access control element
+    """
+    if kind == "numeric":
+        return "$.level", {"condition": rnd.choice(["Gt", "Gte", "Lt", "Lte", "Eq"]), "value": rnd.randint(0, 10)}
+    if kind == "collection":
+        return "$.roles", {"condition": rnd.choice(["AnyIn", "AllIn", "IsIn", "AnyNotIn"]),
+                           "values": rnd.sample(ROLES, 2)}
+    if kind == "regex":
+        return "$.name", {"condition": "RegexMatch", "value": "^{}.*".format(rnd.choice(NAMES)[:2])}
+    if kind == "attribute":
+        return "$.owner", {"condition": "EqualsAttribute", "ace": "subject", "path": "$.name"}
+    if kind == "network":
+        return "$.ip", {"condition": "CIDR", "value": "10.{}.0.0/16".format(rnd.randrange(4))}
+    # String conditions
+    if ace == "action":
+        return "$.method", {"condition": "Equals", "value": rnd.choice(METHODS)}
+    return "$.name", {"condition": rnd.choice(["Equals", "StartsWith", "Contains", "EndsWith"]),
+                      "value": rnd.choice(NAMES)[:rnd.randint(2, 3)], "case_insensitive": rnd.random() < 0.3}
+
+
+def _weighted_choice(rnd: random.Random, kinds: List[str], weights: List[int]) -> str:
+    point = rnd.uniform(0, sum(weights))
+    for kind, weight in zip(kinds, weights):
+        point -= weight
+        if point <= 0:
+            return kind
+    return kinds[-1]
+
+
+def _condition(rnd: random.Random, kinds: List[str], weights: List[int], ace: str, depth: int):
+    path, condition = _leaf_condition(rnd, _weighted_choice(rnd, kinds, weights), ace)
+    for _ in range(depth):
+        logic = rnd.choice(["AllOf", "AnyOf", "Not"])
+        if logic == "Not":
+            condition = {"condition": "Not", "value": condition}
+        else:
+            other = _leaf_condition(rnd, "string", ace)[1] if path == "$.name" else {"condition": "Exists"}
+            condition = {"condition": logic, "values": [condition, other]}
+    return path, condition
+
+
+def _rules(rnd: random.Random, rule_depth: int, condition_mix: Dict[str, int]) -> dict:
+    kinds = list(condition_mix)
+    weights = [condition_mix[kind] for kind in kinds]
+    rules = {}
+    for ace in ["subject", "resource", "action", "context"]:
+        if ace == "context" and rnd.random() < 0.5:
+            continue
+        if ace == "context":
+            rules[ace] = dict([_condition(rnd, ["network"], [1], ace, 0)])
+        elif ace == "action":
+            rules[ace] = dict([_condition(rnd, ["string"], [1], ace, 0)])
+        elif rnd.random() < 0.3:
+            # Implicit OR of conditions
+            rules[ace] = [dict([_condition(rnd, kinds, weights, ace, rule_depth)]) for _ in range(2)]
+        else:
+            rules[ace] = dict(_condition(rnd, kinds, weights, ace, rule_depth) for _ in range(rnd.randint(1, 2)))
+    return rules
+
+
+def generate_policies(
+        count: int,
+        rnd: random.Random,
+        wildcard_density: float = 0.5,
+        rule_depth: int = 1,
+        condition_mix: Dict[str, int] = None,
+        id_count: int = 100
+) -> List[Policy]:
+    """
+        Generate policies with a realistic mix of targets and conditions
+
+        :param count: number of policies
+        :param rnd: seeded random number generator
+        :param wildcard_density: probability of a target ID being a wildcard pattern
+        :param rule_depth: nesting depth of logic conditions
+        :param condition_mix: relative weights of condition kinds, see `DEFAULT_CONDITION_MIX`
+        :param id_count: number of distinct subject and resource IDs targeted
+        :return: list of policies
+    """
+    condition_mix = condition_mix or DEFAULT_CONDITION_MIX
+    return [
+        Policy.from_json({
+            "uid": str(idx),
+            "effect": rnd.choice(["allow", "deny"]),
+            "rules": _rules(rnd, rule_depth, condition_mix),
+            "targets": _targets(rnd, id_count, wildcard_density),
+            "priority": rnd.randrange(3)
+        })
+        for idx in range(count)
+    ]
+
+
+def generate_request_json(count: int, rnd: random.Random, id_count: int = 100) -> List[dict]:
+    """
+        Generate access request JSON for the generated policies
+
+        :param count: number of requests
+        :param rnd: seeded random number generator
+        :param id_count: number of distinct subject and resource IDs
+        :return: list of access request JSON
+    """
+    return [
+        {
+            "subject": {"id": "user:{}".format(rnd.randrange(id_count)), "attributes": {
+                "name": rnd.choice(NAMES), "roles": rnd.sample(ROLES, 2), "level": rnd.randint(0, 10)
+            }},
+            "resource": {"id": resource_id(rnd.randrange(TENANTS), rnd.randrange(id_count)), "attributes": {
+                "name": "{}:{}".format(rnd.choice(NAMES), rnd.randrange(100)), "owner": rnd.choice(NAMES),
+                "level": rnd.randint(0, 10), "roles": rnd.sample(ROLES, 1)
+            }},
+            "action": {"id": rnd.choice(METHODS), "attributes": {"method": rnd.choice(METHODS)}},
+            "context": {"ip": "10.{}.{}.{}".format(rnd.randrange(4), rnd.randrange(256), rnd.randrange(256))}
+        }
+        for _ in range(count)
+    ]
+
+
+def generate_requests(count: int, rnd: random.Random, id_count: int = 100) -> List[AccessRequest]:
+    """
+        Generate access requests for the generated policies
+
+        :param count: number of requests
+        :param rnd: seeded random number generator
+        :param id_count: number of distinct subject and resource IDs
+        :return: list of access requests
+    """
+    return [AccessRequest.from_json(request_json) for request_json in generate_request_json(count, rnd, id_count)]
@@ -4,7 +4,8 @@
 
 import logging
 
-from .pdp import PDP, EvaluationAlgorithm
+from .cache import DecisionCache
+from .pdp import PDP, AsyncPDP, EvaluationAlgorithm
 from .policy import Policy
 from .request import AccessRequest, Request
 from .version import version_info, __version__
@@ -0,0 +1,358 @@
+"""
+    Caching utilities
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from .policy import Policy
+from .request import AccessRequest
+
+# Sentinel used to distinguish a cache miss from a cached `None` value
+_MISSING = object()
+
+
+def _sha1(data: bytes):
+    """
+        SHA-1 hash object for non-security use. Lets interpreters in FIPS mode compute
+        policy versions on Python versions supporting the :code:`usedforsecurity` flag.
+    """
+    try:
+        return hashlib.sha1(data, usedforsecurity=False)
+    except TypeError:
+        return hashlib.sha1(data)  # nosec
+
+
+class LRUCache(object):
+    """
+        Thread-safe least recently used cache with optional time-to-live for entries
+
+        :param maxsize: maximum number of entries held by the cache
+        :param ttl: number of seconds after which an entry expires. Set to None to disable expiry.
+        :param timer: monotonic clock function returning seconds
+    """
+
+    def __init__(
+            self,
+            maxsize: int = 1024,
+            ttl: float = None,
+            timer: Callable[[], float] = time.monotonic
+    ):
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Cache TTL must be positive.")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._timer = timer
+        self._lock = threading.Lock()
+        # Ordered map of key to (expiry time, value) pairs. Least recently used entries first.
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        """
+            Maximum number of entries held by the cache
+        """
+        return self._maxsize
+
+    @property
+    def ttl(self) -> float:
+        """
+            Time-to-live of cache entries in seconds
+        """
+        return self._ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+            Get value stored for key. Expired entries are treated as missing.
+
+            :param key: cache key
+            :param default: value returned when key not found
+            :return: cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires, value = entry
+            if expires is not None and expires <= self._timer():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+            Store value for key evicting the least recently used entry when full.
+
+            :param key: cache key
+            :param value: value to store
+        """
+        expires = None if self._ttl is None else self._timer() + self._ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+            Remove key from cache
+
+            :param key: cache key
+            :param default: value returned when key not found
+            :return: removed value or default
+        """
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        """
+            Remove all entries from cache
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+            Get cache statistics
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+            "maxsize": self._maxsize
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+
+class DecisionCache(object):
+    """
+        Cache of access decisions made by PDP.
+
+        Decisions are keyed on a canonical fingerprint of the access request, i.e. the target
+        IDs along with all the attributes. The cache is invalidated whenever the storage
+        used by the PDP reports a policy change.
+
+        .. note::
+
+            Attribute values returned by external attribute providers are not part of the
+            cache key. Use `ttl` to bound the staleness of decisions relying on them.
+
+        :Example:
+
+        .. code-block:: python
+
+            from py_abac import PDP
+            from py_abac.cache import DecisionCache
+
+            pdp = PDP(storage, cache=DecisionCache(maxsize=10000, ttl=60))
+
+        :param maxsize: maximum number of decisions held by the cache
+        :param ttl: number of seconds after which a decision expires. Set to None to disable expiry.
+        :param timer: monotonic clock function returning seconds
+    """
+
+    def __init__(
+            self,
+            maxsize: int = 1024,
+            ttl: float = None,
+            timer: Callable[[], float] = time.monotonic
+    ):
+        self._cache = LRUCache(maxsize, ttl, timer)
+        # Incremented on every invalidation. Used to discard decisions computed
+        # concurrently with a policy change.
+        self._generation = 0
+        # Makes checking the generation and storing a decision atomic with invalidation
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """
+            Number of times the cache got invalidated
+        """
+        return self._generation
+
+    @property
+    def hits(self) -> int:
+        """
+            Number of cache hits
+        """
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        """
+            Number of cache misses
+        """
+        return self._cache.misses
+
+    def get(self, request: AccessRequest):
+        """
+            Get cached decision for request
+
+            :param request: access request object
+            :return: True or False if decision cached else None
+        """
+        key = self.key(request)
+        if key is None:
+            return None
+        return self._cache.get(key)
+
+    def set(self, request: AccessRequest, decision: bool, generation: int = None):
+        """
+            Cache decision for request
+
+            :param request: access request object
+            :param decision: access decision
+            :param generation: cache generation observed before the decision was computed. The
+                               decision is discarded if the cache got invalidated since then.
+        """
+        key = self.key(request)
+        if key is None:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._cache.set(key, decision)
+
+    def invalidate(self, *_):
+        """
+            Remove all cached decisions. Accepts and ignores the policy UID passed by storage
+            change notifications.
+        """
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        """
+            Get cache statistics
+        """
+        rvalue = self._cache.stats()
+        rvalue["generation"] = self._generation
+        return rvalue
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def key(request: AccessRequest):
+        """
+            Compute canonical fingerprint of access request. Returns None if the request
+            attributes cannot be canonicalized, in which case the decision is not cached.
+
+            :param request: access request object
+            :return: hashable fingerprint
+        """
+        return request.fingerprint
+
+
+class PolicyCache(object):
+    """
+        Cache of deserialized policies used by storage backends to avoid building
+        policy objects for every retrieval.
+
+        Policies are keyed on their UID along with a version computed from their
+        content and stored by the backend next to the policy. A changed policy thus
+        gets a new version and is deserialized again, even when changed by another
+        process. Superseded versions are evicted as least recently used entries.
+
+        .. note::
+
+            Cached policies are shared between all callers and must be treated as read-only.
+
+        :Example:
+
+        .. code-block:: python
+
+            from py_abac.cache import PolicyCache
+            from py_abac.storage import SQLStorage
+
+            storage = SQLStorage(scoped_session=session, policy_cache=PolicyCache(maxsize=10000))
+
+        :param maxsize: maximum number of policies held by the cache
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._cache = LRUCache(maxsize)
+
+    @property
+    def hits(self) -> int:
+        """
+            Number of cache hits
+        """
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        """
+            Number of cache misses
+        """
+        return self._cache.misses
+
+    def get(self, uid: str, version: str):
+        """
+            Get cached policy
+
+            :param uid: policy UID
+            :param version: policy version
+            :return: policy object if cached else None
+        """
+        return self._cache.get((uid, version))
+
+    def set(self, uid: str, version: str, policy: Policy):
+        """
+            Cache policy
+
+            :param uid: policy UID
+            :param version: policy version
+            :param policy: policy object
+        """
+        self._cache.set((uid, version), policy)
+
+    def clear(self):
+        """
+            Remove all cached policies
+        """
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """
+            Get cache statistics
+        """
+        return self._cache.stats()
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def version(policy_json: dict) -> str:
+        """
+            Compute version of policy from its JSON representation
+
+            :param policy_json: policy JSON
+            :return: hex digest of canonical policy JSON
+        """
+        content = json.dumps(policy_json, sort_keys=True, separators=(",", ":"))
+        return _sha1(content.encode("utf-8")).hexdigest()
@@ -2,32 +2,82 @@
     PDP policy evaluation context
 """
 
+import asyncio
+import copy
 import logging
-from typing import List, Any
+import time
+from concurrent.futures import Executor, Future, TimeoutError as FutureTimeoutError
+from typing import List, Any, Dict, Hashable, Iterable, Set, Tuple, Union
 
-from .provider.base import AttributeProvider
+from .exceptions import AttributeResolutionTimeoutError
+from .instrumentation import DecisionStats
+from .provider.base import AttributeProvider, AsyncAttributeProvider, BulkAttributeProvider
 from .provider.request import RequestAttributeProvider
 from .request import AccessRequest
 
 LOG = logging.getLogger(__name__)
 
+# Minimum length of string attribute values whose lower case is kept by context
+_MIN_FOLDED_LENGTH = 128
+
 
 class EvaluationContext(object):
     """
         Evaluation context class
     """
 
-    def __init__(self, request: AccessRequest, providers: List[AttributeProvider] = None):
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            request: AccessRequest,
+            providers: List[AttributeProvider] = None,
+            subject_attributes: Dict[str, Any] = None,
+            stats: DecisionStats = None,
+            executor: Executor = None,
+            deadline: float = None,
+            fail_closed: bool = True
+    ):
         """
             Initialize evaluation context object
 
             :param request: request object
+            :param providers: list of attribute providers
+            :param subject_attributes: optional store of resolved subject attribute values keyed
+                                       by attribute path. The store can be shared between
+                                       contexts evaluating the same subject.
+            :param stats: optional measurements of the decision recording provider calls
+                          and condition evaluations
+            :param executor: optional executor calling attribute providers concurrently
+            :param deadline: time in terms of :func:`time.monotonic` by which providers called by
+                             the executor must resolve attributes
+            :param fail_closed: raise :class:`AttributeResolutionTimeoutError` when the deadline is
+                                exceeded. Otherwise attributes not resolved in time are treated as
+                                missing.
         """
         self._subject_id = request.subject_id
         self._resource_id = request.resource_id
         self._action_id = request.action_id
-        self._request_provider = RequestAttributeProvider(request)
+        self._request = request
+        # Created on first attribute lookup, so that requests without candidate
+        # policies do not pay for it.
+        self._request_provider = None
         self._other_providers = providers or []
+        self._subject_attributes = subject_attributes
+        self._stats = stats
+        # Attribute values resolved ahead of evaluation by bulk attribute providers keyed
+        # by (provider ID, ace, attribute path)
+        self._bulk_values = {}
+        # Attribute values, including missing ones, resolved during evaluation keyed
+        # by (ace, attribute path)
+        self._attribute_values = {}
+        # Lower case of string attribute values compared case insensitively
+        self._folded_values = {}
+        # Keys of string index patterns found in attribute values keyed by
+        # (string index matcher, value)
+        self._string_matches = {}
+        self._executor = executor
+        self._deadline = deadline
+        self._fail_closed = fail_closed
 
         # Access control element being evaluated
         self._ace = None
@@ -58,6 +108,13 @@ class EvaluationContext(object):
         """
         return self._action_id
 
+    @property
+    def stats(self) -> DecisionStats:
+        """
+            Measurements of the decision or None if decision is not instrumented
+        """
+        return self._stats
+
     @property
     def ace(self) -> str:
         """
@@ -101,21 +158,311 @@ class EvaluationContext(object):
             :param attribute_path: attribute path in ObjectPath format
             :return: attribute value
         """
-        rvalue = self._request_provider.get_attribute_value(ace, attribute_path, self)
+        key = (ace, attribute_path)
+        try:
+            return self._attribute_values[key]
+        except KeyError:
+            pass
+        # Lookups made by attribute providers skip the providers being called, so
+        # only values resolved by the full provider chain are memoized.
+        outermost = len(self._provider_call_stack) == 1
+        if ace == "subject" and self._subject_attributes is not None and outermost:
+            if attribute_path not in self._subject_attributes:
+                self._subject_attributes[attribute_path] = self._get_attribute_value(
+                    ace, attribute_path)
+            value = self._subject_attributes[attribute_path]
+        else:
+            value = self._get_attribute_value(ace, attribute_path)
+        if outermost:
+            self._attribute_values[key] = value
+        return value
+
+    def fold_case(self, value: str) -> str:
+        """
+            Get lower case of string attribute value. Each string is folded once per
+            context however many case insensitive conditions compare it. Short strings
+            are folded right away as that costs less than looking them up.
+
+            :param value: string value
+            :return: lower case string
+        """
+        if len(value) < _MIN_FOLDED_LENGTH:
+            return value.lower()
+        try:
+            return self._folded_values[value]
+        except KeyError:
+            folded = self._folded_values[value] = value.lower()
+            return folded
+
+    def match_strings(self, index, value: str) -> Set[Hashable]:
+        """
+            Get keys of string index patterns found in string attribute value. Each
+            value is scanned once per context by the matcher current at the time.
+
+            :param index: string index, see :class:`py_abac.policy.string_index.StringIndex`
+            :param value: string value
+            :return: set of keys
+        """
+        key = (index.automaton, value)
+        try:
+            return self._string_matches[key]
+        except KeyError:
+            matched = self._string_matches[key] = key[0].match(value)
+            return matched
+
+    def _get_attribute_value(self, ace: str, attribute_path: str):
+        """
+            Lookup attribute value from request followed by other attribute providers
+        """
+        rvalue = self._get_request_attribute_value(ace, attribute_path)
         # If attribute value not found then check other attribute providers
+        if rvalue is None and self._executor is not None and self._other_providers:
+            return self._get_provider_value_concurrently(ace, attribute_path)
         if rvalue is None:
             # Providers are checked in order
             for provider in self._other_providers:
+                # Use value prefetched by bulk attribute provider
+                if self._bulk_values and (id(provider), ace, attribute_path) in self._bulk_values:
+                    rvalue = self._bulk_values[(id(provider), ace, attribute_path)]
                 # To prevent infinite recursion skip provider if already in call stack.
-                if provider not in self._provider_call_stack:
+                elif provider not in self._provider_call_stack:
                     # Append provider to call-stack
                     self._provider_call_stack.append(provider)
                     # Call attribute provider
-                    rvalue = provider.get_attribute_value(ace, attribute_path, self)
+                    if self._stats is None:
+                        rvalue = provider.get_attribute_value(ace, attribute_path, self)
+                    else:
+                        rvalue = self._call_provider_instrumented(provider, ace, attribute_path)
                     # Pop provider from call-stack
                     self._provider_call_stack.pop()
-                    if rvalue is not None:
-                        # Return attribute value for the very first provider which has the value.
-                        # Other providers are not checked.
-                        return rvalue
+                if rvalue is not None:
+                    # Return attribute value for the very first provider which has the value.
+                    # Other providers are not checked.
+                    return rvalue
+        return rvalue
+
+    def _get_provider_value_concurrently(self, ace: str, attribute_path: str):
+        """
+            Call attribute providers concurrently using the executor. The value of the very
+            first provider in order having it is returned, waiting for providers before it
+            until the deadline.
+        """
+        calls = self._submit_provider_calls(ace, attribute_path)
+        try:
+            for provider, call in calls:
+                if not isinstance(call, Future):
+                    rvalue = call
+                else:
+                    timeout = None if self._deadline is None else \
+                        max(self._deadline - time.monotonic(), 0.0)
+                    try:
+                        rvalue, duration = call.result(timeout)
+                    except FutureTimeoutError:
+                        if self._fail_closed:
+                            raise AttributeResolutionTimeoutError(ace, attribute_path)
+                        LOG.warning("Attribute provider %s exceeded deadline resolving %s of %s.",
+                                    provider, attribute_path, ace)
+                        continue
+                    if self._stats is not None:
+                        self._stats.record_provider_call(provider, duration)
+                if rvalue is not None:
+                    return rvalue
+            return None
+        finally:
+            # Providers after the one having the value are not needed
+            for _, call in calls:
+                if isinstance(call, Future):
+                    call.cancel()
+
+    def _submit_provider_calls(self, ace: str, attribute_path: str) -> List[Tuple]:
+        """
+            Submit calls of attribute providers to the executor. Returns (provider, call)
+            pairs in order of providers, where the call is either the future of the call
+            or the value prefetched by the bulk attribute provider.
+        """
+        calls = []
+        for provider in self._other_providers:
+            key = (id(provider), ace, attribute_path)
+            if self._bulk_values and key in self._bulk_values:
+                calls.append((provider, self._bulk_values[key]))
+            # To prevent infinite recursion skip provider if already in call stack.
+            elif provider not in self._provider_call_stack:
+                future = self._executor.submit(self._call_provider, provider, ace, attribute_path)
+                calls.append((provider, future))
+        return calls
+
+    def _call_provider(self, provider: AttributeProvider, ace: str, attribute_path: str):
+        """
+            Call attribute provider from executor thread returning its value and the
+            duration of the call
+        """
+        start = time.perf_counter()
+        rvalue = provider.get_attribute_value(ace, attribute_path, self._provider_context(provider))
+        return rvalue, time.perf_counter() - start
+
+    def _provider_context(self, provider: AttributeProvider) -> "EvaluationContext":
+        """
+            Get view of the context for attribute provider called from executor thread,
+            which resolves attributes the provider asks for sequentially
+        """
+        ctx = copy.copy(self)
+        vars(ctx).update(
+            _provider_call_stack=self._provider_call_stack + [provider],
+            _executor=None
+        )
+        return ctx
+
+    def prefetch_attributes(self, refs: Iterable[Tuple[str, str]]):
+        """
+            Resolve values of given attributes missing in the request using bulk attribute
+            providers, calling each provider once per access control element. Prefetched
+            values are used in place of calling the providers during evaluation, so that
+            attribute values are still taken from the first provider having them.
+
+            :param refs: iterable of (access control element, attribute path) pairs
+        """
+        providers = [provider for provider in self._other_providers
+                     if isinstance(provider, BulkAttributeProvider)]
+        if not providers:
+            return
+        # Attribute paths per access control element not found in the request
+        missing = {}
+        for ace, attribute_path in set(refs):
+            if ace == "subject" and self._subject_attributes is not None and \
+                    attribute_path in self._subject_attributes:
+                continue
+            try:
+                if self._get_request_attribute_value(ace, attribute_path) is not None:
+                    continue
+            # Invalid attributes are reported when evaluated
+            except Exception:  # pylint: disable=broad-except
+                continue
+            missing.setdefault(ace, set()).add(attribute_path)
+
+        for provider in providers:
+            for ace, attribute_paths in missing.items():
+                if not attribute_paths:
+                    continue
+                attribute_paths = sorted(attribute_paths)
+                self._provider_call_stack.append(provider)
+                start = time.perf_counter()
+                values = provider.get_attribute_values(ace, attribute_paths, self)
+                if self._stats is not None:
+                    self._stats.record_provider_call(provider, time.perf_counter() - start)
+                self._provider_call_stack.pop()
+                for attribute_path in attribute_paths:
+                    value = values.get(attribute_path)
+                    self._bulk_values[(id(provider), ace, attribute_path)] = value
+                    # Attributes found need not be requested from following providers
+                    if value is not None:
+                        missing[ace].discard(attribute_path)
+
+    def _get_request_attribute_value(self, ace: str, attribute_path: str):
+        """
+            Lookup attribute value from request
+        """
+        if self._request_provider is None:
+            self._request_provider = RequestAttributeProvider(self._request)
+        return self._request_provider.get_attribute_value(ace, attribute_path, self)
+
+    def _call_provider_instrumented(
+            self,
+            provider: AttributeProvider,
+            ace: str,
+            attribute_path: str
+    ):
+        """
+            Call attribute provider recording the call in decision measurements. Only
+            the duration of outermost provider calls is recorded, as it includes the
+            durations of calls nested within.
+        """
+        start = time.perf_counter()
+        rvalue = provider.get_attribute_value(ace, attribute_path, self)
+        # Call stack holds a sentinel followed by the provider being called
+        outermost = len(self._provider_call_stack) == 2
+        duration = time.perf_counter() - start if outermost else 0.0
+        self._stats.record_provider_call(provider, duration)
         return rvalue
+
+
+class AsyncEvaluationContext(EvaluationContext):
+    """
+        Evaluation context used by :class:`AsyncPDP`. Attribute values referred by the
+        candidate policies are resolved ahead of evaluation by awaiting attribute
+        providers concurrently, after which policies are evaluated synchronously
+        against the resolved values.
+    """
+
+    def __init__(
+            self,
+            request: AccessRequest,
+            providers: List[Union[AttributeProvider, AsyncAttributeProvider]] = None,
+            stats: DecisionStats = None
+    ):
+        """
+            Initialize evaluation context object
+
+            :param request: request object
+            :param providers: list of synchronous and asyncio attribute providers
+            :param stats: optional measurements of the decision
+        """
+        providers = providers or []
+        # Only synchronous providers can be called for attributes which have not been prefetched
+        super().__init__(
+            request,
+            [provider for provider in providers if isinstance(provider, AttributeProvider)],
+            stats=stats
+        )
+        self._providers = providers
+        # Attribute values resolved by prefetch keyed by (ace, attribute path)
+        self._prefetched = {}
+
+    async def prefetch(self, refs: Iterable[Tuple[str, str]]):
+        """
+            Concurrently resolve values of given attributes
+
+            :param refs: iterable of (access control element, attribute path) pairs
+        """
+        refs = [ref for ref in set(refs) if ref not in self._prefetched]
+        values = await asyncio.gather(
+            *[self._resolve(ace, attribute_path) for ace, attribute_path in refs])
+        self._prefetched.update(zip(refs, values))
+
+    async def _resolve(self, ace: str, attribute_path: str):
+        """
+            Resolve attribute value from request followed by other attribute providers
+        """
+        rvalue = self._get_request_attribute_value(ace, attribute_path)
+        if rvalue is not None:
+            return rvalue
+        # Providers are checked in order and the very first value found is returned
+        for provider in self._providers:
+            if isinstance(provider, AsyncAttributeProvider):
+                rvalue = await provider.get_attribute_value(ace, attribute_path, self)
+            elif (id(provider), ace, attribute_path) in self._bulk_values:
+                rvalue = self._bulk_values[(id(provider), ace, attribute_path)]
+                if rvalue is not None:
+                    return rvalue
+                continue
+            elif provider not in self._provider_call_stack:
+                self._provider_call_stack.append(provider)
+                rvalue = provider.get_attribute_value(ace, attribute_path, self)
+                self._provider_call_stack.pop()
+            else:
+                continue
+            if self._stats is not None:
+                # Resolved concurrently, so the duration is recorded for the whole prefetch
+                self._stats.record_provider_call(provider)
+            if rvalue is not None:
+                return rvalue
+        return None
+
+    def _get_attribute_value(self, ace: str, attribute_path: str):
+        """
+            Lookup prefetched attribute value. Falls back to the request and synchronous
+            attribute providers for attributes not prefetched.
+        """
+        key = (ace, attribute_path)
+        if key in self._prefetched:
+            return self._prefetched[key]
+        return super()._get_attribute_value(ace, attribute_path)
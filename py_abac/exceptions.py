@@ -47,3 +47,16 @@ class InvalidAttributePathError(Exception):
         super().__init__(
             "Invalid attribute path '{}'. Path required in ObjectPath format.".format(path)
         )
+
+
+class AttributeResolutionTimeoutError(Exception):
+    """
+        Error occurred when attribute providers did not resolve an attribute before
+        the decision deadline
+    """
+
+    def __init__(self, ace, path):
+        super().__init__(
+            "Attribute '{}' of access control element '{}' not resolved before deadline.".format(
+                path, ace)
+        )
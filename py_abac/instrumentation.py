@@ -0,0 +1,153 @@
+"""
+    PDP instrumentation hooks
+"""
+
+import logging
+from typing import Any, Dict
+
+from .request import AccessRequest
+
+LOG = logging.getLogger(__name__)
+
+# Phases of a decision whose durations are measured. Durations of the
+# evaluation phase include the durations of the providers phase.
+PHASES = ("total", "context", "storage", "evaluation", "providers")
+
+
+class DecisionStats(object):
+    """
+        Measurements of a single access decision reported to :class:`Instrument`.
+
+        Durations are in seconds and keyed by phase:
+
+        * :code:`total` - whole decision including decision cache lookup
+        * :code:`context` - creation of evaluation context from the access request
+        * :code:`storage` - retrieval of candidate policies from storage, including
+          lazily streamed policies
+        * :code:`evaluation` - evaluation of candidate policies' targets and rules
+        * :code:`providers` - calls of attribute providers other than the request
+
+        Time not accounted to any phase other than :code:`total` is spent by the
+        evaluation algorithm combining the policies.
+
+        :param request: access request being decided
+    """
+    __slots__ = ("request", "decision", "cached", "durations", "candidates", "evaluated",
+                 "fitting", "provider_calls", "provider_failures", "short_circuits",
+                 "condition_evaluations")
+
+    def __init__(self, request: AccessRequest):
+        self.request = request
+        # Access decision
+        self.decision = None
+        # Whether decision was served from decision cache
+        self.cached = False
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        # Number of candidate policies fetched from storage
+        self.candidates = 0
+        # Number of policies evaluated and fitting the request
+        self.evaluated = 0
+        self.fitting = 0
+        # Number of calls per attribute provider class name
+        self.provider_calls = {}
+        # Number of failed calls and of calls skipped by open circuit breakers
+        # per attribute provider class name
+        self.provider_failures = {}
+        self.short_circuits = {}
+        # Number of conditions evaluated
+        self.condition_evaluations = 0
+
+    def record_provider_call(self, provider: Any, duration: float = 0.0):
+        """
+            Record call of attribute provider
+
+            :param provider: called attribute provider
+            :param duration: duration of call in seconds
+        """
+        name = type(provider).__name__
+        self.provider_calls[name] = self.provider_calls.get(name, 0) + 1
+        self.durations["providers"] += duration
+
+    def record_provider_failure(self, provider: Any):
+        """
+            Record failed or slow call of attribute provider
+
+            :param provider: failed attribute provider
+        """
+        name = type(provider).__name__
+        self.provider_failures[name] = self.provider_failures.get(name, 0) + 1
+
+    def record_short_circuit(self, provider: Any):
+        """
+            Record attribute provider call skipped due to open circuit breaker
+
+            :param provider: skipped attribute provider
+        """
+        name = type(provider).__name__
+        self.short_circuits[name] = self.short_circuits.get(name, 0) + 1
+
+    def to_dict(self) -> Dict:
+        """
+            Get measurements as dictionary, e.g. for logging
+        """
+        return {
+            "subject_id": self.request.subject_id,
+            "resource_id": self.request.resource_id,
+            "action_id": self.request.action_id,
+            "decision": self.decision,
+            "cached": self.cached,
+            "durations": dict(self.durations),
+            "candidates": self.candidates,
+            "evaluated": self.evaluated,
+            "fitting": self.fitting,
+            "provider_calls": dict(self.provider_calls),
+            "provider_failures": dict(self.provider_failures),
+            "short_circuits": dict(self.short_circuits),
+            "condition_evaluations": self.condition_evaluations,
+        }
+
+
+class Instrument(object):
+    """
+        Base class of PDP instrumentation hooks. Subclasses receive measurements of
+        every decision made by the PDP, e.g. to export them as metrics.
+
+        :Example:
+
+        .. code-block:: python
+
+            from py_abac import PDP
+            from py_abac.instrumentation import Instrument
+
+            class StorageLatency(Instrument):
+                def on_decision(self, stats):
+                    histogram.observe(stats.durations["storage"])
+
+            pdp = PDP(storage, instrument=StorageLatency())
+
+        Decisions of PDPs without an instrument are not measured at all.
+    """
+
+    def on_decision(self, stats: DecisionStats):
+        """
+            Called after every decision
+
+            :param stats: measurements of the decision
+        """
+
+
+class SlowDecisionLogger(Instrument):
+    """
+        Instrument logging measurements of decisions taking at least given time
+
+        :param threshold: minimum duration of logged decisions in seconds
+        :param level: logging level
+    """
+
+    def __init__(self, threshold: float, level: int = logging.WARNING):
+        self.threshold = threshold
+        self.level = level
+
+    def on_decision(self, stats: DecisionStats):
+        if stats.durations["total"] >= self.threshold:
+            LOG.log(self.level, "Slow access decision: %s", stats.to_dict())
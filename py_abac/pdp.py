@@ -2,13 +2,27 @@
     Policy decision point implementation
 """
 
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import Executor
 from enum import Enum
-from typing import List
+from itertools import groupby
+from typing import List, Iterable, Union
 
-from .context import EvaluationContext
-from .provider.base import AttributeProvider
+from .cache import DecisionCache
+from .context import EvaluationContext, AsyncEvaluationContext
+from .exceptions import AttributeResolutionTimeoutError
+from .instrumentation import DecisionStats, Instrument
+from .policy import Policy
+from .policy.optimizer import RuleStatistics
+from .policy.string_index import StringConditionIndex
+from .provider.base import AttributeProvider, AsyncAttributeProvider
 from .request import AccessRequest
-from .storage.base import StorageBase
+from .storage.base import StorageBase, AsyncStorageBase
+
+LOG = logging.getLogger(__name__)
 
 
 class EvaluationAlgorithm(Enum):
@@ -20,7 +34,240 @@ class EvaluationAlgorithm(Enum):
     HIGHEST_PRIORITY = "highest_priority"
 
 
-class PDP(object):
+class _PDPBase(object):
+    """
+        Functionality common to synchronous and asynchronous policy decision points
+    """
+    _storage_types = (StorageBase,)
+    _provider_types = (AttributeProvider,)
+    # Optional features passed as keyword arguments along with their defaults
+    _options = {
+        "cache": None,
+        "compiled": False,
+        "instrument": None,
+        "prefetch": False,
+        "statistics": None
+    }
+
+    def __init__(self,
+                 storage: Union[StorageBase, AsyncStorageBase],
+                 algorithm: EvaluationAlgorithm = EvaluationAlgorithm.DENY_OVERRIDES,
+                 providers: List[Union[AttributeProvider, AsyncAttributeProvider]] = None,
+                 **options):
+        options = self._get_options(options)
+        cache = options["cache"]
+        compiled = options["compiled"]
+        instrument = options["instrument"]
+        statistics = options["statistics"]
+        if not isinstance(storage, self._storage_types):
+            raise TypeError("Invalid type '{}' for storage.".format(type(storage)))
+        if not isinstance(algorithm, EvaluationAlgorithm):
+            raise TypeError("Invalid type '{}' for evaluation algorithm.".format(type(algorithm)))
+        self._storage = storage
+        self._algorithm = algorithm.value
+        self._providers = providers or []
+        for provider in self._providers:
+            if not isinstance(provider, self._provider_types):
+                raise TypeError("Invalid type '{}' for attribute provider.".format(type(provider)))
+        if cache is not None and not isinstance(cache, DecisionCache):
+            raise TypeError("Invalid type '{}' for decision cache.".format(type(cache)))
+        self._cache = cache
+        if self._cache is not None:
+            self._storage.subscribe(self._cache.invalidate)
+        self._compiled = compiled
+        # Compiled evaluation skips policies whose required string conditions fail
+        # after matching each string attribute against all their patterns at once
+        self._string_index = None
+        if compiled:
+            self._string_index = StringConditionIndex()
+            self._storage.subscribe(self._string_index.remove)
+        self._prefetch = options["prefetch"]
+        if instrument is not None and not isinstance(instrument, Instrument):
+            raise TypeError("Invalid type '{}' for instrument.".format(type(instrument)))
+        self._instrument = instrument
+        if statistics is not None and not isinstance(statistics, RuleStatistics):
+            raise TypeError("Invalid type '{}' for rule statistics.".format(type(statistics)))
+        self._statistics = statistics
+
+    def _get_options(self, options: dict) -> dict:
+        """
+            Get options of PDP with defaults for those not given
+        """
+        for name in options:
+            if name not in self._options:
+                raise TypeError("Invalid option '{}' for {}.".format(name, type(self).__name__))
+        return dict(self._options, **options)
+
+    @property
+    def cache(self) -> DecisionCache:
+        """
+            Decision cache used by PDP
+        """
+        return self._cache
+
+    @property
+    def instrument(self) -> Instrument:
+        """
+            Instrumentation hook used by PDP
+        """
+        return self._instrument
+
+    def _report(self, stats: DecisionStats, decision: bool, start: float):
+        """
+            Complete decision measurements and report them to the instrument
+        """
+        stats.decision = decision
+        stats.durations["total"] = time.perf_counter() - start
+        self._instrument.on_decision(stats)
+
+    def _evaluate(self, ctx: EvaluationContext, policies: Iterable[Policy]):
+        """
+            Evaluate candidate policies for the request in evaluation context
+
+            :param ctx: evaluation context
+            :param policies: candidate policies returned by storage
+            :return: True if authorized else False
+        """
+        # Get appropriate evaluation algorithm handler
+        evaluate = getattr(self, "_{}".format(self._algorithm))
+        return evaluate(policies, ctx)
+
+    def _prefetch_attributes(
+            self,
+            ctx: EvaluationContext,
+            policies: Iterable[Policy]
+    ) -> Iterable[Policy]:
+        """
+            Prefetch attributes referred by candidate policies from bulk attribute providers
+            if enabled. Candidate policies are then retrieved from storage at once.
+        """
+        if not self._prefetch:
+            return policies
+        policies = list(policies)
+        ctx.prefetch_attributes(ref for policy in policies for ref in policy.attribute_refs())
+        return policies
+
+    def _fits(self, policy: Policy, ctx: EvaluationContext) -> bool:
+        """
+            Check if the request fits policy using compiled or interpreted rules
+        """
+        # Compiled rules are compiled again once their plan changes
+        if self._statistics is not None and not policy.rules.is_optimized(self._statistics):
+            policy.rules.optimize(self._statistics)
+        if ctx.stats is not None:
+            return self._fits_instrumented(policy, ctx)
+        if self._compiled:
+            return not self._string_index.excludes(policy, ctx) and policy.fits_compiled(ctx)
+        return policy.fits(ctx)
+
+    def _fits_instrumented(self, policy: Policy, ctx: EvaluationContext) -> bool:
+        """
+            Check if the request fits policy recording the evaluation in decision measurements
+        """
+        stats = ctx.stats
+        start = time.perf_counter()
+        if self._compiled:
+            fits = not self._string_index.excludes(policy, ctx) and policy.fits_compiled(ctx)
+        else:
+            fits = policy.fits(ctx)
+        stats.durations["evaluation"] += time.perf_counter() - start
+        stats.evaluated += 1
+        if fits:
+            stats.fitting += 1
+        return fits
+
+    def _report_cached(self, requests: List[AccessRequest], decisions: List[bool]):
+        """
+            Report decisions of a batch served from decision cache
+        """
+        for request, decision in zip(requests, decisions):
+            if decision is not None:
+                stats = DecisionStats(request)
+                stats.cached = True
+                self._report(stats, decision, time.perf_counter())
+
+    @staticmethod
+    def _stream_instrumented(policies: Iterable[Policy], stats: DecisionStats) -> Iterable[Policy]:
+        """
+            Stream candidate policies recording their retrieval in decision measurements
+        """
+        policies = iter(policies)
+        while True:
+            start = time.perf_counter()
+            policy = next(policies, None)
+            stats.durations["storage"] += time.perf_counter() - start
+            if policy is None:
+                return
+            stats.candidates += 1
+            yield policy
+
+    def _allow_overrides(self, policies: Iterable[Policy], ctx: EvaluationContext):
+        """
+            Allow overrides evaluation algorithm. Deny policies cannot change the
+            decision and thus are never evaluated. Evaluation stops at the first
+            fitting allow policy.
+
+            :param policies: candidate policies to evaluate
+            :param ctx: evaluation context
+            :return: True if request is authorized else False
+        """
+        for policy in policies:
+            if policy.is_allowed and self._fits(policy, ctx):
+                return True
+        return False
+
+    def _deny_overrides(self, policies: Iterable[Policy], ctx: EvaluationContext):
+        """
+            Deny overrides evaluation algorithm. Evaluation stops at the first fitting
+            deny policy.
+
+            :param policies: candidate policies to evaluate
+            :param ctx: evaluation context
+            :return: True if request is authorized else False
+        """
+        return bool(self._combine_deny_overrides(policies, ctx))
+
+    def _highest_priority(self, policies: Iterable[Policy], ctx: EvaluationContext):
+        """
+            Highest priority evaluation algorithm. Deny overrides is applied to the
+            fitting policies of highest priority. Policies are expected in order of
+            descending priority so that lower priority policies are evaluated only if
+            none of higher priority fit.
+
+            :param policies: candidate policies ordered by descending priority
+            :param ctx: evaluation context
+            :return: True if request is authorized else False
+        """
+        for _, group in groupby(policies, key=lambda policy: policy.priority):
+            decision = self._combine_deny_overrides(group, ctx)
+            if decision is not None:
+                return decision
+        return False
+
+    def _combine_deny_overrides(self, policies: Iterable[Policy], ctx: EvaluationContext):
+        """
+            Combine policies using deny overrides. Deny policies are evaluated as they
+            stream in while allow policies are deferred, as any fitting deny policy
+            makes their evaluation unnecessary.
+
+            :param policies: candidate policies to evaluate
+            :param ctx: evaluation context
+            :return: True if allowed, False if denied and None if no policy fits
+        """
+        deferred = []
+        for policy in policies:
+            if not policy.is_allowed:
+                if self._fits(policy, ctx):
+                    return False
+            else:
+                deferred.append(policy)
+        for policy in deferred:
+            if self._fits(policy, ctx):
+                return True
+        return None
+
+
+class PDP(_PDPBase):
     """
         Policy decision point
 
@@ -51,22 +298,46 @@ class PDP(object):
         :param storage: policy storage
         :param algorithm: policy evaluation algorithm
         :param providers: list of attribute providers
+
+        Optional features are enabled by keyword arguments:
+
+        :param cache: optional decision cache. The cache is invalidated whenever the
+                      storage reports a policy change.
+        :param compiled: evaluate policies using rules compiled into specialized callables
+        :param instrument: optional instrumentation hook receiving measurements of every decision
+        :param prefetch: before evaluation, resolve all attributes referred by the candidate
+                         policies using :class:`BulkAttributeProvider` objects in one call per
+                         provider and access control element
+        :param executor: optional executor, e.g. a bounded thread pool, calling the attribute
+                         providers concurrently for each attribute
+        :param timeout: number of seconds each decision may wait for attribute providers called
+                        by the executor
+        :param fail_closed: deny access when attribute providers exceed the timeout. Otherwise
+                            attributes not resolved in time are treated as missing.
+        :param statistics: optional runtime statistics of rule evaluation. Conditions of the
+                           policies are ordered using the costs and selectivities measured.
     """
 
+    _options = dict(_PDPBase._options, executor=None, timeout=None, fail_closed=True)
+
     def __init__(self,
                  storage: StorageBase,
                  algorithm: EvaluationAlgorithm = EvaluationAlgorithm.DENY_OVERRIDES,
-                 providers: List[AttributeProvider] = None):
-        if not isinstance(storage, StorageBase):
-            raise TypeError("Invalid type '{}' for storage.".format(type(storage)))
-        if not isinstance(algorithm, EvaluationAlgorithm):
-            raise TypeError("Invalid type '{}' for evaluation algorithm.".format(type(algorithm)))
-        self._storage = storage
-        self._algorithm = algorithm.value
-        self._providers = providers or []
-        for provider in self._providers:
-            if not isinstance(provider, AttributeProvider):
-                raise TypeError("Invalid type '{}' for attribute provider.".format(type(provider)))
+                 providers: List[AttributeProvider] = None,
+                 **options):
+        super().__init__(storage, algorithm, providers, **options)
+        options = self._get_options(options)
+        executor = options["executor"]
+        timeout = options["timeout"]
+        if executor is not None and not isinstance(executor, Executor):
+            raise TypeError("Invalid type '{}' for executor.".format(type(executor)))
+        if timeout is not None and executor is None:
+            raise ValueError("Timeout requires an executor calling attribute providers.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("Timeout must be positive.")
+        self._executor = executor
+        self._timeout = timeout
+        self._fail_closed = options["fail_closed"]
 
     def is_allowed(self, request: AccessRequest):
         """
@@ -78,65 +349,404 @@ class PDP(object):
         if not isinstance(request, AccessRequest):
             raise TypeError("Invalid type '{}' for authorization request.".format(request))
 
-        # Get appropriate evaluation algorithm handler
-        evaluate = getattr(self, "_{}".format(self._algorithm))
-        # Create evaluation context
-        ctx = EvaluationContext(request, self._providers)
+        if self._instrument is not None:
+            return self._is_allowed_instrumented(request)
 
-        # Get filtered policies based on targets from storage
-        policies = self._storage.get_for_target(ctx.subject_id, ctx.resource_id, ctx.action_id)
-        # Filter policies based on fit with authorization request
-        policies = [policy for policy in policies if policy.fits(ctx)]
+        try:
+            if self._cache is None:
+                return self._is_allowed(request)
 
-        return evaluate(policies)
+            decision = self._cache.get(request)
+            if decision is None:
+                # Record cache generation so that a decision computed while policies
+                # change does not get cached.
+                generation = self._cache.generation
+                decision = self._is_allowed(request)
+                self._cache.set(request, decision, generation)
+            return decision
+        except AttributeResolutionTimeoutError as err:
+            return self._deny_on_timeout(err)
 
-    @staticmethod
-    def _allow_overrides(policies):
+    def is_allowed_many(self, requests: Iterable[AccessRequest]) -> List[bool]:
         """
-            Allow overrides evaluation algorithm
+            Check if each of the authorization requests is allowed. Policies are fetched
+            from storage once per distinct set of target IDs and resolved subject attribute
+            values are shared between requests having the same subject.
 
-            :param policies: list of policies to evaluate
-            :return: True if request is authorized else False
+            .. note::
+
+                Subject attribute values returned by attribute providers are shared between
+                requests with identical subjects. Providers should thus compute subject
+                attributes from the subject alone.
+
+            :param requests: iterable of request objects
+            :return: list of decisions in the order of requests. True if authorized else False.
         """
-        if not policies:
-            return False
-        for policy in policies:
-            if policy.is_allowed:
-                return True
+        requests = list(requests)
+        for request in requests:
+            if not isinstance(request, AccessRequest):
+                raise TypeError("Invalid type '{}' for authorization request.".format(request))
+
+        decisions = [None] * len(requests)
+        generation = None
+        if self._cache is not None:
+            generation = self._cache.generation
+            decisions = [self._cache.get(request) for request in requests]
+        pending = [idx for idx, decision in enumerate(decisions) if decision is None]
+        if self._instrument is not None:
+            self._report_cached(requests, decisions)
+        if not pending:
+            return decisions
+
+        # Fetch candidate policies once per distinct target
+        targets = {}
+        for idx in pending:
+            request = requests[idx]
+            targets[(request.subject_id, request.resource_id, request.action_id)] = None
+        policies = self._storage.get_for_targets(targets)
+        if self._algorithm == EvaluationAlgorithm.HIGHEST_PRIORITY.value:
+            policies = {
+                target: sorted(candidates, key=StorageBase.evaluation_order)
+                for target, candidates in policies.items()
+            }
+
+        # Resolved subject attribute values shared between requests with same subject
+        subjects = {}
+        for idx in pending:
+            request = requests[idx]
+            subject_attributes = subjects.setdefault(self._subject_key(request), {})
+            target = (request.subject_id, request.resource_id, request.action_id)
+            try:
+                if self._instrument is None:
+                    ctx = self._create_context(request, subject_attributes)
+                    decisions[idx] = self._evaluate(
+                        ctx, self._prefetch_attributes(ctx, policies[target])
+                    )
+                else:
+                    decisions[idx] = self._decide_instrumented(
+                        request, policies[target], subject_attributes
+                    )
+            except AttributeResolutionTimeoutError as err:
+                decisions[idx] = self._deny_on_timeout(err)
+                continue
+            if self._cache is not None:
+                self._cache.set(request, decisions[idx], generation)
+        return decisions
+
+    def _is_allowed_instrumented(self, request: AccessRequest):
+        """
+            Check if authorization request is allowed measuring the decision
+
+            :param request: request object
+            :return: True if authorized else False
+        """
+        stats = DecisionStats(request)
+        start = time.perf_counter()
+        decision = self._cache.get(request) if self._cache is not None else None
+        if decision is not None:
+            stats.cached = True
+        else:
+            generation = self._cache.generation if self._cache is not None else None
+            ctx_start = time.perf_counter()
+            ctx = self._create_context(request, stats=stats)
+            stats.durations["context"] += time.perf_counter() - ctx_start
+            policies = self._stream_instrumented(
+                self._get_candidates(ctx.subject_id, ctx.resource_id, ctx.action_id), stats
+            )
+            try:
+                decision = self._evaluate(ctx, self._prefetch_attributes(ctx, policies))
+            except AttributeResolutionTimeoutError as err:
+                decision = self._deny_on_timeout(err)
+            else:
+                if self._cache is not None:
+                    self._cache.set(request, decision, generation)
+        self._report(stats, decision, start)
+        return decision
+
+    def _decide_instrumented(
+            self,
+            request: AccessRequest,
+            policies: List[Policy],
+            subject_attributes: dict
+    ):
+        """
+            Evaluate policies fetched for a batch of requests measuring the decision. Storage
+            durations are not measured, as policies are fetched for the whole batch at once.
+        """
+        stats = DecisionStats(request)
+        start = time.perf_counter()
+        ctx = self._create_context(request, subject_attributes, stats)
+        stats.durations["context"] += time.perf_counter() - start
+        stats.candidates = len(policies)
+        try:
+            decision = self._evaluate(ctx, self._prefetch_attributes(ctx, policies))
+        except AttributeResolutionTimeoutError:
+            # Report denial and let the caller skip caching it
+            self._report(stats, False, start)
+            raise
+        self._report(stats, decision, start)
+        return decision
+
+    def _is_allowed(self, request: AccessRequest):
+        """
+            Evaluate authorization request against stored policies
+
+            :param request: request object
+            :return: True if authorized else False
+        """
+        # Create evaluation context
+        ctx = self._create_context(request)
+        # Get filtered policies based on targets from storage. Policies are retrieved lazily
+        # so that evaluation stops at the first decisive policy.
+        policies = self._get_candidates(ctx.subject_id, ctx.resource_id, ctx.action_id)
+        return self._evaluate(ctx, self._prefetch_attributes(ctx, policies))
+
+    def _create_context(
+            self,
+            request: AccessRequest,
+            subject_attributes: dict = None,
+            stats: DecisionStats = None
+    ) -> EvaluationContext:
+        """
+            Create evaluation context for the request. The deadline of attribute providers
+            starts with the decision.
+        """
+        if self._executor is None:
+            return EvaluationContext(request, self._providers, subject_attributes, stats)
+        deadline = None if self._timeout is None else time.monotonic() + self._timeout
+        return EvaluationContext(request, self._providers, subject_attributes, stats,
+                                 self._executor, deadline, self._fail_closed)
+
+    @staticmethod
+    def _deny_on_timeout(err: AttributeResolutionTimeoutError) -> bool:
+        """
+            Deny access when attribute providers exceeded the deadline. The denial is not cached.
+        """
+        LOG.warning("Access denied: %s", err)
         return False
 
+    def _get_candidates(
+            self,
+            subject_id: str,
+            resource_id: str,
+            action_id: str
+    ) -> Iterable[Policy]:
+        """
+            Get candidate policies for target IDs in the order required by the evaluation algorithm
+        """
+        if self._algorithm == EvaluationAlgorithm.HIGHEST_PRIORITY.value:
+            return self._storage.get_for_target_ordered(subject_id, resource_id, action_id)
+        return self._storage.get_for_target(subject_id, resource_id, action_id)
+
     @staticmethod
-    def _deny_overrides(policies):
+    def _subject_key(request: AccessRequest):
         """
-            Deny overrides evaluation algorithm
+            Key identifying the subject of a request. Requests whose subject attributes
+            cannot be serialized are keyed on the identity of the attributes object.
+        """
+        try:
+            attributes = json.dumps(request.subject, sort_keys=True)
+        except (TypeError, ValueError):
+            attributes = id(request.subject)
+        return request.subject_id, attributes
 
-            :param policies: list of policies to evaluate
-            :return: True if request is authorized else False
+
+class AsyncPDP(_PDPBase):
+    """
+        Asyncio policy decision point. Storage lookups and attribute provider calls are
+        awaited so that many decisions can be in flight on a single event loop. Values
+        of all attributes referred by the candidate policies are resolved concurrently
+        before the policies get evaluated.
+
+        :Example:
+
+        .. code-block:: python
+
+            from py_abac import AsyncPDP
+            from py_abac.provider.base import AsyncAttributeProvider
+
+            # A simple email attribute provider class calling a remote directory
+            class EmailAttributeProvider(AsyncAttributeProvider):
+                async def get_attribute_value(self, ace, attribute_path, ctx):
+                    return await directory.get_email(ctx.subject_id)
+
+            pdp = AsyncPDP(async_storage, providers=[EmailAttributeProvider()])
+            allowed = await pdp.is_allowed(request)
+
+        :param storage: asyncio policy storage
+        :param algorithm: policy evaluation algorithm
+        :param providers: list of synchronous and asyncio attribute providers
+
+        Optional features are enabled by keyword arguments:
+
+        :param cache: optional decision cache. The cache is invalidated whenever the
+                      storage reports a policy change.
+        :param compiled: evaluate policies using rules compiled into specialized callables
+        :param instrument: optional instrumentation hook receiving measurements of every decision
+        :param prefetch: before evaluation, resolve all attributes referred by the candidate
+                         policies using :class:`BulkAttributeProvider` objects in one call per
+                         provider and access control element
+        :param statistics: optional runtime statistics of rule evaluation. Conditions of the
+                           policies are ordered using the costs and selectivities measured.
+    """
+    _storage_types = (AsyncStorageBase,)
+    _provider_types = (AttributeProvider, AsyncAttributeProvider)
+
+    async def is_allowed(self, request: AccessRequest):
         """
-        if not policies:
-            return False
-        for policy in policies:
-            if not policy.is_allowed:
-                return False
-        return True
+            Check if authorization request is allowed
 
-    def _highest_priority(self, policies):
+            :param request: request object
+            :return: True if authorized else False
         """
-            Highest priority evaluation algorithm
+        if not isinstance(request, AccessRequest):
+            raise TypeError("Invalid type '{}' for authorization request.".format(request))
 
-            :param policies: list of policies to evaluate
-            :return: True if request is authorized else False
+        if self._instrument is not None:
+            return await self._is_allowed_instrumented(request)
+
+        if self._cache is None:
+            return await self._is_allowed(request)
+
+        decision = self._cache.get(request)
+        if decision is None:
+            generation = self._cache.generation
+            decision = await self._is_allowed(request)
+            self._cache.set(request, decision, generation)
+        return decision
+
+    async def is_allowed_many(self, requests: Iterable[AccessRequest]) -> List[bool]:
         """
-        if not policies:
-            return False
-        policy_groups = {}
-        max_priority = -1
-        for policy in policies:
-            if policy.priority > max_priority:
-                max_priority = policy.priority
-            if policy.priority in policy_groups:
-                policy_groups[policy.priority].append(policy)
-            else:
-                policy_groups[policy.priority] = [policy]
-        print(policy_groups)
-        return self._deny_overrides(policy_groups[max_priority])
+            Check if each of the authorization requests is allowed. Policies are fetched
+            from storage once per distinct set of target IDs and requests are evaluated
+            concurrently.
+
+            :param requests: iterable of request objects
+            :return: list of decisions in the order of requests. True if authorized else False.
+        """
+        requests = list(requests)
+        for request in requests:
+            if not isinstance(request, AccessRequest):
+                raise TypeError("Invalid type '{}' for authorization request.".format(request))
+
+        decisions = [None] * len(requests)
+        generation = None
+        if self._cache is not None:
+            generation = self._cache.generation
+            decisions = [self._cache.get(request) for request in requests]
+        pending = [idx for idx, decision in enumerate(decisions) if decision is None]
+        if self._instrument is not None:
+            self._report_cached(requests, decisions)
+        if not pending:
+            return decisions
+
+        # Fetch candidate policies once per distinct target
+        targets = [
+            (requests[idx].subject_id, requests[idx].resource_id, requests[idx].action_id)
+            for idx in pending
+        ]
+        policies = await self._storage.get_for_targets(targets)
+        if self._algorithm == EvaluationAlgorithm.HIGHEST_PRIORITY.value:
+            policies = {
+                target: sorted(candidates, key=AsyncStorageBase.evaluation_order)
+                for target, candidates in policies.items()
+            }
+
+        decide = self._decide if self._instrument is None else self._decide_instrumented
+        results = await asyncio.gather(*[
+            decide(requests[idx], policies[target]) for idx, target in zip(pending, targets)
+        ])
+        for idx, decision in zip(pending, results):
+            decisions[idx] = decision
+            if self._cache is not None:
+                self._cache.set(requests[idx], decision, generation)
+        return decisions
+
+    async def _is_allowed_instrumented(self, request: AccessRequest):
+        """
+            Check if authorization request is allowed measuring the decision
+
+            :param request: request object
+            :return: True if authorized else False
+        """
+        stats = DecisionStats(request)
+        start = time.perf_counter()
+        decision = self._cache.get(request) if self._cache is not None else None
+        if decision is not None:
+            stats.cached = True
+        else:
+            generation = self._cache.generation if self._cache is not None else None
+            decision = await self._is_allowed(request, stats)
+            if self._cache is not None:
+                self._cache.set(request, decision, generation)
+        self._report(stats, decision, start)
+        return decision
+
+    async def _decide_instrumented(self, request: AccessRequest, policies: List[Policy]):
+        """
+            Evaluate policies fetched for a batch of requests measuring the decision. Storage
+            durations are not measured, as policies are fetched for the whole batch at once.
+        """
+        stats = DecisionStats(request)
+        start = time.perf_counter()
+        decision = await self._decide(request, policies, stats)
+        self._report(stats, decision, start)
+        return decision
+
+    async def _is_allowed(self, request: AccessRequest, stats: DecisionStats = None):
+        """
+            Evaluate authorization request against stored policies
+
+            :param request: request object
+            :param stats: optional measurements of the decision
+            :return: True if authorized else False
+        """
+        start = time.perf_counter() if stats is not None else None
+        if self._algorithm == EvaluationAlgorithm.HIGHEST_PRIORITY.value:
+            policies = await self._storage.get_for_target_ordered(
+                request.subject_id, request.resource_id, request.action_id
+            )
+        else:
+            policies = await self._storage.get_for_target(
+                request.subject_id, request.resource_id, request.action_id
+            )
+        if stats is not None:
+            policies = list(policies)
+            stats.durations["storage"] += time.perf_counter() - start
+        return await self._decide(request, policies, stats)
+
+    async def _decide(
+            self,
+            request: AccessRequest,
+            policies: Iterable[Policy],
+            stats: DecisionStats = None
+    ):
+        """
+            Resolve attributes referred by the candidate policies and evaluate them
+
+            :param request: request object
+            :param policies: candidate policies returned by storage
+            :param stats: optional measurements of the decision
+            :return: True if authorized else False
+        """
+        policies = list(policies)
+        refs = {ref for policy in policies for ref in policy.attribute_refs()}
+        if stats is None:
+            ctx = AsyncEvaluationContext(request, self._providers)
+            if self._prefetch:
+                ctx.prefetch_attributes(refs)
+            await ctx.prefetch(refs)
+            return self._evaluate(ctx, policies)
+
+        stats.candidates = len(policies)
+        start = time.perf_counter()
+        ctx = AsyncEvaluationContext(request, self._providers, stats)
+        stats.durations["context"] += time.perf_counter() - start
+        # Providers are awaited concurrently, so the wall time of the prefetch is recorded
+        # rather than the sum of durations of the provider calls.
+        start = time.perf_counter()
+        if self._prefetch:
+            ctx.prefetch_attributes(refs)
+        await ctx.prefetch(refs)
+        stats.durations["providers"] = time.perf_counter() - start
+        return self._evaluate(ctx, policies)
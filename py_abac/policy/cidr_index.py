@@ -0,0 +1,146 @@
+"""
+    Radix tree index of CIDR networks answering which networks contain given IP address
+"""
+
+from typing import Hashable, List, Set, Union
+
+from .conditions.others.cidr import parse_address, parse_network
+
+
+class _Node(object):
+    """
+        Binary trie node. Edges are labelled with the bits of network addresses
+        and keys are held by the node at the depth of the network prefix length.
+    """
+    __slots__ = ("children", "keys")
+
+    def __init__(self):
+        self.children = [None, None]
+        self.keys = set()
+
+
+def _prefix_bits(network) -> List[int]:
+    """
+        Get bits of network prefix, most significant first
+
+        :param network: :mod:`ipaddress` network object
+        :return: list of bits
+    """
+    bits = int(network.network_address)
+    stop = network.max_prefixlen - network.prefixlen - 1
+    return [(bits >> shift) & 1 for shift in range(network.max_prefixlen - 1, stop, -1)]
+
+
+class CIDRIndex(object):
+    """
+        Index of IPv4 and IPv6 networks in CIDR notation. Looking up the networks
+        containing an address walks a single path of the radix tree, so it takes
+        at most as many steps as the address has bits (32 for IPv4 and 128 for
+        IPv6) however many networks are indexed.
+
+        :Example:
+
+        .. code-block:: python
+
+            index = CIDRIndex()
+            index.add("10.0.0.0/8", "internal")
+            index.add("10.1.0.0/16", "office")
+            index.match("10.1.2.3")  # {"internal", "office"}
+    """
+
+    def __init__(self):
+        # Trie roots keyed by IP version
+        self._roots = {4: _Node(), 6: _Node()}
+        self._size = 0
+
+    def add(self, network: str, key: Hashable) -> bool:
+        """
+            Add key of network to the index
+
+            :param network: network in CIDR notation
+            :param key: key returned for addresses within the network
+            :return: False if network is invalid and was not added else True
+        """
+        parsed = parse_network(network)
+        if parsed is None:
+            return False
+        node = self._roots[parsed.version]
+        for bit in _prefix_bits(parsed):
+            if node.children[bit] is None:
+                node.children[bit] = _Node()
+            node = node.children[bit]
+        if key not in node.keys:
+            node.keys.add(key)
+            self._size += 1
+        return True
+
+    def remove(self, network: str, key: Hashable):
+        """
+            Remove key of network from the index. Branches left without keys are pruned.
+
+            :param network: network in CIDR notation
+            :param key: key of network
+        """
+        parsed = parse_network(network)
+        if parsed is None:
+            return
+        path = [self._roots[parsed.version]]
+        bits = _prefix_bits(parsed)
+        for bit in bits:
+            node = path[-1].children[bit]
+            if node is None:
+                return
+            path.append(node)
+        if key not in path[-1].keys:
+            return
+        path[-1].keys.discard(key)
+        self._size -= 1
+        while len(path) > 1 and not path[-1].keys and path[-1].children == [None, None]:
+            path.pop()
+            # Node at depth d is reached from its parent through d-th bit
+            path[-1].children[bits[len(path) - 1]] = None
+
+    def match(self, address: Union[str, object]) -> Set[Hashable]:
+        """
+            Get keys of all networks containing the address
+
+            :param address: IP address string or :mod:`ipaddress` address object
+            :return: set of keys
+        """
+        rvalue = set()
+        for node in self._walk(address):
+            rvalue.update(node.keys)
+        return rvalue
+
+    def contains(self, address: Union[str, object]) -> bool:
+        """
+            Check if any network contains the address
+
+            :param address: IP address string or :mod:`ipaddress` address object
+            :return: True if address is within an indexed network else False
+        """
+        for node in self._walk(address):
+            if node.keys:
+                return True
+        return False
+
+    def _walk(self, address):
+        """
+            Yield nodes on the path of the address from the root
+        """
+        if isinstance(address, str):
+            address = parse_address(address)
+            if address is None:
+                return
+        node = self._roots[address.version]
+        bits = int(address)
+        shift = address.max_prefixlen
+        while node is not None:
+            yield node
+            shift -= 1
+            if shift < 0:
+                return
+            node = node.children[(bits >> shift) & 1]
+
+    def __len__(self) -> int:
+        return self._size
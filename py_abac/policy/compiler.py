@@ -0,0 +1,350 @@
+"""
+    Policy compiler turning rules and conditions into specialized Python closures
+"""
+
+import operator
+import time
+from typing import Any, Callable, List, Tuple, Union
+
+from .cidr_index import CIDRIndex
+from .conditions.base import ConditionBase
+from .conditions.collection.all_in import AllIn
+from .conditions.collection.all_not_in import AllNotIn
+from .conditions.collection.any_in import AnyIn
+from .conditions.collection.any_not_in import AnyNotIn
+from .conditions.collection.base import is_collection
+from .conditions.collection.is_empty import IsEmpty
+from .conditions.collection.is_in import IsIn
+from .conditions.collection.is_not_empty import IsNotEmpty
+from .conditions.collection.is_not_in import IsNotIn
+from .conditions.logic._not import Not
+from .conditions.logic.all_of import AllOf
+from .conditions.logic.any_of import AnyOf
+from .conditions.numeric.eq import Eq
+from .conditions.numeric.gt import Gt
+from .conditions.numeric.gte import Gte
+from .conditions.numeric.lt import Lt
+from .conditions.numeric.lte import Lte
+from .conditions.numeric.neq import Neq
+from .conditions.object.equals_object import EqualsObject
+from .conditions.others.any import Any as AnyValue
+from .conditions.others.cidr import CIDR, parse_address, parse_network
+from .conditions.others.equals_attribute import EqualsAttribute
+from .conditions.others.exists import Exists
+from .conditions.others.not_exists import NotExists
+from .conditions.string.contains import Contains
+from .conditions.string.ends_with import EndsWith
+from .conditions.string.equals import Equals
+from .conditions.string.not_contains import NotContains
+from .conditions.string.not_equals import NotEquals
+from .conditions.string.regex_match import RegexMatch, compile_regex
+from .conditions.string.starts_with import StartsWith
+from .optimizer import condition_cost
+from ..context import EvaluationContext
+
+# Compiled condition predicate called with attribute value and evaluation context
+Predicate = Callable[[Any, EvaluationContext], bool]
+# Compiled rules called with evaluation context
+CompiledRules = Callable[[EvaluationContext], bool]
+
+_NUMERIC_OPERATORS = {
+    Eq: operator.eq,
+    Neq: operator.ne,
+    Gt: operator.gt,
+    Gte: operator.ge,
+    Lt: operator.lt,
+    Lte: operator.le,
+}
+
+_STRING_OPERATORS = {
+    Equals: operator.eq,
+    NotEquals: operator.ne,
+    Contains: operator.contains,
+    NotContains: lambda what, value: value not in what,
+    StartsWith: str.startswith,
+    EndsWith: str.endswith,
+}
+
+# Minimum number of alternative CIDR conditions looked up in a radix tree instead
+# of being checked one by one
+_CIDR_INDEX_THRESHOLD = 4
+
+
+def _always(*_) -> bool:
+    return True
+
+
+def _never(*_) -> bool:
+    return False
+
+
+def _compile_numeric(condition) -> Predicate:
+    compare = _NUMERIC_OPERATORS[type(condition)]
+    value = condition.value
+
+    def predicate(what, _):
+        return isinstance(what, (float, int)) and compare(what, value)
+
+    return predicate
+
+
+def _compile_string(condition) -> Predicate:
+    # Policy value is folded once when the condition is built and attribute
+    # values once per evaluation context
+    compare = _STRING_OPERATORS[type(condition)]
+    value = condition._folded_value  # pylint: disable=protected-access
+
+    if condition.case_insensitive:
+        return lambda what, ctx: isinstance(what, str) and compare(ctx.fold_case(what), value)
+    return lambda what, _: isinstance(what, str) and compare(what, value)
+
+
+def _compile_regex(condition) -> Predicate:
+    search = compile_regex(condition.value)
+    return lambda what, _: isinstance(what, str) and search(what)
+
+
+def _compile_collection(condition) -> Predicate:
+    cls = type(condition)
+    if cls is IsEmpty:
+        return lambda what, _: is_collection(what) and len(what) == 0
+    if cls is IsNotEmpty:
+        return lambda what, _: is_collection(what) and len(what) != 0
+
+    contains = condition._contains  # pylint: disable=protected-access
+    if cls is IsIn:
+        return lambda what, _: contains(what)
+    if cls is IsNotIn:
+        return lambda what, _: not contains(what)
+    # Remaining collection conditions share the type check of the interpreted path
+    is_satisfied = condition._is_satisfied  # pylint: disable=protected-access
+    return lambda what, _: is_collection(what) and is_satisfied(what)
+
+
+def _compile_cidr(condition) -> Predicate:
+    network = parse_network(condition.value)
+    if network is None:
+        # Invalid network never contains an address
+        return _never
+
+    def predicate(what, _):
+        if not isinstance(what, str):
+            return False
+        address = parse_address(what)
+        return address is not None and address in network
+
+    return predicate
+
+
+def _compile_cidr_set(conditions) -> Predicate:
+    """
+        Compile alternative CIDR conditions into a single radix tree lookup
+    """
+    index = CIDRIndex()
+    for condition in conditions:
+        index.add(condition.value, condition.value)
+    if not index:
+        return _never
+    return lambda what, _: isinstance(what, str) and index.contains(what)
+
+
+def _compile_equals_object(condition) -> Predicate:
+    value = condition.value
+    return lambda what, _: value == what
+
+
+def _compile_equals_attribute(condition) -> Predicate:
+    other_ace, other_path = condition.ace, condition.path
+    return lambda what, ctx: ctx.get_attribute_value(other_ace, other_path) == what
+
+
+# Compilers of conditions not depending on the ace and attribute they are applied to
+_COMPILERS = dict.fromkeys(_NUMERIC_OPERATORS, _compile_numeric)
+_COMPILERS.update(dict.fromkeys(_STRING_OPERATORS, _compile_string))
+_COMPILERS.update(dict.fromkeys(
+    (IsIn, IsNotIn, AllIn, AllNotIn, AnyIn, AnyNotIn, IsEmpty, IsNotEmpty), _compile_collection))
+_COMPILERS.update({
+    RegexMatch: _compile_regex,
+    CIDR: _compile_cidr,
+    AnyValue: lambda _: _always,
+    Exists: lambda _: lambda what, _: what is not None,
+    NotExists: lambda _: lambda what, _: what is None,
+    EqualsObject: _compile_equals_object,
+    EqualsAttribute: _compile_equals_attribute,
+})
+
+
+def _compile_logic(condition, ace: str, attribute_path: str) -> Predicate:
+    cls = type(condition)
+    if cls is Not:
+        negated = compile_condition(condition.value, ace, attribute_path)
+        return lambda what, ctx: not negated(what, ctx)
+
+    if cls is AnyOf and len(condition.values) >= _CIDR_INDEX_THRESHOLD and \
+            {type(value) for value in condition.values} == {CIDR}:
+        return _compile_cidr_set(condition.values)
+    # Cheaper conditions are evaluated first as the outcome does not depend on the order
+    values = sorted(condition.values, key=condition_cost)
+    predicates = [compile_condition(value, ace, attribute_path) for value in values]
+    if len(predicates) == 1:
+        return predicates[0]
+    if cls is AllOf:
+        def all_of(what, ctx):
+            for predicate in predicates:
+                if not predicate(what, ctx):
+                    return False
+            return True
+
+        return all_of
+
+    def any_of(what, ctx):
+        for predicate in predicates:
+            if predicate(what, ctx):
+                return True
+        return False
+
+    return any_of
+
+
+def _compile_generic(condition: ConditionBase, ace: str, attribute_path: str) -> Predicate:
+    """
+        Fallback for custom conditions: evaluates the condition through the context
+    """
+
+    def predicate(what, ctx):
+        ctx.ace = ace
+        ctx.attribute_path = attribute_path
+        return condition.is_satisfied_by(what, ctx)
+
+    return predicate
+
+
+def compile_condition(condition: ConditionBase, ace: str, attribute_path: str) -> Predicate:
+    """
+        Compile condition into a predicate called with the attribute value and the
+        evaluation context. Type checks of the condition are folded into the predicate
+        and values of the condition are pre-processed once.
+
+        :param condition: condition to compile
+        :param ace: access control element the condition is applied to
+        :param attribute_path: path of attribute the condition is applied to
+        :return: compiled predicate
+    """
+    cls = type(condition)
+    if cls in (AllOf, AnyOf, Not):
+        return _compile_logic(condition, ace, attribute_path)
+    compiler = _COMPILERS.get(cls)
+    if compiler is None:
+        return _compile_generic(condition, ace, attribute_path)
+    return compiler(condition)
+
+
+def _compile_measured(ace: str, attribute_path: str, condition: ConditionBase,
+                      statistics) -> Predicate:
+    """
+        Compile condition into a step looking up its attribute and recording durations and
+        outcome of its evaluation to rule statistics
+    """
+    predicate = compile_condition(condition, ace, attribute_path)
+    get_time = time.perf_counter
+
+    def measured(ctx):
+        if ctx.stats is not None:
+            ctx.stats.condition_evaluations += 1
+        start = get_time()
+        what = ctx.get_attribute_value(ace, attribute_path)
+        looked_up = get_time()
+        satisfied = predicate(what, ctx)
+        statistics.record_lookup(ace, attribute_path, looked_up - start)
+        statistics.record_condition(ace, attribute_path, condition, satisfied,
+                                    get_time() - looked_up)
+        return satisfied
+
+    return measured
+
+
+def _compile_plan(plan: Tuple, statistics) -> Union[List[Tuple], None]:
+    """
+        Compile plan of rules into a list of (ace, attribute path, predicate) steps. Conditions
+        satisfied by any value are dropped along with their attribute lookup. Steps with
+        no ace are called with the evaluation context only.
+
+        :return: list of steps or None if plan is never satisfied
+    """
+    steps = []
+    for ace, attribute_path, condition in plan:
+        if attribute_path is None:
+            implicit_or = _compile_implicit_or(condition, statistics)
+            if implicit_or is _never:
+                return None
+            if implicit_or is not _always:
+                steps.append((None, None, implicit_or))
+        elif statistics is not None:
+            measured = _compile_measured(ace, attribute_path, condition, statistics)
+            steps.append((None, None, measured))
+        else:
+            predicate = compile_condition(condition, ace, attribute_path)
+            if predicate is not _always:
+                steps.append((ace, attribute_path, predicate))
+    return steps
+
+
+def _run_steps(steps: List[Tuple], ctx: EvaluationContext) -> bool:
+    """
+        Run compiled steps against evaluation context
+    """
+    get_attribute_value = ctx.get_attribute_value
+    stats = ctx.stats
+    for ace, attribute_path, predicate in steps:
+        if ace is None:
+            if not predicate(ctx):
+                return False
+        else:
+            if stats is not None:
+                stats.condition_evaluations += 1
+            if not predicate(get_attribute_value(ace, attribute_path), ctx):
+                return False
+    return True
+
+
+def _compile_implicit_or(branches: Tuple, statistics) -> CompiledRules:
+    """
+        Compile disjunction of conjunctions into a callable called with evaluation context
+    """
+    # Branches never satisfied are dropped
+    compiled = (_compile_plan(branch, statistics) for branch in branches)
+    branches = [steps for steps in compiled if steps is not None]
+    if not branches:
+        return _never
+    if any(not steps for steps in branches):
+        # An empty conjunction is always satisfied
+        return _always
+
+    def implicit_or(ctx):
+        for steps in branches:
+            if _run_steps(steps, ctx):
+                return True
+        return False
+
+    return implicit_or
+
+
+def compile_rules(rules) -> CompiledRules:
+    """
+        Compile policy rules into a single flattened callable. Conditions of all the
+        access control elements are merged into one sequence of attribute lookups and
+        predicates, evaluated in the order of the rules plan like the interpreted rules.
+
+        .. note::
+
+            Compiled predicates do not log attribute type mismatches.
+
+        :param rules: policy rules
+        :return: callable returning True if rules satisfied by evaluation context else False
+    """
+    steps = _compile_plan(rules.plan, rules.statistics)
+    if steps is None:
+        return _never
+    if not steps:
+        return _always
+    return lambda ctx: _run_steps(steps, ctx)
@@ -2,7 +2,8 @@
     Operation base class
 """
 
-from abc import ABCMeta, abstractmethod
+from abc import ABCMeta
+from typing import List, Tuple
 
 from py_abac.context import EvaluationContext
 
@@ -12,7 +13,6 @@ class ConditionBase(metaclass=ABCMeta):
         Base class for conditions
     """
 
-    @abstractmethod
     def is_satisfied(self, ctx: EvaluationContext) -> bool:
         """
             Is conditions satisfied?
@@ -20,4 +20,30 @@ class ConditionBase(metaclass=ABCMeta):
             :param ctx: evaluation context
             :return: True if satisfied else False
         """
-        raise NotImplementedError()
+        return self.is_satisfied_by(ctx.attribute_value, ctx)
+
+    def is_satisfied_by(self, _what, ctx: EvaluationContext) -> bool:
+        """
+            Is condition satisfied by attribute value? The value is resolved once by
+            the caller and handed to the condition along with the evaluation context,
+            whose :code:`ace` and :code:`attribute_path` identify the attribute.
+
+            Conditions should override this method. Custom conditions overriding
+            :meth:`is_satisfied` instead keep working as before.
+
+            :param _what: attribute value
+            :param ctx: evaluation context
+            :return: True if satisfied else False
+        """
+        if type(self).is_satisfied is ConditionBase.is_satisfied:
+            raise NotImplementedError()
+        return self.is_satisfied(ctx)
+
+    def attribute_refs(self) -> List[Tuple[str, str]]:
+        """
+            Get attributes referred by the condition in addition to the attribute
+            it is applied to.
+
+            :return: list of (access control element, attribute path) pairs
+        """
+        return []
@@ -13,7 +13,7 @@ class AllNotIn(CollectionCondition):
     """
 
     def _is_satisfied(self, what) -> bool:
-        return not set(what).issubset(self.values)
+        return not self._contains_all(what)
 
 
 class AllNotInSchema(CollectionConditionSchema):
@@ -3,10 +3,11 @@
 """
 
 import logging
+from abc import ABCMeta, abstractmethod
 
 from marshmallow import Schema, fields
 
-from ..base import ConditionBase, ABCMeta, abstractmethod
+from ..base import ConditionBase
 
 LOG = logging.getLogger(__name__)
 
@@ -27,18 +28,64 @@ class CollectionCondition(ConditionBase, metaclass=ABCMeta):
 
     def __init__(self, values):
         self.values = values
+        # Hashable values are looked up in a set in constant time while the
+        # rest, e.g. dictionaries, are compared one by one
+        hashable_values = []
+        unhashable_values = []
+        for value in values:
+            try:
+                hash(value)
+            except TypeError:
+                unhashable_values.append(value)
+            else:
+                hashable_values.append(value)
+        self._hashable_values = frozenset(hashable_values)
+        self._unhashable_values = unhashable_values
 
-    def is_satisfied(self, ctx) -> bool:
-        if not is_collection(ctx.attribute_value):
+    def _contains(self, value) -> bool:
+        """
+            Check if value is a member of `values`
+        """
+        try:
+            if value in self._hashable_values:
+                return True
+        except TypeError:
+            pass
+        return bool(self._unhashable_values) and value in self._unhashable_values
+
+    def _contains_all(self, what) -> bool:
+        """
+            Check if all values of collection `what` are members of `values`
+        """
+        if not self._unhashable_values:
+            try:
+                return self._hashable_values.issuperset(what)
+            except TypeError:
+                pass
+        return all(self._contains(value) for value in what)
+
+    def _contains_any(self, what) -> bool:
+        """
+            Check if any value of collection `what` is a member of `values`
+        """
+        if not self._unhashable_values:
+            try:
+                return not self._hashable_values.isdisjoint(what)
+            except TypeError:
+                pass
+        return any(self._contains(value) for value in what)
+
+    def is_satisfied_by(self, what, ctx) -> bool:
+        if not is_collection(what):
             LOG.debug(
                 "Invalid type '%s' for attribute value at path '%s' for element '%s'."
                 " Condition not satisfied.",
-                type(ctx.attribute_value),
+                type(what),
                 ctx.attribute_path,
                 ctx.ace
             )
             return False
-        return self._is_satisfied(ctx.attribute_value)
+        return self._is_satisfied(what)
 
     @abstractmethod
     def _is_satisfied(self, what) -> bool:
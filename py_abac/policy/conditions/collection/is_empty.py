@@ -12,17 +12,17 @@ class IsEmpty(ConditionBase):
         Condition for `what` being an empty collection
     """
 
-    def is_satisfied(self, ctx) -> bool:
-        if not is_collection(ctx.attribute_value):
+    def is_satisfied_by(self, what, ctx) -> bool:
+        if not is_collection(what):
             LOG.debug(
                 "Invalid type '%s' for attribute value at path '%s' for element '%s'."
                 " Condition not satisfied.",
-                type(ctx.attribute_value),
+                type(what),
                 ctx.attribute_path,
                 ctx.ace
             )
             return False
-        return self._is_satisfied(ctx.attribute_value)
+        return self._is_satisfied(what)
 
     @staticmethod
     def _is_satisfied(what) -> bool:
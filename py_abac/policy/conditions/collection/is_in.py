@@ -12,11 +12,11 @@ class IsIn(CollectionCondition):
         Condition for `what` is a member of `values`
     """
 
-    def is_satisfied(self, ctx):
-        return self._is_satisfied(ctx.attribute_value)
+    def is_satisfied_by(self, what, ctx) -> bool:
+        return self._is_satisfied(what)
 
     def _is_satisfied(self, what) -> bool:
-        return what in self.values
+        return self._contains(what)
 
 
 class IsInSchema(CollectionConditionSchema):
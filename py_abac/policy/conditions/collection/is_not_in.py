@@ -12,11 +12,11 @@ class IsNotIn(CollectionCondition):
         Condition for `what` is not a member of `values`
     """
 
-    def is_satisfied(self, ctx) -> bool:
-        return self._is_satisfied(ctx.attribute_value)
+    def is_satisfied_by(self, what, ctx) -> bool:
+        return self._is_satisfied(what)
 
     def _is_satisfied(self, what) -> bool:
-        return what not in self.values
+        return not self._contains(what)
 
 
 class IsNotInSchema(CollectionConditionSchema):
@@ -15,8 +15,11 @@ class Not(ConditionBase):
     def __init__(self, value):
         self.value = value
 
-    def is_satisfied(self, ctx) -> bool:
-        return not self.value.is_satisfied(ctx)
+    def is_satisfied_by(self, what, ctx) -> bool:
+        return not self.value.is_satisfied_by(what, ctx)
+
+    def attribute_refs(self):
+        return self.value.attribute_refs()
 
 
 class NotSchema(Schema):
@@ -12,8 +12,8 @@ class AllOf(LogicCondition):
         Condition for all of the sub-rules are satisfied
     """
 
-    def is_satisfied(self, ctx) -> bool:
-        return all(value.is_satisfied(ctx) for value in self.values)
+    def is_satisfied_by(self, what, ctx) -> bool:
+        return all(value.is_satisfied_by(what, ctx) for value in self.values)
 
 
 class AllOfSchema(LogicConditionSchema):
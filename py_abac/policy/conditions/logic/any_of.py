@@ -12,8 +12,8 @@ class AnyOf(LogicCondition):
         Condition for any of sub-rules are satisfied
     """
 
-    def is_satisfied(self, ctx) -> bool:
-        return any(value.is_satisfied(ctx) for value in self.values)
+    def is_satisfied_by(self, what, ctx) -> bool:
+        return any(value.is_satisfied_by(what, ctx) for value in self.values)
 
 
 class AnyOfSchema(LogicConditionSchema):
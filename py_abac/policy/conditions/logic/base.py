@@ -2,9 +2,11 @@
     Logic conditions base class
 """
 
+from abc import ABCMeta
+
 from marshmallow import Schema, fields, validate
 
-from ..base import ConditionBase, ABCMeta
+from ..base import ConditionBase
 
 
 class LogicCondition(ConditionBase, metaclass=ABCMeta):
@@ -15,9 +17,12 @@ class LogicCondition(ConditionBase, metaclass=ABCMeta):
     def __init__(self, values):
         self.values = values
 
-    def is_satisfied(self, ctx) -> bool:
+    def is_satisfied_by(self, what, ctx) -> bool:
         raise NotImplementedError()
 
+    def attribute_refs(self):
+        return [ref for value in self.values for ref in value.attribute_refs()]
+
 
 class LogicConditionSchema(Schema):
     """
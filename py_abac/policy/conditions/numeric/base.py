@@ -3,10 +3,11 @@
 """
 
 import logging
+from abc import ABCMeta, abstractmethod
 
 from marshmallow import Schema, fields
 
-from ..base import ConditionBase, ABCMeta, abstractmethod
+from ..base import ConditionBase
 
 LOG = logging.getLogger(__name__)
 
@@ -26,17 +27,17 @@ class NumericCondition(ConditionBase, metaclass=ABCMeta):
     def __init__(self, value):
         self.value = value
 
-    def is_satisfied(self, ctx) -> bool:
-        if not is_number(ctx.attribute_value):
+    def is_satisfied_by(self, what, ctx) -> bool:
+        if not is_number(what):
             LOG.debug(
                 "Invalid type '%s' for attribute value at path '%s' for element '%s'."
                 " Condition not satisfied.",
-                type(ctx.attribute_value),
+                type(what),
                 ctx.attribute_path,
                 ctx.ace
             )
             return False
-        return self._is_satisfied(ctx.attribute_value)
+        return self._is_satisfied(what)
 
     @abstractmethod
     def _is_satisfied(self, what) -> bool:
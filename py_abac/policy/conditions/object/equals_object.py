@@ -15,8 +15,8 @@ class EqualsObject(ConditionBase):
     def __init__(self, value):
         self.value = value
 
-    def is_satisfied(self, ctx) -> bool:
-        return self.value == ctx.attribute_value
+    def is_satisfied_by(self, what, ctx) -> bool:
+        return self.value == what
 
 
 class EqualsObjectSchema(Schema):
@@ -11,7 +11,7 @@ class Any(ConditionBase):
         Condition for attribute having any value
     """
 
-    def is_satisfied(self, ctx) -> bool:
+    def is_satisfied_by(self, _what, ctx) -> bool:
         return True
 
 
@@ -2,8 +2,10 @@
     Conditions relevant to networking context
 """
 
+import functools
 import ipaddress
 import logging
+from typing import Union
 
 from marshmallow import Schema, fields, post_load
 
@@ -11,6 +13,39 @@ from ..base import ConditionBase
 
 LOG = logging.getLogger(__name__)
 
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_network(value: str) -> Union[IPNetwork, None]:
+    """
+        Parse network in CIDR notation. Parsed networks are cached and shared
+        across conditions.
+
+        :param value: network in CIDR notation
+        :return: network object or None if network is invalid
+    """
+    try:
+        return ipaddress.ip_network(value)
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_address(value: str) -> Union[IPAddress, None]:
+    """
+        Parse IP address. Parsed addresses are cached, so that an address of a
+        request is parsed once however many conditions check it.
+
+        :param value: IP address
+        :return: address object or None if address is invalid
+    """
+    try:
+        return ipaddress.ip_address(value)
+    except ValueError:
+        return None
+
 
 class CIDR(ConditionBase):
     """
@@ -19,18 +54,20 @@ class CIDR(ConditionBase):
 
     def __init__(self, value):
         self.value = value
+        # Parsed once when the condition is built. Invalid networks never contain an address.
+        self._network = parse_network(value)
 
-    def is_satisfied(self, ctx) -> bool:
-        if not isinstance(ctx.attribute_value, str):
+    def is_satisfied_by(self, what, ctx) -> bool:
+        if not isinstance(what, str):
             LOG.debug(
                 "Invalid type '%s' for attribute value at path '%s' for element '%s'."
                 " Condition not satisfied.",
-                type(ctx.attribute_value),
+                type(what),
                 ctx.attribute_path,
                 ctx.ace
             )
             return False
-        return self._is_satisfied(ctx.attribute_value)
+        return self._is_satisfied(what)
 
     def _is_satisfied(self, what) -> bool:
         """
@@ -39,12 +76,10 @@ class CIDR(ConditionBase):
             :param what: IP address to check
             :return: True if satisfied else False
         """
-        try:
-            ip_addr = ipaddress.ip_address(what)
-            net = ipaddress.ip_network(self.value)
-        except ValueError:
+        ip_addr = parse_address(what)
+        if ip_addr is None or self._network is None:
             return False
-        return ip_addr in net
+        return ip_addr in self._network
 
 
 class CIDRSchema(Schema):
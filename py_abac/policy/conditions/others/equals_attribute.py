@@ -17,9 +17,12 @@ class EqualsAttribute(ConditionBase):
         self.ace = ace
         self.path = path
 
-    def is_satisfied(self, ctx) -> bool:
+    def is_satisfied_by(self, what, ctx) -> bool:
         # Extract attribute value from request and check if it matches that in the context
-        return ctx.get_attribute_value(self.ace, self.path) == ctx.attribute_value
+        return ctx.get_attribute_value(self.ace, self.path) == what
+
+    def attribute_refs(self):
+        return [(self.ace, self.path)]
 
 
 def validate_path(path):
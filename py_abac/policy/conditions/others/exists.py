@@ -11,8 +11,8 @@ class Exists(ConditionBase):
         Condition for attribute value exists
     """
 
-    def is_satisfied(self, ctx) -> bool:
-        return ctx.attribute_value is not None
+    def is_satisfied_by(self, what, ctx) -> bool:
+        return what is not None
 
 
 class ExistsSchema(Schema):
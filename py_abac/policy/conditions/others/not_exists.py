@@ -12,8 +12,8 @@ class NotExists(ConditionBase):
         Condition for attribute value not exists
     """
 
-    def is_satisfied(self, ctx) -> bool:
-        return ctx.attribute_value is None
+    def is_satisfied_by(self, what, ctx) -> bool:
+        return what is None
 
 
 class NotExistsSchema(Schema):
@@ -3,10 +3,11 @@
 """
 
 import logging
+from abc import ABCMeta, abstractmethod
 
 from marshmallow import Schema, fields
 
-from ..base import ConditionBase, ABCMeta, abstractmethod
+from ..base import ConditionBase
 
 LOG = logging.getLogger(__name__)
 
@@ -23,23 +24,31 @@ class StringCondition(ConditionBase, metaclass=ABCMeta):
         Base class for string conditions
     """
 
+    # Whether case insensitive conditions compare strings folded to lower case
+    folds_case = True
+
     def __init__(self, value, case_insensitive=False):
         self.case_insensitive = case_insensitive or False
         self.value = value
+        # Policy value folded once for case insensitive comparisons
+        self._fold = self.case_insensitive and self.folds_case
+        self._folded_value = value.lower() if self._fold and is_string(value) else value
 
-    def is_satisfied(self, ctx) -> bool:
-        if not is_string(ctx.attribute_value):
+    def is_satisfied_by(self, what, ctx) -> bool:
+        if not is_string(what):
             LOG.debug(
                 "Invalid type '%s' for attribute value at path '%s' for element '%s'."
                 " Condition not satisfied.",
-                type(ctx.attribute_value),
+                type(what),
                 ctx.attribute_path,
                 ctx.ace
             )
             return False
-        return self._is_satisfied(ctx.attribute_value)
+        if self._fold:
+            # Attribute value is folded once per evaluation context
+            return self._compare(ctx.fold_case(what), self._folded_value)
+        return self._compare(what, self.value)
 
-    @abstractmethod
     def _is_satisfied(self, what) -> bool:
         """
             Is string conditions satisfied
@@ -47,6 +56,20 @@ class StringCondition(ConditionBase, metaclass=ABCMeta):
             :param what: string value to check
             :return: True if satisfied else False
         """
+        if self._fold:
+            return self._compare(what.lower(), self._folded_value)
+        return self._compare(what, self.value)
+
+    @abstractmethod
+    def _compare(self, what: str, value: str) -> bool:
+        """
+            Compare string value with policy value, both folded to lower case
+            for case insensitive conditions
+
+            :param what: string value to check
+            :param value: policy value
+            :return: True if satisfied else False
+        """
         raise NotImplementedError()
 
 
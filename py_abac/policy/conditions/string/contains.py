@@ -12,10 +12,8 @@ class Contains(StringCondition):
         Condition for string `what` contains `value`
     """
 
-    def _is_satisfied(self, what) -> bool:
-        if self.case_insensitive:
-            return self.value.lower() in what.lower()
-        return self.value in what
+    def _compare(self, what, value) -> bool:
+        return value in what
 
 
 class ContainsSchema(StringConditionSchema):
@@ -12,10 +12,8 @@ class EndsWith(StringCondition):
         Condition for string `what` ends with `value`
     """
 
-    def _is_satisfied(self, what) -> bool:
-        if self.case_insensitive:
-            return what.lower().endswith(self.value.lower())
-        return what.endswith(self.value)
+    def _compare(self, what, value) -> bool:
+        return what.endswith(value)
 
 
 class EndsWithSchema(StringConditionSchema):
@@ -12,10 +12,8 @@ class NotContains(StringCondition):
         Condition for string `what` not contains `value`
     """
 
-    def _is_satisfied(self, what) -> bool:
-        if self.case_insensitive:
-            return self.value.lower() not in what.lower()
-        return self.value not in what
+    def _compare(self, what, value) -> bool:
+        return value not in what
 
 
 class NotContainsSchema(StringConditionSchema):
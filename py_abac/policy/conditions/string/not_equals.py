@@ -12,10 +12,8 @@ class NotEquals(StringCondition):
         Condition for string `what` not equals `value`
     """
 
-    def _is_satisfied(self, what) -> bool:
-        if self.case_insensitive:
-            return what.lower() != self.value.lower()
-        return what != self.value
+    def _compare(self, what, value) -> bool:
+        return what != value
 
 
 class NotEqualsSchema(StringConditionSchema):
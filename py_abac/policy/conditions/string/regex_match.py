@@ -2,20 +2,105 @@
     String regex match conditions
 """
 
+import functools
 import re
+from typing import Callable, Union
 
 from marshmallow import Schema, fields, post_load, ValidationError
 
 from .base import StringCondition
 
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse  # pylint: disable=deprecated-module
+    import sre_constants  # pylint: disable=deprecated-module
+
+# Opcodes of the regex parser are created at import time and unknown to pylint
+# pylint: disable=no-member
+_ANY = sre_constants.ANY
+_AT = sre_constants.AT
+_LITERAL = sre_constants.LITERAL
+# Repetition of any character matching possibly empty string, i.e. `.*` or `.*?`
+_ANY_REPEAT = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+_AT_BEGINNING = (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING)
+# pylint: enable=no-member
+
+
+def _literal_search(pattern: str) -> Union[Callable[[str], bool], None]:
+    """
+        Get substring or prefix check equivalent to searching the regex if it only
+        consists of literal characters, e.g. :code:`doc:`, :code:`^doc:` or
+        :code:`doc:.*`. Returns None for any other regex.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+        # Parser state is held by `pattern` attribute before Python 3.8
+        flags = (getattr(parsed, "state", None) or parsed.pattern).flags
+    # Broad exception as parser internals differ between Python versions
+    except Exception:  # pylint: disable=broad-except
+        return None
+    if flags & ~re.UNICODE:
+        return None
+    items = list(parsed)
+    anchored = bool(items) and items[0][0] == _AT and items[0][1] in _AT_BEGINNING
+    if anchored:
+        items.pop(0)
+
+    def is_any_repeat(item):
+        op, args = item
+        return op in _ANY_REPEAT and args[0] == 0 and list(args[2]) == [(_ANY, None)]
+
+    # Leading `.*` only matters for anchored regex as `.` does not match new lines
+    # while trailing `.*` may always match the empty string
+    while items and not anchored and is_any_repeat(items[0]):
+        items.pop(0)
+    while items and is_any_repeat(items[-1]):
+        items.pop()
+    if any(op != _LITERAL for op, _ in items):
+        return None
+    literal = "".join(chr(code) for _, code in items)
+    if anchored:
+        return lambda what: what.startswith(literal)
+    return lambda what: literal in what
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_regex(pattern: str) -> Callable[[str], bool]:
+    """
+        Compile regex into a callable checking whether a string contains a match,
+        i.e. :code:`re.search(pattern, what) is not None`. Literal regex are compiled
+        into plain substring or prefix checks.
+
+        Compiled regex are cached and shared across conditions, so that a regex
+        is only compiled once however many policies use it.
+
+        :param pattern: regex
+        :return: callable returning True if string contains a match else False
+    """
+    literal_search = _literal_search(pattern)
+    if literal_search is not None:
+        return literal_search
+    regex_search = re.compile(pattern).search
+    return lambda what: regex_search(what) is not None
+
 
 class RegexMatch(StringCondition):
     """
         Condition for string `what` matches regex `value`
     """
 
-    def _is_satisfied(self, what) -> bool:
-        return re.search(self.value, what) is not None
+    # Folding the string but not the regex would break matching of upper case
+    # regex, so matching is case sensitive as on the compiled path
+    folds_case = False
+
+    def __init__(self, value, case_insensitive=False):
+        super().__init__(value, case_insensitive)
+        # Compiled once when the condition is built
+        self._search = compile_regex(value)
+
+    def _compare(self, what, value) -> bool:
+        return self._search(what)
 
 
 def validate_regex(value):
@@ -25,7 +110,7 @@ def validate_regex(value):
     """
     # noinspection PyBroadException
     try:
-        re.compile(value)
+        compile_regex(value)
     except Exception:
         raise ValidationError("Invalid regex expression '{}'.".format(value))
 
@@ -12,10 +12,8 @@ class StartsWith(StringCondition):
         Condition for string `what` starts with `value`
     """
 
-    def _is_satisfied(self, what) -> bool:
-        if self.case_insensitive:
-            return what.lower().startswith(self.value.lower())
-        return what.startswith(self.value)
+    def _compare(self, what, value) -> bool:
+        return what.startswith(value)
 
 
 class StartsWithSchema(StringConditionSchema):
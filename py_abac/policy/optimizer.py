@@ -0,0 +1,318 @@
+"""
+    Cost-based ordering of rule conditions
+"""
+
+from typing import Tuple
+
+from .conditions.base import ConditionBase
+from .conditions.collection.all_in import AllIn
+from .conditions.collection.all_not_in import AllNotIn
+from .conditions.collection.any_in import AnyIn
+from .conditions.collection.any_not_in import AnyNotIn
+from .conditions.collection.is_empty import IsEmpty
+from .conditions.collection.is_in import IsIn
+from .conditions.collection.is_not_empty import IsNotEmpty
+from .conditions.collection.is_not_in import IsNotIn
+from .conditions.logic._not import Not
+from .conditions.logic.all_of import AllOf
+from .conditions.logic.any_of import AnyOf
+from .conditions.numeric.eq import Eq
+from .conditions.numeric.gt import Gt
+from .conditions.numeric.gte import Gte
+from .conditions.numeric.lt import Lt
+from .conditions.numeric.lte import Lte
+from .conditions.numeric.neq import Neq
+from .conditions.object.equals_object import EqualsObject
+from .conditions.others.any import Any as AnyValue
+from .conditions.others.cidr import CIDR
+from .conditions.others.equals_attribute import EqualsAttribute
+from .conditions.others.exists import Exists
+from .conditions.others.not_exists import NotExists
+from .conditions.string.contains import Contains
+from .conditions.string.ends_with import EndsWith
+from .conditions.string.equals import Equals
+from .conditions.string.not_contains import NotContains
+from .conditions.string.not_equals import NotEquals
+from .conditions.string.regex_match import RegexMatch
+from .conditions.string.starts_with import StartsWith
+
+ACCESS_CONTROL_ELEMENTS = ("subject", "resource", "action", "context")
+
+# Estimated duration of condition evaluation in microseconds by condition type
+CONDITION_COSTS = {
+    AnyValue: 0.0,
+    Exists: 0.03,
+    NotExists: 0.03,
+    EqualsObject: 0.05,
+    IsEmpty: 0.05,
+    IsNotEmpty: 0.05,
+    IsIn: 0.07,
+    IsNotIn: 0.07,
+    Equals: 0.08,
+    NotEquals: 0.08,
+    Contains: 0.08,
+    NotContains: 0.08,
+    StartsWith: 0.08,
+    EndsWith: 0.08,
+    Eq: 0.1,
+    Neq: 0.1,
+    Gt: 0.1,
+    Gte: 0.1,
+    Lt: 0.1,
+    Lte: 0.1,
+    CIDR: 0.2,
+    RegexMatch: 0.2,
+    AllIn: 0.2,
+    AllNotIn: 0.2,
+    AnyIn: 0.2,
+    AnyNotIn: 0.2,
+}
+# Estimated duration of evaluating conditions of other types, e.g. custom conditions
+DEFAULT_CONDITION_COST = 10.0
+# Estimated duration of attribute lookup from request in microseconds. Durations of
+# lookups from attribute providers are only known from rule statistics.
+ATTRIBUTE_LOOKUP_COST = 1.5
+# Probability of a condition being satisfied assumed without rule statistics
+DEFAULT_PASS_RATE = 0.5
+
+
+def condition_cost(condition: ConditionBase) -> float:
+    """
+        Estimate duration of condition evaluation in microseconds
+
+        :param condition: condition to estimate
+        :return: estimated duration
+    """
+    cls = type(condition)
+    if cls in (AllOf, AnyOf):
+        return sum(condition_cost(value) for value in condition.values)
+    if cls is Not:
+        return condition_cost(condition.value)
+    if cls is EqualsAttribute:
+        return 0.1 + ATTRIBUTE_LOOKUP_COST
+    return CONDITION_COSTS.get(cls, DEFAULT_CONDITION_COST)
+
+
+class RuleStatistics(object):
+    """
+        Runtime statistics of rule evaluation refining the estimated costs and
+        selectivities conditions are ordered by. Durations of attribute lookups are
+        recorded per attribute, so that attributes resolved by slow attribute providers
+        are looked up last. Durations and outcomes of conditions are recorded per
+        attribute and condition type.
+
+        Statistics are recorded by rules optimized with them. Estimates are published
+        every :code:`refresh_interval` recorded conditions, after which a PDP using the
+        statistics optimizes the rules of policies again.
+
+        :Example:
+
+        .. code-block:: python
+
+            pdp = PDP(storage, statistics=RuleStatistics())
+
+        .. note::
+
+            Recording is not synchronized, so counts may be slightly off when rules are
+            evaluated by several threads at once.
+
+        :param refresh_interval: number of recorded conditions between published estimates
+        :param min_samples: minimum number of samples before measured values replace estimates
+    """
+
+    def __init__(self, refresh_interval: int = 10000, min_samples: int = 100):
+        if refresh_interval < 1 or min_samples < 1:
+            raise ValueError("Invalid refresh interval '{}' or minimum samples '{}'.".format(
+                refresh_interval, min_samples))
+        self._refresh_interval = refresh_interval
+        self._min_samples = min_samples
+        # Lookups as [count, total duration] keyed by (ace, attribute path)
+        self._lookups = {}
+        # Evaluations as [count, passed, total duration] keyed by
+        # (ace, attribute path, condition type)
+        self._conditions = {}
+        self._recorded = 0
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """
+            Number of estimates published
+        """
+        return self._generation
+
+    def record_lookup(self, ace: str, attribute_path: str, duration: float):
+        """
+            Record attribute lookup
+
+            :param ace: access control element
+            :param attribute_path: attribute path
+            :param duration: lookup duration in seconds
+        """
+        entry = self._lookups.get((ace, attribute_path))
+        if entry is None:
+            entry = self._lookups[(ace, attribute_path)] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += duration
+
+    def record_condition(
+            self,
+            ace: str,
+            attribute_path: str,
+            condition: ConditionBase,
+            passed: bool,
+            duration: float
+    ):
+        """
+            Record condition evaluation
+
+            :param ace: access control element
+            :param attribute_path: attribute path
+            :param condition: evaluated condition
+            :param passed: whether condition was satisfied
+            :param duration: evaluation duration in seconds
+        """
+        key = (ace, attribute_path, type(condition))
+        entry = self._conditions.get(key)
+        if entry is None:
+            entry = self._conditions[key] = [0, 0, 0.0]
+        entry[0] += 1
+        if passed:
+            entry[1] += 1
+        entry[2] += duration
+        self._recorded += 1
+        if self._recorded % self._refresh_interval == 0:
+            self._generation += 1
+
+    def lookup_cost(self, ace: str, attribute_path: str) -> float:
+        """
+            Get mean duration of attribute lookup in microseconds
+        """
+        entry = self._lookups.get((ace, attribute_path))
+        if entry is None or entry[0] < self._min_samples:
+            return ATTRIBUTE_LOOKUP_COST
+        return 1e6 * entry[1] / entry[0]
+
+    def condition_cost(self, ace: str, attribute_path: str, condition: ConditionBase) -> float:
+        """
+            Get mean duration of condition evaluation in microseconds
+        """
+        entry = self._conditions.get((ace, attribute_path, type(condition)))
+        if entry is None or entry[0] < self._min_samples:
+            return condition_cost(condition)
+        return 1e6 * entry[2] / entry[0]
+
+    def pass_rate(self, ace: str, attribute_path: str, condition: ConditionBase) -> float:
+        """
+            Get fraction of evaluations satisfying condition
+        """
+        entry = self._conditions.get((ace, attribute_path, type(condition)))
+        if entry is None or entry[0] < self._min_samples:
+            return 1.0 if type(condition) is AnyValue else DEFAULT_PASS_RATE  # pylint: disable=unidiomatic-typecheck
+        return entry[1] / entry[0]
+
+    def clear(self):
+        """
+            Discard recorded statistics
+        """
+        self._lookups = {}
+        self._conditions = {}
+        self._generation += 1
+
+
+# Statistics without samples estimating rules optimized without runtime statistics
+_ESTIMATES = RuleStatistics()
+
+
+def _estimate(step, statistics: RuleStatistics) -> Tuple[float, float]:
+    """
+        Estimate (cost, pass rate) of plan step
+    """
+    ace, attribute_path, condition = step
+    if attribute_path is not None:
+        return (statistics.lookup_cost(ace, attribute_path) +
+                statistics.condition_cost(ace, attribute_path, condition),
+                statistics.pass_rate(ace, attribute_path, condition))
+    # Alternative conjunctions are tried until one is satisfied
+    cost = 0.0
+    fail_rate = 1.0
+    for branch in condition:
+        branch_cost, branch_pass_rate = _estimate_conjunction(branch, statistics)
+        cost += fail_rate * branch_cost
+        fail_rate *= 1.0 - branch_pass_rate
+    return cost, 1.0 - fail_rate
+
+
+def _estimate_conjunction(steps, statistics: RuleStatistics) -> Tuple[float, float]:
+    """
+        Estimate (cost, pass rate) of ordered conjunction of plan steps
+    """
+    cost = 0.0
+    pass_rate = 1.0
+    for step in steps:
+        step_cost, step_pass_rate = _estimate(step, statistics)
+        cost += pass_rate * step_cost
+        pass_rate *= step_pass_rate
+    return cost, pass_rate
+
+
+def _rank(cost: float, rate: float) -> float:
+    """
+        Expected cost per outcome deciding the result: ranking conditions of a conjunction
+        by cost over failure rate, and conjunctions of a disjunction by cost over pass rate,
+        minimizes expected evaluation cost
+    """
+    if rate <= 0.0:
+        return float("inf")
+    return cost / rate
+
+
+def _order_conjunction(steps, statistics: RuleStatistics) -> Tuple:
+    """
+        Order steps of conjunction by cost over failure rate
+    """
+    estimates = [_estimate(step, statistics) for step in steps]
+    order = sorted(range(len(steps)),
+                   key=lambda idx: _rank(estimates[idx][0], 1.0 - estimates[idx][1]))
+    return tuple(steps[idx] for idx in order)
+
+
+def _order_disjunction(branches, statistics: RuleStatistics) -> Tuple:
+    """
+        Order conjunctions of disjunction by cost over pass rate
+    """
+    estimates = [_estimate_conjunction(branch, statistics) for branch in branches]
+    order = sorted(range(len(branches)),
+                   key=lambda idx: _rank(estimates[idx][0], estimates[idx][1]))
+    return tuple(branches[idx] for idx in order)
+
+
+def plan_rules(rules, statistics: RuleStatistics = None) -> Tuple:
+    """
+        Order conditions of rules by estimated cost and selectivity. Conditions that all
+        have to be satisfied are merged across access control elements and ordered
+        so that cheap conditions likely to fail are evaluated first. Alternative rules
+        are ordered so that cheap rules likely to be satisfied are tried first. Sorting
+        is stable, so conditions with the same estimates keep their order.
+
+        :param rules: policy rules
+        :param statistics: optional runtime statistics refining the estimates
+        :return: ordered plan of (ace, attribute path, condition) steps. Alternative rules are
+                 (ace, None, conjunctions) steps holding a tuple of ordered plans.
+    """
+    statistics = statistics or _ESTIMATES
+    steps = []
+    for ace in ACCESS_CONTROL_ELEMENTS:
+        ace_conditions = getattr(rules, ace)
+        if isinstance(ace_conditions, list):
+            branches = [
+                _order_conjunction(
+                    [(ace, path, condition) for path, condition in _ace_conditions.items()],
+                    statistics
+                )
+                for _ace_conditions in ace_conditions
+            ]
+            steps.append((ace, None, _order_disjunction(branches, statistics)))
+        else:
+            steps.extend((ace, path, condition) for path, condition in ace_conditions.items())
+    return _order_conjunction(steps, statistics)
@@ -2,8 +2,11 @@
     Policy class
 """
 
+from typing import Set, Tuple
+
 from marshmallow import Schema, fields, post_load, ValidationError, validate
 
+from .compiler import compile_rules
 from .rules import Rules, RulesSchema
 from .targets import Targets, TargetsSchema
 from ..context import EvaluationContext
@@ -35,6 +38,8 @@ class Policy(object):
         self.targets = targets
         self.effect = effect
         self.priority = priority
+        # Compiled rules along with the evaluation plan they were compiled from
+        self._compiled = None
 
     @staticmethod
     def from_json(data: dict) -> "Policy":
@@ -61,6 +66,41 @@ class Policy(object):
         """
         return self.rules.is_satisfied(ctx) and self.targets.match(ctx)
 
+    def compile(self):
+        """
+            Compile policy rules into a specialized callable used by `fits_compiled`.
+            Rules are compiled automatically on first use and whenever their evaluation
+            plan changes; call this method to recompile after modifying rules in place.
+        """
+        self.rules.optimize(self.rules.statistics)
+        self._compile()
+
+    def _compile(self):
+        """
+            Compile policy rules following their current evaluation plan
+        """
+        self._compiled = (self.rules.plan, compile_rules(self.rules))
+
+    def fits_compiled(self, ctx: EvaluationContext) -> bool:
+        """
+            Check if the request fits policy using compiled rules. Gives the same result
+            as `fits` with less overhead.
+
+            :param ctx: evaluation context
+            :return: True if fits else False
+        """
+        if self._compiled is None or self._compiled[0] is not self.rules.plan:
+            self._compile()
+        return self._compiled[1](ctx) and self.targets.match(ctx)
+
+    def attribute_refs(self) -> Set[Tuple[str, str]]:
+        """
+            Get all attributes referred by the policy
+
+            :return: set of (access control element, attribute path) pairs
+        """
+        return self.rules.attribute_refs()
+
     @property
     def is_allowed(self) -> bool:
         """
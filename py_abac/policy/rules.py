@@ -2,19 +2,44 @@
     Policy rules class
 """
 
-from typing import Union, List, Dict
+import time
+from typing import Union, List, Dict, Set, Tuple
 
 from marshmallow import Schema, fields, post_load
 
 from .conditions.others.equals_attribute import validate_path
 from .conditions.schema import ConditionSchema
+from .optimizer import ACCESS_CONTROL_ELEMENTS, RuleStatistics, plan_rules
 from ..context import EvaluationContext
 
 
+def _ace_property(name: str) -> property:
+    """
+        Create property for conditions of access control element, which is
+        planned again on next evaluation after the conditions are assigned
+    """
+    attr = "_" + name
+
+    def getter(self):
+        return getattr(self, attr)
+
+    def setter(self, value):
+        setattr(self, attr, value)
+        self.invalidate()
+
+    return property(getter, setter, doc="Conditions of {} access control element".format(name))
+
+
 class Rules(object):
     """
-        Policy rules
+        Policy rules. Conditions are evaluated in the order given by the optimizer,
+        see :func:`py_abac.policy.optimizer.plan_rules`, which is computed on first
+        evaluation and again after an access control element is assigned.
     """
+    subject = _ace_property("subject")
+    resource = _ace_property("resource")
+    action = _ace_property("action")
+    context = _ace_property("context")
 
     def __init__(
             self,
@@ -23,10 +48,64 @@ class Rules(object):
             action: Union[List, Dict],
             context: Union[List, Dict]
     ):
-        self.subject = subject
-        self.resource = resource
-        self.action = action
-        self.context = context
+        self._subject = subject
+        self._resource = resource
+        self._action = action
+        self._context = context
+        # Planned on first evaluation, so that policies loaded but not evaluated
+        # do not pay for it
+        self._plan = None
+        self._statistics = None
+        self._generation = None
+
+    def invalidate(self):
+        """
+            Discard the evaluation order, so that it is planned again on next evaluation
+        """
+        self._plan = None
+
+    @property
+    def plan(self) -> Tuple:
+        """
+            Evaluation order of conditions as returned by
+            :func:`py_abac.policy.optimizer.plan_rules`
+        """
+        if self._plan is None:
+            self.optimize(self._statistics)
+        return self._plan
+
+    @property
+    def statistics(self) -> Union[RuleStatistics, None]:
+        """
+            Runtime statistics the rules were optimized with and record their evaluation to
+        """
+        return self._statistics
+
+    def optimize(self, statistics: RuleStatistics = None):
+        """
+            Order conditions by estimated cost and selectivity. Call this method or
+            :meth:`invalidate` after modifying access control element conditions in place.
+
+            :param statistics: optional runtime statistics refining the estimates. Evaluations
+                               of the rules are recorded to the statistics.
+        """
+        plan = plan_rules(self, statistics)
+        # Plan is published last as rules may be evaluated concurrently
+        self._statistics = statistics
+        self._generation = statistics.generation if statistics is not None else None
+        self._plan = plan
+
+    def is_optimized(self, statistics: RuleStatistics = None) -> bool:
+        """
+            Check if rules are optimized with the latest estimates of statistics
+
+            :param statistics: runtime statistics or None for static estimates
+            :return: True if up to date else False
+        """
+        if statistics is None:
+            return self._plan is not None and self._statistics is None
+        return self._plan is not None and self._statistics is statistics and \
+            self._generation == statistics.generation
 
     def is_satisfied(self, ctx: EvaluationContext):
         """
@@ -35,48 +114,78 @@ class Rules(object):
             :param ctx: policy evaluation context
             :return: True if satisfied else False
         """
-        return self._is_satisfied("subject", self.subject, ctx) and \
-               self._is_satisfied("resource", self.resource, ctx) and \
-               self._is_satisfied("action", self.action, ctx) and \
-               self._is_satisfied("context", self.context, ctx)
+        plan = self.plan
+        if self._statistics is not None:
+            return self._run_measured(plan, ctx, self._statistics)
+        return self._run(plan, ctx)
 
-    def _is_satisfied(self, ace_name: str, ace_conditions, ctx: EvaluationContext):
+    def attribute_refs(self) -> Set[Tuple[str, str]]:
         """
-            Check if the access control element satisfies request
+            Get all attributes referred by the rules
 
-            :param ace_name: access control element name
-            :param ace_conditions: access control element conditions
-            :param ctx: policy evaluation context
-            :return: True if satisfied else False
+            :return: set of (access control element, attribute path) pairs
+        """
+        refs = set()
+        for ace_name in ACCESS_CONTROL_ELEMENTS:
+            ace_conditions = getattr(self, ace_name)
+            if not isinstance(ace_conditions, list):
+                ace_conditions = [ace_conditions]
+            for _ace_conditions in ace_conditions:
+                for attribute_path, condition in _ace_conditions.items():
+                    refs.add((ace_name, attribute_path))
+                    refs.update(condition.attribute_refs())
+        return refs
+
+    @classmethod
+    def _run(cls, plan: Tuple, ctx: EvaluationContext):
         """
-        if isinstance(ace_conditions, list):
-            return self._implicit_or(ace_name, ace_conditions, ctx)
-        if isinstance(ace_conditions, dict):
-            return self._implicit_and(ace_name, ace_conditions, ctx)
-
-        # If ace is not in correct format, return False. This condition is just for best
-        # practice and will never happen
-        return False  # pragma: no cover
-
-    def _implicit_or(self, ace_name: str, ace_conditions: list, ctx: EvaluationContext):
-        for _ace_conditions in ace_conditions:
-            # If even one of the conditions is satisfied, return True
-            if self._implicit_and(ace_name, _ace_conditions, ctx):
-                return True
-        # If no conditions are satisfied, return False
-        return False
-
-    @staticmethod
-    def _implicit_and(ace_name: str, ace_conditions: dict, ctx: EvaluationContext):
-        for attribute_path, condition in ace_conditions.items():
+            Evaluate conditions in order of plan
+        """
+        stats = ctx.stats
+        for ace_name, attribute_path, condition in plan:
+            if attribute_path is None:
+                # Alternative rules: if even one of them is satisfied, go on
+                if not any(cls._run(branch, ctx) for branch in condition):
+                    return False
+                continue
             ctx.ace = ace_name
             ctx.attribute_path = attribute_path
+            if stats is not None:
+                stats.condition_evaluations += 1
+            # Attribute value is resolved once and handed to the condition
+            what = ctx.get_attribute_value(ace_name, attribute_path)
             # If even one of the conditions is not satisfied, return False
-            if not condition.is_satisfied(ctx):
+            if not condition.is_satisfied_by(what, ctx):
                 return False
         # If all conditions are satisfied, return True
         return True
 
+    @classmethod
+    def _run_measured(cls, plan: Tuple, ctx: EvaluationContext, statistics: RuleStatistics):
+        """
+            Evaluate conditions in order of plan recording their evaluation to statistics
+        """
+        stats = ctx.stats
+        for ace_name, attribute_path, condition in plan:
+            if attribute_path is None:
+                if not any(cls._run_measured(branch, ctx, statistics) for branch in condition):
+                    return False
+                continue
+            ctx.ace = ace_name
+            ctx.attribute_path = attribute_path
+            if stats is not None:
+                stats.condition_evaluations += 1
+            start = time.perf_counter()
+            what = ctx.get_attribute_value(ace_name, attribute_path)
+            looked_up = time.perf_counter()
+            satisfied = condition.is_satisfied_by(what, ctx)
+            statistics.record_lookup(ace_name, attribute_path, looked_up - start)
+            statistics.record_condition(ace_name, attribute_path, condition, satisfied,
+                                        time.perf_counter() - looked_up)
+            if not satisfied:
+                return False
+        return True
+
 
 class RuleField(fields.Field):
     """
@@ -0,0 +1,375 @@
+"""
+    Multi-pattern string index answering which patterns a string contains, starts
+    or ends with, and its use for skipping policies whose string conditions fail
+"""
+
+import threading
+from collections import Counter, deque
+from typing import Dict, FrozenSet, Hashable, List, Set, Tuple, Union
+
+from .conditions.logic.all_of import AllOf
+from .conditions.string.contains import Contains
+from .conditions.string.ends_with import EndsWith
+from .conditions.string.not_contains import NotContains
+from .conditions.string.starts_with import StartsWith
+
+# Positions at which pattern is searched in text
+ANYWHERE = "anywhere"
+START = "start"
+END = "end"
+
+# Minimum number of patterns searched anywhere in text by the Aho-Corasick automaton
+# instead of one by one
+_AUTOMATON_THRESHOLD = 64
+
+_POSITIONS = {Contains: ANYWHERE, NotContains: ANYWHERE, StartsWith: START, EndsWith: END}
+
+
+class _Automaton(object):
+    """
+        Immutable matcher built from the patterns of a string index. Prefixes and
+        suffixes are grouped by length and looked up with a single slice of text
+        per length. Patterns searched anywhere are found in one pass over the text
+        by an Aho-Corasick automaton once there are enough of them.
+    """
+    __slots__ = ("prefixes", "suffixes", "patterns", "goto", "fail", "outputs")
+
+    def __init__(self, entries: Dict[str, Dict[str, Set[Hashable]]]):
+        # The empty pattern is found anywhere as it is found at the start
+        prefixes = dict(entries[START])
+        if "" in entries[ANYWHERE]:
+            prefixes[""] = prefixes.get("", frozenset()) | entries[ANYWHERE][""]
+        self.prefixes = self._group_by_length(prefixes)
+        self.suffixes = self._group_by_length(entries[END])
+        patterns = [(pattern, frozenset(keys))
+                    for pattern, keys in entries[ANYWHERE].items() if pattern]
+        self.patterns = patterns
+        self.goto = self.fail = self.outputs = None
+        if len(patterns) >= _AUTOMATON_THRESHOLD:
+            self._build(patterns)
+
+    @staticmethod
+    def _group_by_length(
+            entries: Dict[str, Set[Hashable]]
+    ) -> List[Tuple[int, Dict[str, FrozenSet]]]:
+        """
+            Group patterns by their length
+        """
+        groups = {}
+        for pattern, keys in entries.items():
+            groups.setdefault(len(pattern), {})[pattern] = frozenset(keys)
+        return sorted(groups.items())
+
+    def _build(self, patterns: List[Tuple[str, FrozenSet]]):
+        """
+            Build Aho-Corasick automaton: a trie of patterns whose nodes link to the
+            node of their longest proper suffix found in the trie
+        """
+        goto = [{}]
+        outputs = [frozenset()]
+        for pattern, keys in patterns:
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = goto[state][char] = len(goto)
+                    goto.append({})
+                    outputs.append(frozenset())
+                state = next_state
+            outputs[state] = outputs[state] | keys
+
+        # Failure links are set breadth first so that links of shallower nodes are known
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                fail[next_state] = goto[link].get(char, 0) if state else 0
+                # Patterns that are suffixes of the node are found along with it
+                outputs[next_state] = outputs[next_state] | outputs[fail[next_state]]
+                queue.append(next_state)
+
+        self.goto = goto
+        self.fail = fail
+        self.outputs = [keys or None for keys in outputs]
+
+    def match(self, text: str) -> Set[Hashable]:
+        """
+            Get keys of patterns found in text at their position
+        """
+        matched = set()
+        for length, patterns in self.prefixes:
+            keys = patterns.get(text[:length])
+            if keys:
+                matched.update(keys)
+        for length, patterns in self.suffixes:
+            keys = patterns.get(text[len(text) - length:])
+            if keys:
+                matched.update(keys)
+
+        goto = self.goto
+        if goto is None:
+            for pattern, keys in self.patterns:
+                if pattern in text:
+                    matched.update(keys)
+            return matched
+        fail = self.fail
+        outputs = self.outputs
+        state = 0
+        for char in text:
+            while True:
+                next_state = goto[state].get(char)
+                if next_state is not None:
+                    state = next_state
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            if outputs[state]:
+                matched.update(outputs[state])
+        return matched
+
+
+class StringIndex(object):
+    """
+        Index of string patterns each searched anywhere in text, at its start or
+        at its end. Looking up the patterns found in a string takes a single pass
+        over the string however many patterns are indexed.
+
+        :Example:
+
+        .. code-block:: python
+
+            index = StringIndex()
+            index.add("chrome", "chrome")
+            index.add("mozilla", "mozilla", START)
+            index.add("bot", "bot", END)
+            index.match("mozilla/5.0 chrome/120.0")  # {"chrome", "mozilla"}
+    """
+
+    def __init__(self):
+        # Keys of patterns by position
+        self._entries = {ANYWHERE: {}, START: {}, END: {}}
+        self._size = 0
+        self._automaton = None
+        self._lock = threading.Lock()
+
+    def add(self, pattern: str, key: Hashable, position: str = ANYWHERE):
+        """
+            Add key of pattern to the index
+
+            :param pattern: string pattern
+            :param key: key returned for text containing the pattern
+            :param position: position of pattern in text, one of :code:`"anywhere"`,
+                             :code:`"start"` or :code:`"end"`
+        """
+        if position not in self._entries:
+            raise ValueError("Invalid pattern position '{}'.".format(position))
+        with self._lock:
+            keys = self._entries[position].setdefault(pattern, set())
+            if key not in keys:
+                keys.add(key)
+                self._size += 1
+                self._automaton = None
+
+    def remove(self, pattern: str, key: Hashable, position: str = ANYWHERE):
+        """
+            Remove key of pattern from the index
+
+            :param pattern: string pattern
+            :param key: key of pattern
+            :param position: position of pattern in text
+        """
+        with self._lock:
+            keys = self._entries.get(position, {}).get(pattern)
+            if not keys or key not in keys:
+                return
+            keys.discard(key)
+            if not keys:
+                del self._entries[position][pattern]
+            self._size -= 1
+            self._automaton = None
+
+    @property
+    def automaton(self) -> _Automaton:
+        """
+            Immutable matcher of the patterns currently indexed. It is rebuilt on first
+            use after the index changes.
+        """
+        automaton = self._automaton
+        if automaton is None:
+            with self._lock:
+                if self._automaton is None:
+                    self._automaton = _Automaton(self._entries)
+                automaton = self._automaton
+        return automaton
+
+    def match(self, text: str) -> Set[Hashable]:
+        """
+            Get keys of all patterns found in text at their position
+
+            :param text: string to search
+            :return: set of keys
+        """
+        return self.automaton.match(text)
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def _required_strings(condition):
+    """
+        Yield (case insensitive, position, pattern, negated) of string conditions
+        the condition cannot be satisfied without
+    """
+    cls = type(condition)
+    if cls in _POSITIONS:
+        yield (
+            condition.case_insensitive,
+            _POSITIONS[cls],
+            condition._folded_value,  # pylint: disable=protected-access
+            cls is NotContains
+        )
+    elif cls is AllOf:
+        for value in condition.values:
+            yield from _required_strings(value)
+
+
+class StringConditionIndex(object):
+    """
+        Index of the :code:`Contains`, :code:`NotContains`, :code:`StartsWith` and
+        :code:`EndsWith` conditions policies require. Patterns of conditions on the
+        same attribute are held in one :class:`StringIndex`, so that the attribute
+        value is scanned once per evaluation context and policies with a failing
+        string condition are skipped without evaluating their rules.
+
+        Only conditions that all have to be satisfied, i.e. not within a list of
+        alternative rules, are indexed. Policies are indexed by UID along with the
+        evaluation plan of their rules, so that a policy is indexed again when
+        retrieved with other rules, e.g. after being changed by another process, or
+        when its rules are optimized again after modification.
+    """
+
+    def __init__(self):
+        # String indices keyed by (ace, attribute path, case insensitive)
+        self._indices = {}
+        # Evaluation plan of the indexed rules and their required string conditions keyed
+        # by policy UID. Conditions are (ace, attribute path, case insensitive, string
+        # index, key, negated) tuples.
+        self._policies = {}
+        # Number of policies referring to each (string index, key, position)
+        self._refs = Counter()
+        self._lock = threading.Lock()
+
+    def excludes(self, policy, ctx) -> bool:
+        """
+            Check if a string condition required by policy is not satisfied
+
+            :param policy: policy to check
+            :param ctx: evaluation context
+            :return: True if policy does not fit the request else False
+        """
+        entry = self._policies.get(policy.uid)
+        if entry is not None and entry[0] is policy.rules.plan:
+            requirements = entry[1]
+        else:
+            requirements = self.add(policy)
+        for ace, attribute_path, case_insensitive, index, key, negated in requirements:
+            value = ctx.get_attribute_value(ace, attribute_path)
+            if not isinstance(value, str):
+                return True
+            if case_insensitive:
+                value = ctx.fold_case(value)
+            if (key in ctx.match_strings(index, value)) == negated:
+                return True
+        return False
+
+    def add(self, policy) -> Tuple:
+        """
+            Index required string conditions of policy
+
+            :param policy: policy to index
+            :return: required string conditions of policy
+        """
+        with self._lock:
+            plan = policy.rules.plan
+            entry = self._policies.get(policy.uid)
+            if entry is not None:
+                if entry[0] is plan:
+                    return entry[1]
+                # Conditions of a superseded version of the policy
+                self._release(entry[1])
+            requirements = []
+            for ace, ace_conditions in self._conjunctions(policy.rules):
+                for attribute_path, condition in ace_conditions.items():
+                    requirements.extend(self._acquire(ace, attribute_path, required)
+                                        for required in _required_strings(condition))
+            requirements = tuple(requirements)
+            self._policies[policy.uid] = (plan, requirements)
+            return requirements
+
+    def remove(self, uid: Union[str, None]):
+        """
+            Remove policy from the index. Used as storage change callback.
+
+            :param uid: policy UID or None to remove all policies
+        """
+        with self._lock:
+            if uid is None:
+                self._indices.clear()
+                self._policies.clear()
+                self._refs.clear()
+                return
+            entry = self._policies.pop(uid, None)
+            if entry is not None:
+                self._release(entry[1])
+
+    def _acquire(self, ace: str, attribute_path: str, required: Tuple) -> Tuple:
+        """
+            Add pattern of required string condition unless another policy refers to it.
+            Must be called holding the lock.
+
+            :param ace: access control element
+            :param attribute_path: attribute path
+            :param required: (case insensitive, position, pattern, negated) of required
+                             string condition
+            :return: requirement of policy as kept by the index
+        """
+        case_insensitive, position, pattern, negated = required
+        index_key = (ace, attribute_path, case_insensitive)
+        if index_key not in self._indices:
+            self._indices[index_key] = StringIndex()
+        index = self._indices[index_key]
+        key = (position, pattern)
+        if not self._refs[(index, key)]:
+            index.add(pattern, key, position)
+        self._refs[(index, key)] += 1
+        return ace, attribute_path, case_insensitive, index, key, negated
+
+    def _release(self, requirements: Tuple):
+        """
+            Remove patterns of required string conditions no other policy refers to.
+            Must be called holding the lock.
+        """
+        for _, _, _, index, key, _ in requirements:
+            self._refs[(index, key)] -= 1
+            if not self._refs[(index, key)]:
+                del self._refs[(index, key)]
+                index.remove(key[1], key, key[0])
+
+    @staticmethod
+    def _conjunctions(rules):
+        """
+            Yield (ace, conditions) of access control elements whose conditions all
+            have to be satisfied
+        """
+        for ace in ("subject", "resource", "action", "context"):
+            ace_conditions = getattr(rules, ace)
+            if isinstance(ace_conditions, dict):
+                yield ace, ace_conditions
+
+    def __len__(self) -> int:
+        return len(self._policies)
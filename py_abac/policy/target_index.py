@@ -0,0 +1,295 @@
+"""
+    Index of policy targets answering which policies match given target IDs
+"""
+
+import copy
+import os
+from typing import Dict, Hashable, List, Set, Tuple
+
+from .targets import Targets, compile_target_pattern
+
+
+class _Node(object):
+    """
+        Trie node. Edges are labelled with literal characters, the single character
+        wildcard `?` and the multi character wildcard `*`. A node entered through
+        `*` loops on any character.
+    """
+    __slots__ = ("children", "any_char", "star", "loop", "keys")
+
+    def __init__(self, loop: bool = False):
+        self.children = {}
+        self.any_char = None
+        self.star = None
+        self.loop = loop
+        self.keys = set()
+
+    def is_empty(self) -> bool:
+        """
+            Check if node has neither keys nor outgoing edges
+        """
+        return not (self.keys or self.children or self.any_char or self.star)
+
+    def copy(self) -> "_Node":
+        """
+            Deep copy of the sub-trie rooted at this node
+        """
+        node = _Node(self.loop)
+        node.children = {char: child.copy() for char, child in self.children.items()}
+        node.any_char = self.any_char.copy() if self.any_char else None
+        node.star = self.star.copy() if self.star else None
+        node.keys = set(self.keys)
+        return node
+
+
+def _closure(nodes: List[_Node]) -> List[_Node]:
+    """
+        Add nodes reachable through `*` edges matching the empty string
+    """
+    rvalue = []
+    seen = set()
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        rvalue.append(node)
+        if node.star is not None:
+            stack.append(node.star)
+    return rvalue
+
+
+class PatternIndex(object):
+    """
+        Index of Unix shell-style wildcard patterns, as used for policy target IDs,
+        mapping each pattern to a set of keys.
+
+        Exact IDs are kept in a dictionary. Patterns built of literal characters and
+        the `*` and `?` wildcards are stored in a trie which is walked as a
+        non-deterministic automaton, so that a lookup takes time proportional to the
+        length of the ID rather than the number of patterns. The rarely used
+        character classes, e.g. `[a-z]`, fall back to pre-compiled regular expressions.
+        Matching is identical to :func:`fnmatch.fnmatch`.
+    """
+
+    def __init__(self):
+        self._exact = {}
+        self._root = _Node()
+        self._other = {}
+
+    def copy(self) -> "PatternIndex":
+        """
+            Deep copy of the index
+        """
+        index = copy.copy(self)
+        vars(index).update(
+            _exact={pattern: set(keys) for pattern, keys in self._exact.items()},
+            _root=self._root.copy(),
+            _other={pattern: (matcher, set(keys))
+                    for pattern, (matcher, keys) in self._other.items()}
+        )
+        return index
+
+    def add(self, pattern: str, key: Hashable):
+        """
+            Add key for pattern
+        """
+        pattern = os.path.normcase(pattern)
+        if "[" in pattern:
+            matcher, keys = self._other.get(pattern, (None, set()))
+            keys.add(key)
+            self._other[pattern] = (matcher or compile_target_pattern(pattern), keys)
+        elif "*" in pattern or "?" in pattern:
+            self._insert(pattern).keys.add(key)
+        else:
+            self._exact.setdefault(pattern, set()).add(key)
+
+    def remove(self, pattern: str, key: Hashable):
+        """
+            Remove key for pattern. Unknown keys are ignored.
+        """
+        pattern = os.path.normcase(pattern)
+        if "[" in pattern:
+            if pattern in self._other:
+                keys = self._other[pattern][1]
+                keys.discard(key)
+                if not keys:
+                    del self._other[pattern]
+        elif "*" in pattern or "?" in pattern:
+            self._delete(self._root, self._tokens(pattern), key)
+        elif pattern in self._exact:
+            keys = self._exact[pattern]
+            keys.discard(key)
+            if not keys:
+                del self._exact[pattern]
+
+    def match(self, ace_id: str) -> Set[Hashable]:
+        """
+            Get keys of all patterns matching `ace_id`
+        """
+        ace_id = os.path.normcase(ace_id)
+        rvalue = set(self._exact.get(ace_id, ()))
+        for node in self._walk(ace_id):
+            rvalue.update(node.keys)
+        for matcher, keys in self._other.values():
+            if matcher(ace_id):
+                rvalue.update(keys)
+        return rvalue
+
+    def _walk(self, ace_id: str) -> List[_Node]:
+        """
+            Run the trie automaton over ID returning the nodes reached
+        """
+        nodes = _closure([self._root])
+        for char in ace_id:
+            reached = []
+            for node in nodes:
+                if node.loop:
+                    reached.append(node)
+                child = node.children.get(char)
+                if child is not None:
+                    reached.append(child)
+                if node.any_char is not None:
+                    reached.append(node.any_char)
+            if not reached:
+                return []
+            nodes = _closure(reached)
+        return nodes
+
+    @staticmethod
+    def _tokens(pattern: str) -> List[str]:
+        # Consecutive stars are equivalent to a single one
+        tokens = []
+        for char in pattern:
+            if char != "*" or not tokens or tokens[-1] != "*":
+                tokens.append(char)
+        return tokens
+
+    def _insert(self, pattern: str) -> _Node:
+        node = self._root
+        for token in self._tokens(pattern):
+            if token == "*":
+                if node.star is None:
+                    node.star = _Node(loop=True)
+                node = node.star
+            elif token == "?":
+                if node.any_char is None:
+                    node.any_char = _Node()
+                node = node.any_char
+            else:
+                node = node.children.setdefault(token, _Node())
+        return node
+
+    def _delete(self, node: _Node, tokens: List[str], key: Hashable):
+        """
+            Remove key from node at the end of tokens pruning emptied nodes
+        """
+        if not tokens:
+            node.keys.discard(key)
+            return
+        token, rest = tokens[0], tokens[1:]
+        if token == "*":
+            child = node.star
+        elif token == "?":
+            child = node.any_char
+        else:
+            child = node.children.get(token)
+        if child is None:
+            return
+        self._delete(child, rest, key)
+        if child.is_empty():
+            if token == "*":
+                node.star = None
+            elif token == "?":
+                node.any_char = None
+            else:
+                del node.children[token]
+
+
+class TargetIndex(object):
+    """
+        Index of policy targets. Finds the policies whose targets match a
+        (subject_id, resource_id, action_id) triple without checking the targets
+        of every policy. Meant for policy storage and PDP implementations keeping
+        policies in memory.
+
+        The index is not thread-safe: concurrent modifications must be synchronized
+        by the caller, e.g. by modifying a :meth:`copy` and publishing it.
+    """
+
+    def __init__(self):
+        self._subject_ids = PatternIndex()
+        self._resource_ids = PatternIndex()
+        self._action_ids = PatternIndex()
+        self._targets = {}  # type: Dict[Hashable, Tuple[list, list, list]]
+
+    def copy(self) -> "TargetIndex":
+        """
+            Deep copy of the index
+        """
+        index = copy.copy(self)
+        vars(index).update(
+            _subject_ids=self._subject_ids.copy(),
+            _resource_ids=self._resource_ids.copy(),
+            _action_ids=self._action_ids.copy(),
+            _targets=dict(self._targets)
+        )
+        return index
+
+    def add(self, key: Hashable, targets: Targets):
+        """
+            Add targets of a policy. Existing targets stored for the key are replaced.
+
+            :param key: key identifying the policy, usually its UID
+            :param targets: policy targets
+        """
+        if not isinstance(targets, Targets):
+            raise TypeError("Invalid type '{}' for targets.".format(type(targets)))
+        self.remove(key)
+        entry = tuple(
+            list(ace_ids) if isinstance(ace_ids, list) else [ace_ids]
+            for ace_ids in (targets.subject_id, targets.resource_id, targets.action_id)
+        )
+        for index, ace_ids in zip(self._indices(), entry):
+            for pattern in ace_ids:
+                index.add(pattern, key)
+        self._targets[key] = entry
+
+    def remove(self, key: Hashable):
+        """
+            Remove targets of a policy. Unknown keys are ignored.
+
+            :param key: key identifying the policy
+        """
+        entry = self._targets.pop(key, None)
+        if entry is None:
+            return
+        for index, ace_ids in zip(self._indices(), entry):
+            for pattern in ace_ids:
+                index.remove(pattern, key)
+
+    def match(self, subject_id: str, resource_id: str, action_id: str) -> Set[Hashable]:
+        """
+            Get keys of the policies whose targets match given target IDs
+
+            :param subject_id: subject ID of the request
+            :param resource_id: resource ID of the request
+            :param action_id: action ID of the request
+            :return: set of matching keys
+        """
+        keys = self._subject_ids.match(subject_id)
+        if keys:
+            keys &= self._resource_ids.match(resource_id)
+        if keys:
+            keys &= self._action_ids.match(action_id)
+        return keys
+
+    def _indices(self) -> Tuple[PatternIndex, PatternIndex, PatternIndex]:
+        return self._subject_ids, self._resource_ids, self._action_ids
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._targets
+
+    def __len__(self) -> int:
+        return len(self._targets)
@@ -3,12 +3,33 @@
 """
 
 import fnmatch
+import functools
+import os
+import re
+from typing import Callable
 
 from marshmallow import Schema, fields, post_load, validate
 
 from ..context import EvaluationContext
 
 
+@functools.lru_cache(maxsize=4096)
+def compile_target_pattern(pattern: str) -> Callable[[str], bool]:
+    """
+        Compile Unix shell-style target ID pattern into a callable checking if an
+        ID matches it. Matching is identical to :func:`fnmatch.fnmatch`, but IDs are
+        compared directly to patterns without wildcards.
+
+        :param pattern: target ID pattern
+        :return: callable returning True if ID matches the pattern else False
+    """
+    normalized = os.path.normcase(pattern)
+    if not re.search(r"[*?\[]", normalized):
+        return lambda ace_id: os.path.normcase(ace_id) == normalized
+    match = re.compile(fnmatch.translate(normalized)).match
+    return lambda ace_id: match(os.path.normcase(ace_id)) is not None
+
+
 class Targets(object):
     """
         Policy targets
@@ -38,7 +59,7 @@ class Targets(object):
         _ace_ids = ace_ids if isinstance(ace_ids, list) else [ace_ids]
         for _id in _ace_ids:
             # Unix file name type string matching
-            if fnmatch.fnmatch(ace_id, _id):
+            if compile_target_pattern(_id)(ace_id):
                 return True
         return False
 
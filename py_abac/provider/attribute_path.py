@@ -0,0 +1,102 @@
+"""
+    Compiled attribute paths
+"""
+
+import functools
+from typing import Any, Callable, Tuple, Union
+
+from objectpath import Tree
+from objectpath.core.parser import parse
+
+# Returned by simple path walk when data falls outside the simple subset
+_UNRESOLVED = object()
+
+
+def _parse_simple_path(attribute_path: str) -> Union[Tuple[Union[str, int], ...], None]:
+    """
+        Parse attribute path into selector steps if it only consists of attribute
+        name selectors, e.g. :code:`$.a.b` or :code:`$."a-b"`, and integer index
+        selectors, e.g. :code:`$.a[0]`. Returns None for any other path.
+    """
+    try:
+        node = parse(attribute_path)
+    # Broad exception needed for ObjectPath package
+    except Exception:
+        return None
+    steps = []
+    while isinstance(node, tuple) and len(node) == 3:
+        operator, node, selector = node
+        if operator == ".":
+            # Named attributes are parsed into tuples and quoted ones into strings
+            if isinstance(selector, tuple) and len(selector) == 2 and selector[0] == "name":
+                selector = selector[1]
+            # Names starting with `*` are wildcards and dunder names get object attributes
+            if not isinstance(selector, str) or selector.startswith(("*", "__")):
+                return None
+        elif operator == "[":
+            if type(selector) is not int:  # pylint: disable=unidiomatic-typecheck
+                return None
+        else:
+            return None
+        steps.append(selector)
+    if node != ("(root)", "rs") or not steps:
+        return None
+    return tuple(reversed(steps))
+
+
+def _walk(data: Any, steps: Tuple[Union[str, int], ...]) -> Any:
+    """
+        Select attribute value from data by following the steps. Mirrors ObjectPath
+        semantics for dictionaries, lists and missing values, returning `_UNRESOLVED`
+        for other data.
+    """
+    value = data
+    for step in steps:
+        value_type = type(value)
+        if value_type is dict and step.__class__ is str:
+            value = value.get(step)
+        elif value_type is list and step.__class__ is int:
+            # ObjectPath returns empty lists as they are
+            if value:
+                try:
+                    value = value[step]
+                except IndexError:
+                    value = None
+        else:
+            return _UNRESOLVED
+        if value is None:
+            # Selectors applied to a missing value yield a missing value
+            return None
+    return value
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_attribute_path(attribute_path: str) -> Callable[[Any], Any]:
+    """
+        Compile attribute path in ObjectPath notation into a callable selecting the
+        attribute value from attribute data, e.g. :code:`request.subject`. Paths
+        consisting of attribute name and integer index selectors are compiled into
+        direct dictionary and list lookups. Other paths, and simple paths applied to
+        data other than dictionaries and lists, are evaluated by ObjectPath, so the
+        selected values are identical to those of :meth:`objectpath.Tree.execute`.
+
+        Compiled paths are cached and shared across requests.
+
+        :param attribute_path: attribute path in ObjectPath notation
+        :return: callable returning selected attribute value for given data
+    """
+    steps = _parse_simple_path(attribute_path)
+
+    def execute(data):
+        return Tree(data).execute(attribute_path)
+
+    if steps is None:
+        return execute
+
+    def select(data):
+        value = _walk(data, steps)
+        if value is _UNRESOLVED:
+            return execute(data)
+        return value
+
+    return select
@@ -1,9 +1,9 @@
 """
-    Attribute provider base class
+    Attribute provider base classes
 """
 
 from abc import ABCMeta, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict, Iterable
 
 if TYPE_CHECKING:  # pragma: no cover
     from ..context import EvaluationContext  # pragma: no cover
@@ -26,3 +26,61 @@ class AttributeProvider(metaclass=ABCMeta):
             :return: attribute value
         """
         raise NotImplementedError()
+
+
+class BulkAttributeProvider(AttributeProvider):
+    """
+        Attribute provider interface resolving many attributes of an access control
+        element in a single call, e.g. a single request to a remote service. A
+        :class:`PDP` created with :code:`prefetch=True` asks it for all attributes the
+        candidate policies may need before evaluating them.
+    """
+
+    @abstractmethod
+    def get_attribute_values(
+            self,
+            ace: str,
+            attribute_paths: Iterable[str],
+            ctx: 'EvaluationContext'
+    ) -> Dict[str, Any]:
+        """
+            Get attribute values for given access control element and attribute paths.
+            Attributes not found may be left out of the returned dictionary or mapped to None.
+
+            :param ace: Access control element
+            :param attribute_paths: attribute paths in ObjectPath format
+            :param ctx: evaluation context
+            :return: dictionary of attribute path and value pairs
+        """
+        raise NotImplementedError()
+
+    def get_attribute_value(self, ace: str, attribute_path: str, ctx: 'EvaluationContext'):
+        """
+            Get attribute value for given access control element and attribute path
+            using :meth:`get_attribute_values`. Called for attributes not prefetched.
+
+            :param ace: Access control element
+            :param attribute_path: attribute path in ObjectPath format
+            :param ctx: evaluation context
+            :return: attribute value
+        """
+        return self.get_attribute_values(ace, [attribute_path], ctx).get(attribute_path)
+
+
+class AsyncAttributeProvider(metaclass=ABCMeta):
+    """
+        Asyncio attribute provider interface used by :class:`AsyncPDP`
+    """
+
+    @abstractmethod
+    async def get_attribute_value(self, ace: str, attribute_path: str, ctx: 'EvaluationContext'):
+        """
+            Get attribute value for given access control element and attribute path. If
+            attribute not found then returns None.
+
+            :param ace: Access control element
+            :param attribute_path: attribute path in ObjectPath format
+            :param ctx: evaluation context
+            :return: attribute value
+        """
+        raise NotImplementedError()
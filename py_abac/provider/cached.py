@@ -0,0 +1,230 @@
+"""
+    Caching attribute provider wrapper
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Union
+
+from .base import AttributeProvider, BulkAttributeProvider
+from ..cache import LRUCache
+
+# Sentinels distinguishing a cache miss from a cached `None` value
+_MISSING = object()
+_NONE = object()
+
+
+def entity_key(ace: str, attribute_path: str, ctx) -> Union[Hashable, None]:
+    """
+        Default cache key of :class:`CachedAttributeProvider`. Attribute values are keyed
+        by the ID of the access control element they belong to. Context attributes have
+        no ID and are not cached.
+
+        :param ace: access control element
+        :param attribute_path: attribute path in ObjectPath notation
+        :param ctx: evaluation context
+        :return: cache key or None if value should not be cached
+    """
+    if ace == "subject":
+        return ace, attribute_path, ctx.subject_id
+    if ace == "resource":
+        return ace, attribute_path, ctx.resource_id
+    if ace == "action":
+        return ace, attribute_path, ctx.action_id
+    return None
+
+
+class CachedAttributeProvider(AttributeProvider):
+    """
+        Attribute provider caching values returned by another provider across requests.
+        Values are held in a bounded least recently used cache with an optional
+        time-to-live. Missing values, i.e. `None`, are cached as well unless disabled.
+        Concurrent lookups of the same uncached value wait for a single call of the
+        wrapped provider. Wrap a :class:`BulkAttributeProvider` in a
+        :class:`CachedBulkAttributeProvider` instead, so that prefetching still
+        resolves the uncached values in one call.
+
+        :Example:
+
+        .. code-block:: python
+
+            from py_abac.provider.cached import CachedAttributeProvider
+
+            pdp = PDP(storage, providers=[CachedAttributeProvider(LDAPGroupsProvider(), ttl=60)])
+
+        By default values are keyed by access control element, attribute path and the
+        ID of the element in the request. Providers whose values depend on other request
+        attributes need a custom `key` callable taking the same arguments as
+        :meth:`get_attribute_value` and returning a hashable key, or None to bypass the
+        cache.
+
+        :param provider: attribute provider to cache values of
+        :param maxsize: maximum number of cached values
+        :param ttl: number of seconds after which a cached value expires. Set to None to disable
+                    expiry.
+        :param cache_none: cache missing values
+        :param key: cache key function, see :func:`entity_key`
+        :param timer: monotonic clock function returning seconds
+    """
+    # Type of wrapped attribute provider
+    _provider_type = AttributeProvider
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            provider: AttributeProvider,
+            maxsize: int = 1024,
+            ttl: float = None,
+            cache_none: bool = True,
+            key: Callable[[str, str, Any], Union[Hashable, None]] = entity_key,
+            timer: Callable[[], float] = time.monotonic
+    ):
+        if not isinstance(provider, self._provider_type):
+            raise TypeError("Invalid type '{}' for attribute provider.".format(type(provider)))
+        self._provider = provider
+        self._cache = LRUCache(maxsize, ttl, timer)
+        self._cache_none = cache_none
+        self._key = key
+        # Locks of values being loaded with the number of threads using them
+        self._loading = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.bypassed = 0
+
+    @property
+    def provider(self) -> AttributeProvider:
+        """
+            Wrapped attribute provider
+        """
+        return self._provider
+
+    def get_attribute_value(self, ace: str, attribute_path: str, ctx):
+        key = self._key(ace, attribute_path, ctx)
+        if key is None:
+            with self._lock:
+                self.bypassed += 1
+            return self._provider.get_attribute_value(ace, attribute_path, ctx)
+
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._load(key, ace, attribute_path, ctx)
+        else:
+            with self._lock:
+                self.hits += 1
+                if value is _NONE:
+                    self.negative_hits += 1
+        return None if value is _NONE else value
+
+    def _load(self, key: Hashable, ace: str, attribute_path: str, ctx):
+        """
+            Call wrapped provider for an uncached value. Threads loading the same key
+            are serialized so that only the first one calls the provider.
+        """
+        with self._lock:
+            entry = self._loading.get(key)
+            if entry is None:
+                entry = self._loading[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                # Value may have been loaded while waiting for the lock
+                value = self._cache.get(key, _MISSING)
+                if value is not _MISSING:
+                    with self._lock:
+                        self.coalesced += 1
+                    return value
+                with self._lock:
+                    self.misses += 1
+                value = self._provider.get_attribute_value(ace, attribute_path, ctx)
+                if value is None:
+                    value = _NONE
+                if value is not _NONE or self._cache_none:
+                    self._cache.set(key, value)
+                return value
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._loading[key]
+
+    def clear(self):
+        """
+            Remove all cached values
+        """
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """
+            Get cache statistics
+        """
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "bypassed": self.bypassed,
+            "evictions": self._cache.evictions,
+            "size": len(self._cache),
+            "maxsize": self._cache.maxsize
+        }
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class CachedBulkAttributeProvider(CachedAttributeProvider, BulkAttributeProvider):
+    """
+        Caching wrapper of a :class:`BulkAttributeProvider`. Prefetched values are taken
+        from the cache and the wrapped provider is asked for the uncached ones in a
+        single call. Concurrent prefetches of the same uncached values are not coalesced.
+
+        :Example:
+
+        .. code-block:: python
+
+            from py_abac.provider.cached import CachedBulkAttributeProvider
+
+            provider = CachedBulkAttributeProvider(HRAttributeProvider(), ttl=60)
+            pdp = PDP(storage, providers=[provider], prefetch=True)
+    """
+    _provider_type = BulkAttributeProvider
+
+    def get_attribute_values(
+            self,
+            ace: str,
+            attribute_paths: Iterable[str],
+            ctx
+    ) -> Dict[str, Any]:
+        rvalue = {}
+        # Cache keys of attributes to load keyed by attribute path
+        missing = {}
+        for attribute_path in attribute_paths:
+            key = self._key(ace, attribute_path, ctx)
+            value = _MISSING if key is None else self._cache.get(key, _MISSING)
+            with self._lock:
+                if key is None:
+                    self.bypassed += 1
+                elif value is _MISSING:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    if value is _NONE:
+                        self.negative_hits += 1
+            if value is _MISSING:
+                missing[attribute_path] = key
+            else:
+                rvalue[attribute_path] = None if value is _NONE else value
+        if not missing:
+            return rvalue
+
+        values = self._provider.get_attribute_values(ace, list(missing), ctx)
+        for attribute_path, key in missing.items():
+            value = values.get(attribute_path)
+            rvalue[attribute_path] = value
+            if key is not None and (value is not None or self._cache_none):
+                self._cache.set(key, _NONE if value is None else value)
+        return rvalue
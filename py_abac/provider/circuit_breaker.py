@@ -0,0 +1,272 @@
+"""
+    Circuit breaking attribute provider wrapper
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Union
+
+from .base import AttributeProvider, BulkAttributeProvider
+
+LOG = logging.getLogger(__name__)
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreakerProvider(AttributeProvider):
+    """
+        Attribute provider protecting decisions from a slow or failing provider.
+        Outcomes of the most recent calls of the wrapped provider are tracked in a
+        sliding window. Calls raising an exception, and optionally calls taking longer
+        than :code:`slow_call_duration`, count as failures. A failed call returns the
+        :code:`default` value instead of raising.
+
+        Once the failure rate within the window reaches :code:`failure_threshold`, the
+        circuit opens and lookups return the :code:`default` value without calling the
+        wrapped provider. After :code:`recovery_timeout` seconds the circuit is half
+        open and a single probe call is let through: the circuit closes if the probe
+        succeeds and opens again otherwise.
+
+        :Example:
+
+        .. code-block:: python
+
+            from py_abac.provider.circuit_breaker import CircuitBreakerProvider
+
+            provider = CircuitBreakerProvider(LDAPGroupsProvider(), slow_call_duration=0.2)
+            pdp = PDP(storage, providers=[provider])
+
+        Failed and skipped calls are recorded in the decision measurements reported
+        to the PDP instrument, see :class:`py_abac.instrumentation.DecisionStats`.
+        Wrap a :class:`BulkAttributeProvider` in a :class:`CircuitBreakerBulkProvider`
+        instead to protect prefetch calls as well.
+
+        :param provider: attribute provider to protect
+        :param failure_threshold: failure rate between 0 and 1 at which the circuit opens
+        :param window_size: number of most recent calls the failure rate is computed over
+        :param min_calls: minimum number of calls in window before the circuit can open
+        :param slow_call_duration: number of seconds after which a call counts as failure. Set to
+                                   None to not count slow calls.
+        :param recovery_timeout: number of seconds the circuit stays open before a probe call
+        :param default: value returned by failed and skipped calls
+        :param timer: monotonic clock function returning seconds
+    """
+    # Type of wrapped attribute provider
+    _provider_type = AttributeProvider
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            provider: AttributeProvider,
+            failure_threshold: float = 0.5,
+            window_size: int = 20,
+            min_calls: int = 5,
+            slow_call_duration: float = None,
+            recovery_timeout: float = 30.0,
+            default: Any = None,
+            timer: Callable[[], float] = time.monotonic
+    ):
+        if not isinstance(provider, self._provider_type):
+            raise TypeError("Invalid type '{}' for attribute provider.".format(type(provider)))
+        if not 0 < failure_threshold <= 1:
+            raise ValueError("Invalid failure threshold '{}'.".format(failure_threshold))
+        if window_size < 1 or not 1 <= min_calls <= window_size:
+            raise ValueError("Invalid window size '{}' or minimum calls '{}'.".format(
+                window_size, min_calls))
+        self._provider = provider
+        self._failure_threshold = failure_threshold
+        self._min_calls = min_calls
+        self._slow_call_duration = slow_call_duration
+        self._recovery_timeout = recovery_timeout
+        self._default = default
+        self._timer = timer
+        # Outcomes of most recent calls as (failed, duration) pairs
+        self._window = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.short_circuits = 0
+        self.opened = 0
+
+    @property
+    def provider(self) -> AttributeProvider:
+        """
+            Wrapped attribute provider
+        """
+        return self._provider
+
+    @property
+    def state(self) -> str:
+        """
+            Circuit breaker state, one of :code:`"closed"`, :code:`"open"` or :code:`"half_open"`
+        """
+        with self._lock:
+            if self._state == OPEN and self._timer() - self._opened_at >= self._recovery_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def get_attribute_value(self, ace: str, attribute_path: str, ctx):
+        return self._call(
+            lambda: self._provider.get_attribute_value(ace, attribute_path, ctx), self._default,
+            ace, attribute_path, ctx
+        )
+
+    def _call(self, call: Callable[[], Any], default: Any, ace: str, attribute_path: str, ctx):
+        """
+            Call wrapped provider unless the circuit is open and record the outcome
+
+            :param call: function calling the wrapped provider
+            :param default: value returned by failed and skipped calls
+            :param ace: access control element
+            :param attribute_path: attribute path or paths used in log messages
+            :param ctx: evaluation context
+            :return: value returned by the call or default
+        """
+        probe = self._acquire()
+        if probe is None:
+            if ctx.stats is not None:
+                ctx.stats.record_short_circuit(self._provider)
+            return default
+
+        start = self._timer()
+        released = False
+        try:
+            try:
+                value = call()
+            # Broad exception needed as any provider error is a failure
+            except Exception:  # pylint: disable=broad-except
+                LOG.warning(
+                    "Attribute provider '%s' failed for attribute '%s' of element '%s'.",
+                    type(self._provider).__name__, attribute_path, ace, exc_info=True
+                )
+                released = True
+                self._release(probe, True, self._timer() - start)
+                if ctx.stats is not None:
+                    ctx.stats.record_provider_failure(self._provider)
+                return default
+            duration = self._timer() - start
+            slow = self._slow_call_duration is not None and duration > self._slow_call_duration
+            released = True
+            self._release(probe, slow, duration, slow)
+        finally:
+            # Probes interrupted by other exceptions, e.g. KeyboardInterrupt, must not
+            # leave the circuit waiting for their outcome
+            if probe and not released:
+                with self._lock:
+                    self._probing = False
+        if slow and ctx.stats is not None:
+            ctx.stats.record_provider_failure(self._provider)
+        # Values of slow calls are still used as the time has been spent anyway
+        return value
+
+    def _acquire(self) -> Union[bool, None]:
+        """
+            Check whether the wrapped provider may be called. Lets a single probe call
+            through once the recovery timeout of the open circuit has passed.
+
+            :return: None if the call is skipped, else whether the call is a probe
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            if self._state == OPEN and self._timer() - self._opened_at >= self._recovery_timeout:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.short_circuits += 1
+            return None
+
+    def _release(self, probe: bool, failed: bool, duration: float, slow: bool = False):
+        """
+            Record outcome of a call of the wrapped provider and update state
+        """
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.failures += 1
+            if slow:
+                self.slow_calls += 1
+            if probe:
+                self._probing = False
+                if failed:
+                    self._open()
+                else:
+                    LOG.info("Circuit of attribute provider '%s' closed.",
+                             type(self._provider).__name__)
+                    self._state = CLOSED
+                    self._window.clear()
+            # Outcomes of calls started before the circuit opened are not tracked
+            elif self._state == CLOSED:
+                self._window.append((failed, duration))
+                if len(self._window) >= self._min_calls and \
+                        self._failure_rate() >= self._failure_threshold:
+                    self._open()
+
+    def _open(self):
+        """
+            Open circuit. Must be called holding the lock.
+        """
+        LOG.warning("Circuit of attribute provider '%s' opened.", type(self._provider).__name__)
+        self._state = OPEN
+        self._opened_at = self._timer()
+        self._window.clear()
+        self.opened += 1
+
+    def _failure_rate(self) -> float:
+        """
+            Failure rate of calls in window. Must be called holding the lock.
+        """
+        if not self._window:
+            return 0.0
+        return sum(1 for failed, _ in self._window if failed) / len(self._window)
+
+    def stats(self) -> dict:
+        """
+            Get circuit breaker statistics
+        """
+        state = self.state
+        with self._lock:
+            durations = [duration for _, duration in self._window]
+            return {
+                "state": state,
+                "calls": self.calls,
+                "failures": self.failures,
+                "slow_calls": self.slow_calls,
+                "short_circuits": self.short_circuits,
+                "opened": self.opened,
+                "failure_rate": self._failure_rate(),
+                "mean_duration": sum(durations) / len(durations) if durations else 0.0
+            }
+
+
+class CircuitBreakerBulkProvider(CircuitBreakerProvider, BulkAttributeProvider):
+    """
+        Circuit breaking wrapper of a :class:`BulkAttributeProvider`. A prefetch call
+        counts as a single call of the wrapped provider and resolves all attributes
+        to the :code:`default` value when failed or skipped.
+    """
+    _provider_type = BulkAttributeProvider
+
+    def get_attribute_values(
+            self,
+            ace: str,
+            attribute_paths: Iterable[str],
+            ctx
+    ) -> Dict[str, Any]:
+        attribute_paths = list(attribute_paths)
+        return self._call(
+            lambda: self._provider.get_attribute_values(ace, attribute_paths, ctx),
+            {attribute_path: self._default for attribute_path in attribute_paths},
+            ace, ", ".join(attribute_paths), ctx
+        )
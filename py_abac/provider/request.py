@@ -2,8 +2,9 @@
     Request attribute provider implementation
 """
 
-from objectpath import Tree
+import threading
 
+from .attribute_path import compile_attribute_path
 from .base import AttributeProvider
 from ..exceptions import InvalidAccessControlElementError, InvalidAttributePathError
 from ..request import AccessRequest
@@ -11,8 +12,20 @@ from ..request import AccessRequest
 
 class RequestAttributeProvider(AttributeProvider):
     """
-        Request attribute provider
+        Request attribute provider. Attribute paths are evaluated using accessors
+        compiled by :func:`compile_attribute_path` and shared across requests.
+
+        Lookup state of an access control element is only created when one of its
+        attributes is first requested, so elements not referred by any evaluated
+        policy cost nothing. Process-wide counters of created providers and element
+        states are available through :meth:`counters` once enabled by
+        :meth:`enable_counters`.
     """
+    _aces = ("subject", "resource", "action", "context")
+    # Process-wide counters, None unless enabled so that providers do not
+    # contend for the lock by default
+    _counters = None
+    _counters_lock = threading.Lock()
 
     def __init__(self, request: AccessRequest):
         """
@@ -20,15 +33,12 @@ class RequestAttributeProvider(AttributeProvider):
 
             :param request: authorization request object
         """
-
-        self._subject_tree = Tree(request.subject)
-        self._resource_tree = Tree(request.resource)
-        self._action_tree = Tree(request.action)
-        self._context_tree = Tree(request.context)
-
-        # Cache of attribute location and value pairs per access element used for quick attribute
-        # value retrieval
-        self._attribute_values_cache = {"subject": {}, "resource": {}, "action": {}, "context": {}}
+        self._request = request
+        # Attribute data and cache of attribute location and value pairs per access element used
+        # for quick attribute value retrieval. Created on first lookup of the element.
+        self._elements = {}
+        if self._counters is not None:
+            self._count("providers")
 
     def get_attribute_value(self, ace, attribute_path, ctx):
         """
@@ -39,22 +49,79 @@ class RequestAttributeProvider(AttributeProvider):
             :param ctx: evaluation context instance
             :return: attribute value
         """
-        # Validates given access control element and gets ObjectPath tree
+        # Validates given access control element and gets its attribute data
         try:
-            attribute_tree = getattr(self, "_{}_tree".format(ace))
-        except AttributeError:
+            attributes, cache = self._elements[ace]
+        except KeyError:
+            attributes, cache = self._elements[ace] = self._create_element(ace)
+        except TypeError:
             raise InvalidAccessControlElementError(ace)
 
         # Check if attribute value stored in cache
-        if attribute_path in self._attribute_values_cache[ace]:
-            rvalue = self._attribute_values_cache[ace][attribute_path]
+        if attribute_path in cache:
+            rvalue = cache[attribute_path]
         else:
-            # Attribute value not found in cache so get it from ObjectPath tree
+            # Attribute value not found in cache so select it using compiled attribute path
             try:
-                rvalue = attribute_tree.execute(attribute_path)
+                rvalue = compile_attribute_path(attribute_path)(attributes)
             # Broad exception needed for ObjectPath package
             except Exception:
                 raise InvalidAttributePathError(attribute_path)
             # Store the obtained value in cache
-            self._attribute_values_cache[ace][attribute_path] = rvalue
+            cache[attribute_path] = rvalue
         return rvalue
+
+    def _create_element(self, ace):
+        """
+            Create lookup state of access control element
+        """
+        if ace not in self._aces:
+            raise InvalidAccessControlElementError(ace)
+        if self._counters is not None:
+            self._count("elements")
+        return getattr(self._request, ace), {}
+
+    @classmethod
+    def _count(cls, name):
+        """
+            Increment process-wide counter if counters are enabled
+        """
+        with cls._counters_lock:
+            if cls._counters is not None:
+                cls._counters[name] += 1
+
+    @classmethod
+    def enable_counters(cls, enabled: bool = True):
+        """
+            Enable or disable process-wide counters. Enabled counters start from zero.
+
+            :param enabled: whether to count created providers and element states
+        """
+        with cls._counters_lock:
+            cls._counters = {"providers": 0, "elements": 0} if enabled else None
+
+    @classmethod
+    def counters(cls) -> dict:
+        """
+            Get process-wide counters of created providers, i.e. evaluated requests, and of
+            access control elements whose lookup state was created or skipped. Counters
+            are zero unless enabled.
+        """
+        with cls._counters_lock:
+            counters = cls._counters or {"providers": 0, "elements": 0}
+            providers, elements = counters["providers"], counters["elements"]
+        return {
+            "providers": providers,
+            "elements": elements,
+            "elements_skipped": providers * len(cls._aces) - elements,
+        }
+
+    @classmethod
+    def reset_counters(cls):
+        """
+            Reset process-wide counters if enabled
+        """
+        with cls._counters_lock:
+            if cls._counters is not None:
+                cls._counters["providers"] = 0
+                cls._counters["elements"] = 0
@@ -2,9 +2,12 @@
     Authorization request class
 """
 
-from typing import Dict
-
-from marshmallow import Schema, fields, validate, ValidationError, post_load
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, Tuple, Union
 
 from .exceptions import RequestCreateError
 
@@ -35,26 +38,69 @@ class AccessRequest(object):
             }
             # Parse JSON and create access request object
             request = AccessRequest.from_json(request_json)
+
+        Access requests are immutable. Their attributes are shared with the request
+        JSON, attribute pools and decision caches, so they must not be modified
+        either once the request is created.
     """
+    # Slots are assigned through `object.__setattr__` bypassing the check of immutability,
+    # which keeps creating requests cheap but is not followed by pylint
+    # pylint: disable=no-member
+    __slots__ = ("_subject_id", "_subject", "_resource_id", "_resource", "_action_id", "_action",
+                 "_context", "_canonical", "_fingerprint")
+
+    def __init__(
+            self,
+            subject: dict,
+            resource: dict,
+            action: dict,
+            context: dict,
+            pool: "AttributePool" = None
+    ):
+        set_attr = object.__setattr__
+        # Canonical JSON of attributes keyed by element, if computed while interning
+        canonical = {}
+        subject_attributes = subject.get("attributes", {})
+        resource_attributes = resource.get("attributes", {})
+        if pool is not None:
+            subject_attributes, canonical["subject"] = pool.intern(subject_attributes)
+            resource_attributes, canonical["resource"] = pool.intern(resource_attributes)
+        set_attr(self, "_canonical", canonical)
+        set_attr(self, "_fingerprint", _UNSET)
 
-    def __init__(self, subject: dict, resource: dict, action: dict, context: dict):
         # Request subject identifier
-        self._subject_id = subject.get("id", "")
+        set_attr(self, "_subject_id", subject.get("id", ""))
         # Request subject attributes
-        self._subject = subject.get("attributes", {})
+        set_attr(self, "_subject", subject_attributes)
 
         # Requested resource identifier
-        self._resource_id = resource.get("id", "")
+        set_attr(self, "_resource_id", resource.get("id", ""))
         # Requested resource attributes
-        self._resource = resource.get("attributes", {})
+        set_attr(self, "_resource", resource_attributes)
 
         # Request action identifier
-        self._action_id = action.get("id", "")
+        set_attr(self, "_action_id", action.get("id", ""))
         # Request action attributes
-        self._action = action.get("attributes", {})
+        set_attr(self, "_action", action.get("attributes", {}))
 
         # Request context attributes
-        self._context = context
+        set_attr(self, "_context", context)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Cannot set attribute '{}' of immutable access request.".format(
+            name))
+
+    def __delattr__(self, name):
+        raise AttributeError("Cannot delete attribute '{}' of immutable access request.".format(
+            name))
+
+    def __reduce__(self):
+        return self.__class__, (
+            {"id": self._subject_id, "attributes": self._subject},
+            {"id": self._resource_id, "attributes": self._resource},
+            {"id": self._action_id, "attributes": self._action},
+            self._context
+        )
 
     @property
     def subject_id(self) -> str:
@@ -105,38 +151,219 @@ class AccessRequest(object):
         """
         return self._context
 
+    @property
+    def fingerprint(self) -> Union[str, None]:
+        """
+            Canonical fingerprint of the request, i.e. a digest of the target IDs along
+            with all the attributes which does not depend on the order of dictionary
+            keys. Equal requests have equal fingerprints across processes. The
+            fingerprint is computed once and is None if the attributes cannot be
+            serialized to JSON.
+        """
+        if self._fingerprint is _UNSET:
+            # Cached bypassing the check of immutability as it does not change the request
+            object.__setattr__(self, "_fingerprint", self._compute_fingerprint())
+        return self._fingerprint
+
+    def _compute_fingerprint(self) -> Union[str, None]:
+        """
+            Compute digest of canonical JSON of target IDs and attributes
+        """
+        try:
+            parts = [_canonical_json([self._subject_id, self._resource_id, self._action_id])]
+            for ace, attributes in (("subject", self._subject), ("resource", self._resource),
+                                    ("action", self._action), ("context", self._context)):
+                canonical = self._canonical.get(ace)
+                parts.append(_canonical_json(attributes) if canonical is None else canonical)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
     @staticmethod
-    def from_json(data: dict) -> "AccessRequest":
+    def from_json(
+            data: dict,
+            pool: "AttributePool" = None,
+            trusted: bool = False
+    ) -> "AccessRequest":
         """
             Create access request object from JSON
+
+            :param data: access request JSON
+            :param pool: optional pool interning subject and resource attributes
+            :param trusted: skip validation of JSON built by the application itself. The
+                            attribute dictionaries are then used as they are instead of
+                            being copied.
+            :return: access request object
         """
-        try:
-            return _RequestSchema().load(data)
-        except ValidationError as err:
-            raise RequestCreateError(*err.args)
+        if trusted:
+            return AccessRequest(data["subject"], data["resource"], data["action"],
+                                 data.get("context", {}), pool)
+        return AccessRequest(pool=pool, **_load_request(data))
 
 
 # backward compatible with v0.2.0
 Request = AccessRequest
 
+# Sentinel of fingerprint not computed yet
+_UNSET = object()
 
-class _AccessElementSchema(Schema):
+
+def _canonical_json(value) -> str:
     """
-        JSON schema for access element
+        Serialize value to JSON independent of the order of dictionary keys
     """
-    id = fields.String(required=True, validate=validate.Length(max=400))
-    attributes = fields.Dict(default={}, missing={})
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
 
 
-class _RequestSchema(Schema):
+class AttributePool(object):
     """
-            JSON schema for authorization request
+        Pool interning attribute dictionaries of access requests. Requests created
+        with the same pool share a single dictionary for identical subject or
+        resource attributes, which saves memory when many requests are held at
+        once, e.g. in batches or queues.
+
+        :Example:
+
+        .. code-block:: python
+
+            from py_abac.request import AccessRequest, AttributePool
+
+            pool = AttributePool(maxsize=10000)
+            requests = [AccessRequest.from_json(request_json, pool=pool) for request_json in batch]
+
+        Attributes which cannot be serialized to JSON are not interned.
+
+        :param maxsize: maximum number of attribute dictionaries held by the pool
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("Invalid pool size '{}'.".format(maxsize))
+        self._maxsize = maxsize
+        self._attributes = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, attributes: dict) -> Tuple[dict, Union[str, None]]:
+        """
+            Get pooled attributes equal to the given ones. The given attributes are
+            pooled if no equal attributes are held by the pool yet.
+
+            :param attributes: attribute dictionary
+            :return: pooled attributes along with their canonical JSON, or the given
+                     attributes along with None if they cannot be serialized
+        """
+        try:
+            key = _canonical_json(attributes)
+        except (TypeError, ValueError):
+            return attributes, None
+        with self._lock:
+            pooled = self._attributes.get(key)
+            if pooled is not None:
+                self._attributes.move_to_end(key)
+                self.hits += 1
+                return pooled, key
+            self.misses += 1
+            self._attributes[key] = attributes
+            if len(self._attributes) > self._maxsize:
+                self._attributes.popitem(last=False)
+        return attributes, key
+
+    def clear(self):
+        """
+            Remove all pooled attributes
         """
-    subject = fields.Nested(_AccessElementSchema, required=True)
-    resource = fields.Nested(_AccessElementSchema, required=True)
-    action = fields.Nested(_AccessElementSchema, required=True)
-    context = fields.Dict(default={}, missing={})
+        with self._lock:
+            self._attributes.clear()
+
+    def __len__(self):
+        return len(self._attributes)
+
+
+# Validation error messages of the marshmallow request schema of previous releases
+_INVALID_INPUT = "Invalid input type."
+_REQUIRED = "Missing data for required field."
+_NULL = "Field may not be null."
+_UNKNOWN = "Unknown field."
+_INVALID_STRING = "Not a valid string."
+_INVALID_UTF8 = "Not a valid utf-8 string."
+_INVALID_MAPPING = "Not a valid mapping type."
+_MAX_ID_LENGTH = 400
+_ELEMENTS = ("subject", "resource", "action")
 
-    @post_load
-    def post_load(self, data, **_):  # pylint: disable=missing-docstring,no-self-use
-        return AccessRequest(**data)
+
+def _load_dict(value, errors: dict, name: str):
+    """
+        Load attributes dictionary the way marshmallow :code:`fields.Dict` does
+    """
+    if value is None:
+        errors[name] = [_NULL]
+    elif not isinstance(value, Mapping):
+        errors[name] = [_INVALID_MAPPING]
+    else:
+        return dict(value)
+    return None
+
+
+def _load_element(value, errors: dict, name: str):
+    """
+        Load access element the way the marshmallow schema of previous releases did
+    """
+    if value is None:
+        errors[name] = [_NULL]
+        return None
+    if not isinstance(value, Mapping):
+        errors[name] = {"_schema": [_INVALID_INPUT]}
+        return None
+    element_errors = {}
+    element = {}
+    target_id = value.get("id")
+    if "id" not in value:
+        element_errors["id"] = [_REQUIRED]
+    elif target_id is None:
+        element_errors["id"] = [_NULL]
+    elif isinstance(target_id, bytes):
+        try:
+            target_id = target_id.decode("utf-8")
+        except UnicodeDecodeError:
+            element_errors["id"] = [_INVALID_UTF8]
+    elif not isinstance(target_id, str):
+        element_errors["id"] = [_INVALID_STRING]
+    if "id" not in element_errors:
+        if len(target_id) > _MAX_ID_LENGTH:
+            element_errors["id"] = ["Longer than maximum length {}.".format(_MAX_ID_LENGTH)]
+        element["id"] = target_id
+    element["attributes"] = {} if "attributes" not in value else \
+        _load_dict(value["attributes"], element_errors, "attributes")
+    for key in value:
+        if key not in ("id", "attributes"):
+            element_errors[key] = [_UNKNOWN]
+    if element_errors:
+        errors[name] = element_errors
+    return element
+
+
+def _load_request(data) -> dict:
+    """
+        Validate access request JSON returning the data the marshmallow schema of previous
+        releases loaded. Hand-written as loading the schema costs more than evaluating simple
+        requests. Error messages are identical to those of the schema.
+    """
+    if not isinstance(data, Mapping):
+        raise RequestCreateError({"_schema": [_INVALID_INPUT]})
+    errors = {}
+    result = {}
+    for name in _ELEMENTS:
+        if name not in data:
+            errors[name] = [_REQUIRED]
+        else:
+            result[name] = _load_element(data[name], errors, name)
+    result["context"] = {} if "context" not in data else \
+        _load_dict(data["context"], errors, "context")
+    for key in data:
+        if key not in _ELEMENTS and key != "context":
+            errors[key] = [_UNKNOWN]
+    if errors:
+        raise RequestCreateError(errors)
+    return result
@@ -2,5 +2,6 @@
     Exposed classes and methods
 """
 
+from .memory import MemoryStorage
 from .mongo import MongoStorage, MongoMigrationSet
 from .sql import SQLStorage, SQLMigrationSet
@@ -1,14 +1,62 @@
 """
-    Policy Storage abstract class
+    Policy Storage abstract classes
 """
 
+import asyncio
 from abc import ABCMeta, abstractmethod
-from typing import Generator
+from typing import Generator, Callable, Dict, Iterable, Iterator, List, Tuple, Union
 
 from ..policy import Policy
 
 
-class StorageBase(metaclass=ABCMeta):
+class _StorageMixin(object):
+    """
+        Functionality common to synchronous and asynchronous policy storage
+    """
+
+    @staticmethod
+    def evaluation_order(policy: Policy):
+        """
+            Sort key ordering policies by descending priority and deny before allow
+        """
+        return -policy.priority, policy.is_allowed
+
+    def subscribe(self, callback: Callable[[str], None]):
+        """
+            Register callback invoked with the policy UID whenever a policy is
+            added, updated or deleted through this storage. The callback is invoked
+            once with None after a bulk change of several policies.
+        """
+        if not hasattr(self, "_change_callbacks"):
+            self._change_callbacks = []  # pylint: disable=attribute-defined-outside-init
+        self._change_callbacks.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str], None]):
+        """
+            Remove previously registered policy change callback
+        """
+        callbacks = getattr(self, "_change_callbacks", [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def _notify_change(self, uid: Union[str, None]):
+        """
+            Notify subscribers of a policy change. Storage implementations should call
+            this method after every successful add, update or delete, and with None
+            after a bulk change of several policies.
+        """
+        for callback in getattr(self, "_change_callbacks", []):
+            callback(uid)
+
+    @staticmethod
+    def _check_limit_and_offset(limit: int, offset: int):
+        if limit < 0:
+            raise ValueError("Limit can't be negative")
+        if offset < 0:
+            raise ValueError("Offset can't be negative")
+
+
+class StorageBase(_StorageMixin, metaclass=ABCMeta):
     """
         Base class for policy storage
     """
@@ -44,9 +92,42 @@ class StorageBase(metaclass=ABCMeta):
         """
             Get all policies for given target IDs.
         """
-        # TODO: Add policy retrieval caching
         raise NotImplementedError()
 
+    def get_for_target_ordered(
+            self,
+            subject_id: str,
+            resource_id: str,
+            action_id: str
+    ) -> Iterator[Policy]:
+        """
+            Get all policies for given target IDs ordered by descending priority, with
+            deny policies ahead of allow policies of same priority. This order lets the
+            PDP stop evaluation at the first decisive policy. The default implementation
+            sorts the results of `get_for_target`. Backends able to order policies in
+            the query should override it and stream the results.
+        """
+        return iter(sorted(
+            self.get_for_target(subject_id, resource_id, action_id),
+            key=self.evaluation_order
+        ))
+
+    def get_for_targets(
+            self,
+            targets: Iterable[Tuple[str, str, str]]
+    ) -> Dict[Tuple[str, str, str], List[Policy]]:
+        """
+            Get all policies for each of the given (subject_id, resource_id, action_id)
+            target ID triples. The default implementation calls `get_for_target` once per
+            distinct triple. Backends supporting multi-target queries may override it to
+            fetch policies for the whole batch at once.
+        """
+        rvalue = {}
+        for target in targets:
+            if target not in rvalue:
+                rvalue[target] = list(self.get_for_target(*target))
+        return rvalue
+
     @abstractmethod
     def update(self, policy: Policy):
         """
@@ -61,9 +142,82 @@ class StorageBase(metaclass=ABCMeta):
         """
         raise NotImplementedError()
 
-    @staticmethod
-    def _check_limit_and_offset(limit: int, offset: int):
-        if limit < 0:
-            raise ValueError("Limit can't be negative")
-        if offset < 0:
-            raise ValueError("Offset can't be negative")
+
+class AsyncStorageBase(_StorageMixin, metaclass=ABCMeta):
+    """
+        Base class for asyncio policy storage. Counterpart of :class:`StorageBase`
+        whose methods are coroutines, used by :class:`AsyncPDP`.
+    """
+
+    @abstractmethod
+    async def add(self, policy: Policy):
+        """
+            Store a policy
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get(self, uid: str) -> Policy:
+        """
+            Get specific policy
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_all(self, limit: int, offset: int) -> List[Policy]:
+        """
+            Retrieve all the policies within a window
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_for_target(
+            self,
+            subject_id: str,
+            resource_id: str,
+            action_id: str
+    ) -> List[Policy]:
+        """
+            Get all policies for given target IDs.
+        """
+        raise NotImplementedError()
+
+    async def get_for_target_ordered(
+            self,
+            subject_id: str,
+            resource_id: str,
+            action_id: str
+    ) -> List[Policy]:
+        """
+            Get all policies for given target IDs ordered by descending priority, with
+            deny policies ahead of allow policies of same priority.
+        """
+        policies = await self.get_for_target(subject_id, resource_id, action_id)
+        return sorted(policies, key=self.evaluation_order)
+
+    async def get_for_targets(
+            self,
+            targets: Iterable[Tuple[str, str, str]]
+    ) -> Dict[Tuple[str, str, str], List[Policy]]:
+        """
+            Get all policies for each of the given (subject_id, resource_id, action_id)
+            target ID triples. The default implementation concurrently awaits
+            `get_for_target` once per distinct triple.
+        """
+        targets = list(dict.fromkeys(targets))
+        results = await asyncio.gather(*[self.get_for_target(*target) for target in targets])
+        return {target: list(policies) for target, policies in zip(targets, results)}
+
+    @abstractmethod
+    async def update(self, policy: Policy):
+        """
+            Update a policy
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete(self, uid: str):
+        """
+            Delete a policy
+        """
+        raise NotImplementedError()
@@ -1,3 +1,5 @@
 """
     In-Memory storage
 """
+
+from .storage import MemoryStorage
@@ -0,0 +1,189 @@
+"""
+    In-Memory Storage implementation
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from itertools import islice
+from typing import Union, Generator, Iterator, List
+
+from ..base import StorageBase
+from ...exceptions import PolicyExistsError
+from ...policy import Policy
+from ...policy.target_index import TargetIndex
+
+LOG = logging.getLogger(__name__)
+
+
+class _Snapshot(object):
+    """
+        View of stored policies and their target indices. Published snapshots
+        are never modified.
+    """
+
+    def __init__(self):
+        self.policies = OrderedDict()
+        self.positions = {}
+        self.counter = 0
+        self.targets = TargetIndex()
+
+    def copy(self):
+        """
+            Copy of snapshot to be modified by writer
+        """
+        snapshot = _Snapshot.__new__(_Snapshot)
+        snapshot.policies = OrderedDict(self.policies)
+        snapshot.positions = dict(self.positions)
+        snapshot.counter = self.counter
+        snapshot.targets = self.targets.copy()
+        return snapshot
+
+    def add(self, policy: Policy):
+        """
+            Add policy to snapshot and index its targets
+        """
+        self.policies[policy.uid] = policy
+        self.positions[policy.uid] = self.counter
+        self.counter += 1
+        self.targets.add(policy.uid, policy.targets)
+
+    def remove(self, uid: str):
+        """
+            Remove policy from snapshot along with its target index entries
+        """
+        del self.policies[uid]
+        del self.positions[uid]
+        self.targets.remove(uid)
+
+    def find(self, subject_id: str, resource_id: str, action_id: str) -> List[Policy]:
+        """
+            Get policies whose targets match given target IDs in insertion order
+        """
+        uids = self.targets.match(subject_id, resource_id, action_id)
+        return [self.policies[uid] for uid in sorted(uids, key=self.positions.__getitem__)]
+
+
+class MemoryStorage(StorageBase):
+    """
+        Stores policies in memory. Policies are kept deserialized and indexed
+        by their target IDs, so retrieval does not scan the whole policy set.
+
+        Reads never block: writers build a modified copy of the policy set and
+        its indices under a lock and atomically publish it. Readers keep
+        working on the copy current at the time of their call. Writes are thus
+        linear in the number of stored policies, which suits policy sets read
+        far more often than changed.
+
+        .. note::
+
+            Policies returned by the storage are shared between callers and
+            should be treated as read-only. Use :meth:`update` to change them.
+    """
+
+    def __init__(self):
+        self._snapshot = _Snapshot()
+        self._lock = threading.Lock()
+
+    def add(self, policy: Policy):
+        policy = self._copy(policy)
+        with self._lock:
+            if policy.uid in self._snapshot.policies:
+                LOG.error("Error trying to create already existing policy with UID=%s.", policy.uid)
+                raise PolicyExistsError(policy.uid)
+            snapshot = self._snapshot.copy()
+            snapshot.add(policy)
+            self._snapshot = snapshot
+        LOG.info("Added Policy: %s", policy)
+        self._notify_change(policy.uid)
+
+    def get(self, uid: str) -> Union[Policy, None]:
+        return self._snapshot.policies.get(uid)
+
+    def get_all(self, limit: int, offset: int) -> Generator[Policy, None, None]:
+        self._check_limit_and_offset(limit, offset)
+        yield from islice(self._snapshot.policies.values(), offset, offset + limit)
+
+    def get_for_target(
+            self,
+            subject_id: str,
+            resource_id: str,
+            action_id: str
+    ) -> Generator[Policy, None, None]:
+        yield from self._snapshot.find(subject_id, resource_id, action_id)
+
+    def get_for_target_ordered(
+            self,
+            subject_id: str,
+            resource_id: str,
+            action_id: str
+    ) -> Iterator[Policy]:
+        policies = self._snapshot.find(subject_id, resource_id, action_id)
+        return iter(sorted(policies, key=self.evaluation_order))
+
+    def update(self, policy: Policy):
+        policy = self._copy(policy)
+        with self._lock:
+            if policy.uid not in self._snapshot.policies:
+                return
+            snapshot = self._snapshot.copy()
+            snapshot.remove(policy.uid)
+            snapshot.add(policy)
+            self._snapshot = snapshot
+        LOG.info('Updated Policy with UID=%s. New value is: %s', policy.uid, policy)
+        self._notify_change(policy.uid)
+
+    def delete(self, uid: str):
+        with self._lock:
+            if uid not in self._snapshot.policies:
+                return
+            snapshot = self._snapshot.copy()
+            snapshot.remove(uid)
+            self._snapshot = snapshot
+        LOG.info("Deleted Policy with UID=%s.", uid)
+        self._notify_change(uid)
+
+    def load(self, storage: StorageBase, batch_size: int = 1000):
+        """
+            Bulk load all policies of another storage, e.g. at application startup.
+            Policies are read in batches using `get_all` and published to readers
+            at once. Loaded policies replace stored ones with the same UID. Subscribers
+            are notified once with None instead of the UID of each loaded policy.
+
+            :param storage: storage to load policies from
+            :param batch_size: number of policies retrieved per `get_all` call
+        """
+        if not isinstance(storage, StorageBase):
+            raise TypeError("Invalid type '{}' for storage.".format(type(storage)))
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        policies = []
+        offset = 0
+        while True:
+            batch = list(storage.get_all(batch_size, offset))
+            policies.extend(batch)
+            if len(batch) < batch_size:
+                break
+            offset += batch_size
+
+        with self._lock:
+            snapshot = self._snapshot.copy()
+            for policy in policies:
+                if policy.uid in snapshot.policies:
+                    snapshot.remove(policy.uid)
+                snapshot.add(policy)
+            self._snapshot = snapshot
+        LOG.info("Loaded %s policies from %s", len(policies), storage)
+        if policies:
+            self._notify_change(None)
+
+    def __len__(self):
+        return len(self._snapshot.policies)
+
+    @staticmethod
+    def _copy(policy: Policy) -> Policy:
+        """
+            Copy policy so that later changes to it by the caller do not
+            bypass the target indices
+        """
+        return Policy.from_json(policy.to_json())
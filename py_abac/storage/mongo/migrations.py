@@ -2,9 +2,12 @@
     MongoDB migrations
 """
 
+import json
 import logging
 
 from .storage import MongoStorage
+from ...cache import PolicyCache
+from ...policy.policy import ALLOW_ACCESS
 from ..migration import Migration, MigrationSet
 
 DEFAULT_MIGRATION_COLLECTION = "py_abac_migrations"
@@ -26,6 +29,7 @@ class MongoMigrationSet(MigrationSet):
     def migrations(self):
         return [
             MongoMigration0To0x2x0(self.storage),
+            MongoMigration0x2x0To0x4x0(self.storage),
         ]
 
     def save_applied_number(self, number: int):
@@ -63,3 +67,34 @@ class MongoMigration0To0x2x0(Migration):
     def down(self):
         for field in self.multi_key_indices:
             self.storage.collection.drop_index(self.index_name(field))
+
+
+class MongoMigration0x2x0To0x4x0(Migration):
+    """
+        Migration between versions 0.2.0 and 0.4.0. Adds policy versions
+        used by the policy cache and the priority and effect fields used
+        to order policies for evaluation to the stored policies.
+    """
+
+    # Added fields
+    fields = ("version", "priority", "is_allowed")
+
+    def __init__(self, storage: MongoStorage):
+        self.storage = storage
+
+    @property
+    def order(self):
+        return 2
+
+    def up(self):
+        query = {"$or": [{field: {"$exists": False}} for field in self.fields]}
+        for doc in self.storage.collection.find(query, {"policy_str": 1}):
+            policy_json = json.loads(doc["policy_str"])
+            self.storage.collection.update_one({"_id": doc["_id"]}, {"$set": {
+                "version": PolicyCache.version(policy_json),
+                "priority": policy_json.get("priority", 0),
+                "is_allowed": policy_json["effect"] == ALLOW_ACCESS,
+            }})
+
+    def down(self):
+        self.storage.collection.update_many({}, {"$unset": {field: "" for field in self.fields}})
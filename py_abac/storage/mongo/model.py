@@ -5,6 +5,7 @@
 import json
 
 from ..utils import get_sub_wildcard_queries, get_all_wildcard_queries
+from ...cache import PolicyCache
 from ...policy import Policy
 from ...policy.targets import Targets
 
@@ -14,26 +15,43 @@ class PolicyModel(object):
         Model to store policy as document on MongoDB
     """
 
-    def __init__(self, _id: str, policy_str: str, tags: dict = None):
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            _id: str,
+            policy_str: str,
+            tags: dict = None,
+            version: str = None,
+            priority: int = None,
+            is_allowed: bool = None
+    ):
         """
             Initialize mongodb document
 
             :param _id: document ID
             :param policy_str: policy JSON string
             :param tags: tags for target based filtering
+            :param version: version of policy JSON used for caching
+            :param priority: policy priority used for ordering policies
+            :param is_allowed: policy effect used for ordering policies
         """
         self._id = _id
         self.policy_str = policy_str
         self.tags = tags
+        self.version = version
+        self.priority = priority
+        self.is_allowed = is_allowed
 
     @classmethod
     def from_policy(cls, policy: Policy):
         """
             Create model instance from policy object
         """
-        policy_str = json.dumps(policy.to_json())
+        policy_json = policy.to_json()
+        policy_str = json.dumps(policy_json)
         tags = cls._targets_to_tags(policy.targets)
-        return cls(policy.uid, policy_str, tags)
+        return cls(policy.uid, policy_str, tags, PolicyCache.version(policy_json),
+                   policy.priority, policy.is_allowed)
 
     def to_policy(self):
         """
@@ -84,6 +102,14 @@ class PolicyModel(object):
         }
         return [stage_1, stage_2]
 
+    @staticmethod
+    def get_sort_stage():
+        """
+            Get aggregation stage ordering policies by descending priority and
+            deny before allow
+        """
+        return {"$sort": {"priority": -1, "is_allowed": 1}}
+
     @staticmethod
     def _targets_to_tags(targets: Targets):
         subject_queries = targets.subject_id \
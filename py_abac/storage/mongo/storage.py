@@ -3,13 +3,15 @@
 """
 
 import logging
-from typing import Union, Generator
+from typing import Union, Generator, Iterator
 
 from pymongo import MongoClient
 from pymongo.errors import DuplicateKeyError
 
 from .model import PolicyModel
 from ..base import StorageBase
+from ..utils import get_cached_policies
+from ...cache import PolicyCache
 from ...exceptions import PolicyExistsError
 from ...policy import Policy
 
@@ -26,17 +28,24 @@ class MongoStorage(StorageBase):
         :param client: mongodb client
         :param db_name: database to use for storing policies
         :param collection: collection to use for storing policies
+        :param policy_cache: optional cache of policies retrieved by `get_for_target`. When set,
+                             policy JSON is fetched and deserialized only for policies missing
+                             in the cache or changed since cached.
     """
 
     def __init__(
             self,
             client: MongoClient,
             db_name: str = DEFAULT_DB,
-            collection: str = DEFAULT_COLLECTION
+            collection: str = DEFAULT_COLLECTION,
+            policy_cache: PolicyCache = None
     ):
+        if policy_cache is not None and not isinstance(policy_cache, PolicyCache):
+            raise TypeError("Invalid type '{}' for policy cache.".format(type(policy_cache)))
         self.client = client
         self.database = self.client[db_name]
         self.collection = self.database[collection]
+        self.policy_cache = policy_cache
 
     def add(self, policy: Policy):
         try:
@@ -45,6 +54,7 @@ class MongoStorage(StorageBase):
             LOG.error('Error trying to create already existing policy with UID=%s.', policy.uid)
             raise PolicyExistsError(policy.uid)
         LOG.info('Added Policy: %s', policy)
+        self._notify_change(policy.uid)
 
     def get(self, uid: str) -> Union[Policy, None]:
         doc = self.collection.find_one(uid)
@@ -65,9 +75,39 @@ class MongoStorage(StorageBase):
             action_id: str
     ) -> Generator[Policy, None, None]:
         pipeline = PolicyModel.get_aggregate_pipeline(subject_id, resource_id, action_id)
-        cur = self.collection.aggregate(pipeline)
+        yield from self._get_for_target(pipeline)
+
+    def get_for_target_ordered(
+            self,
+            subject_id: str,
+            resource_id: str,
+            action_id: str
+    ) -> Iterator[Policy]:
+        pipeline = PolicyModel.get_aggregate_pipeline(subject_id, resource_id, action_id)
+        return self._get_for_target(pipeline + [PolicyModel.get_sort_stage()])
+
+    def _get_for_target(self, pipeline):
+        """
+            Get policies retrieved by given aggregation pipeline
+        """
+        if self.policy_cache is None:
+            cur = self.collection.aggregate(pipeline)
+            for doc in cur:
+                yield PolicyModel.from_doc(doc).to_policy()
+            return
+        # Query only UIDs and versions, fetching JSON just for policies not in cache
+        cur = self.collection.aggregate(pipeline + [{"$project": {"version": 1}}])
+        versions = [(doc["_id"], doc.get("version")) for doc in cur]
+        yield from get_cached_policies(versions, self.policy_cache, self._fetch_policies)
+
+    def _fetch_policies(self, uids):
+        """
+            Fetch (UID, version, loader) triples of policies with given UIDs
+        """
+        cur = self.collection.find({"_id": {"$in": uids}}, {"policy_str": 1, "version": 1})
         for doc in cur:
-            yield PolicyModel.from_doc(doc).to_policy()
+            model = PolicyModel.from_doc(doc)
+            yield model._id, model.version, model.to_policy  # pylint: disable=protected-access
 
     def update(self, policy: Policy):
         uid = policy.uid
@@ -77,7 +117,9 @@ class MongoStorage(StorageBase):
             upsert=False
         )
         LOG.info('Updated Policy with UID=%s. New value is: %s', uid, policy)
+        self._notify_change(uid)
 
     def delete(self, uid: str):
         self.collection.delete_one({'_id': uid})
         LOG.info('Deleted Policy with UID=%s.', uid)
+        self._notify_change(uid)
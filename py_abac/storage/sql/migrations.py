@@ -2,12 +2,14 @@
     SQL storage migrations
 """
 
-from sqlalchemy import Column, Integer
+from sqlalchemy import Column, Integer, inspect, or_, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 
-from .model import Base
+from .model import Base, PolicyModel
 from ..migration import Migration, MigrationSet
+from ...cache import PolicyCache
+from ...policy.policy import ALLOW_ACCESS
 
 MigrationBase = declarative_base()
 
@@ -35,7 +37,7 @@ class SQLMigrationSet(MigrationSet):
         MigrationModel.metadata.create_all(self.storage.session.bind)
 
     def migrations(self):
-        return [Migration0To0x2x1(self.storage)]
+        return [Migration0To0x2x1(self.storage), Migration0x2x1To0x4x0(self.storage)]
 
     def save_applied_number(self, number):
         try:
@@ -76,3 +78,53 @@ class Migration0To0x2x1(Migration):
 
     def down(self):
         Base.metadata.drop_all(self.storage.session.bind)
+
+
+class Migration0x2x1To0x4x0(Migration):
+    """
+        Migration between versions 0.2.1 and 0.4.0. Adds the policy
+        version column used by the policy cache and the priority and
+        effect columns used to order policies for evaluation.
+    """
+
+    # Added columns along with their SQL types
+    columns = (("version", "VARCHAR(40)"), ("priority", "INTEGER"), ("is_allowed", "BOOLEAN"))
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    @property
+    def order(self):
+        return 2
+
+    def up(self):
+        session = self.storage.session
+        existing = self._existing_columns()
+        for name, sql_type in self.columns:
+            if name not in existing:
+                session.execute(text("ALTER TABLE {} ADD COLUMN {} {}".format(
+                    PolicyModel.__tablename__, name, sql_type)))
+        try:
+            unset = or_(PolicyModel.version.is_(None), PolicyModel.priority.is_(None),
+                        PolicyModel.is_allowed.is_(None))
+            for policy_model in session.query(PolicyModel).filter(unset):
+                policy_model.version = PolicyCache.version(policy_model.json)
+                policy_model.priority = policy_model.json.get("priority", 0)
+                policy_model.is_allowed = policy_model.json["effect"] == ALLOW_ACCESS
+            session.commit()
+        except SQLAlchemyError as err:  # pragma: no cover
+            session.rollback()  # pragma: no cover
+            raise err  # pragma: no cover
+
+    def down(self):
+        session = self.storage.session
+        existing = self._existing_columns()
+        for name, _ in self.columns:
+            if name in existing:
+                session.execute(text("ALTER TABLE {} DROP COLUMN {}".format(
+                    PolicyModel.__tablename__, name)))
+        session.commit()
+
+    def _existing_columns(self):
+        columns = inspect(self.storage.session.bind).get_columns(PolicyModel.__tablename__)
+        return {column["name"] for column in columns}
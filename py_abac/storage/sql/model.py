@@ -4,11 +4,12 @@
 
 from typing import Union, List, Type
 
-from sqlalchemy import Column, String, Integer, JSON, ForeignKey
+from sqlalchemy import Boolean, Column, String, Integer, JSON, ForeignKey
 from sqlalchemy import literal
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
+from ...cache import PolicyCache
 from ...policy import Policy
 
 Base = declarative_base()
@@ -59,6 +60,9 @@ class PolicyModel(Base):
 
     uid = Column(String(248), primary_key=True)
     json = Column(JSON(), nullable=False)
+    version = Column(String(40), comment="Version of policy JSON used for caching")
+    priority = Column(Integer, comment="Policy priority used for ordering policies")
+    is_allowed = Column(Boolean, comment="Policy effect used for ordering policies")
     subjects = relationship(SubjectTargetModel, passive_deletes=True, lazy='joined')
     resources = relationship(ResourceTargetModel, passive_deletes=True, lazy='joined')
     actions = relationship(ActionTargetModel, passive_deletes=True, lazy='joined')
@@ -108,6 +112,9 @@ class PolicyModel(Base):
         """
         self.uid = policy.uid
         self.json = policy.to_json()
+        self.version = PolicyCache.version(self.json)
+        self.priority = policy.priority
+        self.is_allowed = policy.is_allowed
 
         # Setup targets
         self._setup_targets(
@@ -3,29 +3,41 @@
 """
 
 import logging
-from typing import Union, Generator
+from functools import partial
+from typing import Union, Generator, Iterator
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.exc import FlushError
 
 from .model import PolicyModel
 from ..base import StorageBase
+from ..utils import get_cached_policies
+from ...cache import PolicyCache
 from ...exceptions import PolicyExistsError
 from ...policy import Policy
 
 LOG = logging.getLogger(__name__)
 
+# Maximum number of UIDs in a single IN clause
+_MAX_UIDS_PER_QUERY = 500
+
 
 class SQLStorage(StorageBase):
     """
         Stores and retrieves policies from SQL database
 
         :param scoped_session: SQL Alchemy scoped session
+        :param policy_cache: optional cache of policies retrieved by `get_for_target`. When set,
+                             policy JSON is fetched and deserialized only for policies missing
+                             in the cache or changed since cached.
     """
 
-    def __init__(self, scoped_session):
+    def __init__(self, scoped_session, policy_cache: PolicyCache = None):
+        if policy_cache is not None and not isinstance(policy_cache, PolicyCache):
+            raise TypeError("Invalid type '{}' for policy cache.".format(type(policy_cache)))
         self.session = scoped_session
         self.dialect = scoped_session.bind.engine.dialect.name
+        self.policy_cache = policy_cache
 
     def add(self, policy: Policy):
         try:
@@ -37,6 +49,7 @@ class SQLStorage(StorageBase):
             self.session.rollback()
             LOG.error("Error trying to create already existing policy with UID=%s.", policy.uid)
             raise PolicyExistsError(policy.uid)
+        self._notify_change(policy.uid)
 
     def get(self, uid: str) -> Union[Policy, None]:
         policy_model = self.session.query(PolicyModel).get(uid)
@@ -55,10 +68,41 @@ class SQLStorage(StorageBase):
             resource_id: str,
             action_id: str
     ) -> Generator[Policy, None, None]:
+        yield from self._get_for_target(subject_id, resource_id, action_id)
+
+    def get_for_target_ordered(
+            self,
+            subject_id: str,
+            resource_id: str,
+            action_id: str
+    ) -> Iterator[Policy]:
+        order = (PolicyModel.priority.desc(), PolicyModel.is_allowed.asc())
+        return self._get_for_target(subject_id, resource_id, action_id, order)
+
+    def _get_for_target(self, subject_id, resource_id, action_id, order=()):
+        """
+            Get policies for given target IDs sorted by given order clauses
+        """
         policy_filter = PolicyModel.get_filter(subject_id, resource_id, action_id)
-        cur = self.session.query(PolicyModel).filter(*policy_filter)
-        for policy_model in cur:
-            yield policy_model.to_policy()
+        if self.policy_cache is None:
+            cur = self.session.query(PolicyModel).filter(*policy_filter).order_by(*order)
+            for policy_model in cur:
+                yield policy_model.to_policy()
+            return
+        # Query only UIDs and versions, fetching JSON just for policies not in cache
+        versions = self.session.query(PolicyModel.uid, PolicyModel.version) \
+            .filter(*policy_filter).order_by(*order).all()
+        yield from get_cached_policies(versions, self.policy_cache, self._fetch_policies)
+
+    def _fetch_policies(self, uids):
+        """
+            Fetch (UID, version, loader) triples of policies with given UIDs
+        """
+        for idx in range(0, len(uids), _MAX_UIDS_PER_QUERY):
+            cur = self.session.query(PolicyModel.uid, PolicyModel.version, PolicyModel.json) \
+                .filter(PolicyModel.uid.in_(uids[idx:idx + _MAX_UIDS_PER_QUERY]))
+            for uid, version, policy_json in cur:
+                yield uid, version, partial(Policy.from_json, policy_json)
 
     def update(self, policy: Policy):
         try:
@@ -71,7 +115,9 @@ class SQLStorage(StorageBase):
             self.session.rollback()  # pragma: no cover
             raise  # pragma: no cover
         LOG.info('Updated Policy with UID=%s. New value is: %s', policy.uid, policy)
+        self._notify_change(policy.uid)
 
     def delete(self, uid: str):
         self.session.query(PolicyModel).filter(PolicyModel.uid == uid).delete()
         LOG.info("Deleted Policy with UID=%s.", uid)
+        self._notify_change(uid)
@@ -3,7 +3,10 @@
 """
 
 import re
-from typing import List
+from typing import Callable, Generator, Iterable, List, Tuple
+
+from ..cache import PolicyCache
+from ..policy import Policy
 
 
 def get_sub_wildcard_queries(query: str, wildcard: str = '*') -> List[str]:
@@ -93,3 +96,46 @@ def get_all_wildcard_queries(string: str, wildcard: str = '*') -> List[str]:
         queries[wildcard + string[size - 1:size - 1 + span] + wildcard] = True
 
     return list(queries.keys())
+
+
+def get_cached_policies(
+        versions: List[Tuple[str, str]],
+        policy_cache: PolicyCache,
+        fetch: Callable[[List[str]], Iterable[Tuple[str, str, Callable[[], Policy]]]]
+) -> Generator[Policy, None, None]:
+    """
+        This method retrieves policies through a policy cache. Only the policies
+        missing in the cache are fetched from the storage. Fetched policies are
+        built lazily when yielded and cached under their version. Policies
+        without a version, e.g. stored before the version was introduced, are
+        never cached.
+
+        :param versions: list of (UID, version) pairs of policies to retrieve in order
+        :param policy_cache: cache of built policies
+        :param fetch: callable fetching policies missing in the cache. It is called
+                      with a list of UIDs and should return (UID, version, loader)
+                      triples, where the loader builds the policy object.
+        :returns: generator of policies
+    """
+    cached = {}
+    missing = []
+    for uid, version in versions:
+        policy = policy_cache.get(uid, version) if version else None
+        if policy is None:
+            missing.append(uid)
+        else:
+            cached[uid] = policy
+
+    loaders = {}
+    if missing:
+        loaders = {uid: (version, loader) for uid, version, loader in fetch(missing)}
+
+    for uid, _ in versions:
+        if uid in cached:
+            yield cached[uid]
+        elif uid in loaders:
+            version, loader = loaders.pop(uid)
+            policy = loader()
+            if version:
+                policy_cache.set(uid, version, policy)
+            yield policy
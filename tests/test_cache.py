@@ -0,0 +1,172 @@
+"""
+    Unit test caching utilities
+"""
+
+import threading
+
+import pytest
+
+from py_abac.cache import LRUCache, DecisionCache, PolicyCache
+from py_abac.policy import Policy
+from py_abac.request import AccessRequest
+
+
+class FakeTimer(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def create_request(name="Max", ip="127.0.0.1"):
+    return AccessRequest.from_json({
+        "subject": {"id": "user:1", "attributes": {"name": name, "roles": ["admin", "user"]}},
+        "resource": {"id": "doc:1", "attributes": {"name": "report"}},
+        "action": {"id": "get", "attributes": {"method": "get"}},
+        "context": {"ip": ip}
+    })
+
+
+def test_lru_cache_get_set():
+    cache = LRUCache(maxsize=2)
+    assert cache.get("a") is None
+    assert cache.get("a", 1) == 1
+    cache.set("a", None)
+    assert "a" in cache
+    assert cache.get("a", 1) is None
+    cache.set("b", 2)
+    assert len(cache) == 2
+    assert cache.pop("b") == 2
+    assert cache.pop("b", 3) == 3
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Access "a" so that "b" becomes least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_lru_cache_ttl():
+    timer = FakeTimer()
+    cache = LRUCache(maxsize=2, ttl=10, timer=timer)
+    cache.set("a", 1)
+    timer.now = 9.9
+    assert cache.get("a") == 1
+    timer.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_stats():
+    cache = LRUCache(maxsize=1)
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.set("b", 1)
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 1, "size": 1, "maxsize": 1}
+
+
+@pytest.mark.parametrize("maxsize, ttl", [(0, None), (-1, None), (1, 0), (1, -1)])
+def test_lru_cache_create_error(maxsize, ttl):
+    with pytest.raises(ValueError):
+        LRUCache(maxsize, ttl)
+
+
+def test_decision_cache():
+    cache = DecisionCache(maxsize=10)
+    request = create_request()
+    assert cache.get(request) is None
+    cache.set(request, False)
+    assert cache.get(request) is False
+    assert cache.get(create_request()) is False
+    assert cache.get(create_request(name="Nina")) is None
+    assert cache.hits == 2
+    assert cache.misses == 2
+
+    cache.invalidate("1")
+    assert len(cache) == 0
+    assert cache.generation == 1
+    assert cache.stats()["generation"] == 1
+
+
+def test_decision_cache_stale_generation():
+    cache = DecisionCache()
+    request = create_request()
+    generation = cache.generation
+    cache.invalidate()
+    cache.set(request, True, generation)
+    assert cache.get(request) is None
+    cache.set(request, True, cache.generation)
+    assert cache.get(request) is True
+
+
+def test_decision_cache_concurrent_invalidation():
+    storing = threading.Event()
+    invalidated = threading.Event()
+
+    def invalidate():
+        cache.invalidate()
+        invalidated.set()
+
+    def timer():
+        # Called by the cache while storing the decision. Policies change meanwhile.
+        if not storing.is_set():
+            storing.set()
+            threading.Thread(target=invalidate).start()
+            assert not invalidated.wait(0.05)
+        return 0.0
+
+    cache = DecisionCache(ttl=60, timer=timer)
+    request = create_request()
+    cache.set(request, True, cache.generation)
+    invalidated.wait()
+    # Invalidation waits for the decision to be stored and removes it
+    assert cache.get(request) is None
+    assert cache.generation == 1
+
+
+def test_decision_cache_key():
+    request_1 = AccessRequest(
+        {"id": "a", "attributes": {"x": 1, "y": {"b": 2, "a": 1}}}, {"id": "b"}, {"id": "c"}, {}
+    )
+    request_2 = AccessRequest(
+        {"id": "a", "attributes": {"y": {"a": 1, "b": 2}, "x": 1}}, {"id": "b"}, {"id": "c"}, {}
+    )
+    assert DecisionCache.key(request_1) == DecisionCache.key(request_2)
+    assert hash(DecisionCache.key(request_1)) == hash(DecisionCache.key(request_2))
+
+    # Attributes which cannot be canonicalized are not cached
+    request_3 = AccessRequest({"id": "a", "attributes": {"x": object()}}, {"id": "b"}, {"id": "c"}, {})
+    assert DecisionCache.key(request_3) is None
+    cache = DecisionCache()
+    cache.set(request_3, True)
+    assert cache.get(request_3) is None
+    assert len(cache) == 0
+
+
+def test_policy_cache():
+    cache = PolicyCache(maxsize=2)
+    policy_json = {"uid": "1", "rules": {}, "targets": {}, "effect": "deny"}
+    version = PolicyCache.version(policy_json)
+    policy = Policy.from_json(policy_json)
+    assert cache.get("1", version) is None
+    cache.set("1", version, policy)
+    assert cache.get("1", version) is policy
+    # Version follows policy content but not key order
+    assert PolicyCache.version(dict(reversed(list(policy_json.items())))) == version
+    assert PolicyCache.version(dict(policy_json, effect="allow")) != version
+    assert cache.get("1", PolicyCache.version(dict(policy_json, effect="allow"))) is None
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 1)
+    cache.clear()
+    assert len(cache) == 0
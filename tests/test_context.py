@@ -2,11 +2,13 @@
     Unit test evaluation context
 """
 
+import asyncio
+
 import pytest
 
-from py_abac.context import EvaluationContext
+from py_abac.context import EvaluationContext, AsyncEvaluationContext
 from py_abac.exceptions import InvalidAccessControlElementError, InvalidAttributePathError
-from py_abac.provider.base import AttributeProvider
+from py_abac.provider.base import AttributeProvider, AsyncAttributeProvider, BulkAttributeProvider
 from py_abac.request import AccessRequest
 
 
@@ -166,3 +168,118 @@ def test_attribute_value_raises():
     context.attribute_path = ")"
     with pytest.raises(InvalidAttributePathError):
         _ = context.attribute_value
+
+
+def test_async_context_prefetch():
+    class AsyncEmailAttributeProvider(AsyncAttributeProvider):
+
+        def __init__(self):
+            self.calls = 0
+
+        async def get_attribute_value(self, ace, attribute_path, ctx):
+            self.calls += 1
+            if ace == "subject" and attribute_path == "$.email":
+                return "max@gmail.com"
+
+    request = AccessRequest.from_json({
+        "subject": {"id": "a", "attributes": {"firstName": "Carl"}},
+        "resource": {"id": "a"},
+        "action": {"id": ""},
+        "context": {}
+    })
+    async_provider = AsyncEmailAttributeProvider()
+    context = AsyncEvaluationContext(request, providers=[EmailAttributeProvider(), async_provider])
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(context.prefetch([
+        ("subject", "$.firstName"), ("subject", "$.email"), ("subject", "$.age"), ("subject", "$.age")
+    ]))
+    loop.close()
+    # Synchronous provider listed first wins
+    assert context.get_attribute_value("subject", "$.email") == "carl@gmail.com"
+    assert context.get_attribute_value("subject", "$.firstName") == "Carl"
+    assert context.get_attribute_value("subject", "$.age") is None
+    assert async_provider.calls == 1
+    # Attributes not prefetched are looked up only in request and synchronous providers
+    assert context.get_attribute_value("context", "$.ip") is None
+    assert async_provider.calls == 1
+
+
+class HRAttributeProvider(BulkAttributeProvider):
+
+    def __init__(self, values):
+        self.values = values
+        self.calls = []
+
+    def get_attribute_values(self, ace, attribute_paths, ctx):
+        self.calls.append((ace, list(attribute_paths)))
+        return {path: self.values.get((ace, path)) for path in attribute_paths}
+
+
+def test_prefetch_attributes():
+    request = AccessRequest.from_json({
+        "subject": {"id": "a", "attributes": {"firstName": "Carl"}},
+        "resource": {"id": "a", "attributes": {}},
+        "action": {"id": "", "attributes": {}},
+        "context": {}
+    })
+    first = HRAttributeProvider({("subject", "$.department"): "IT"})
+    second = HRAttributeProvider({("subject", "$.department"): "HR", ("subject", "$.grade"): 3,
+                                  ("resource", "$.owner"): "Carl"})
+    ctx = EvaluationContext(request, [EmailAttributeProvider(), first, second])
+    ctx.prefetch_attributes([
+        ("subject", "$.firstName"), ("subject", "$.email"), ("subject", "$.department"),
+        ("subject", "$.grade"), ("resource", "$.owner")
+    ])
+    # One call per provider and access control element for attributes missing in the request
+    # and not found by previous bulk providers
+    assert sorted(first.calls) == [("resource", ["$.owner"]), ("subject", ["$.department", "$.email", "$.grade"])]
+    assert sorted(second.calls) == [("resource", ["$.owner"]), ("subject", ["$.email", "$.grade"])]
+
+    # Values are taken from the first provider having them
+    assert ctx.get_attribute_value("subject", "$.email") == "carl@gmail.com"
+    assert ctx.get_attribute_value("subject", "$.department") == "IT"
+    assert ctx.get_attribute_value("subject", "$.grade") == 3
+    assert ctx.get_attribute_value("resource", "$.owner") == "Carl"
+    assert ctx.get_attribute_value("subject", "$.firstName") == "Carl"
+    assert len(first.calls) == 2 and len(second.calls) == 2
+
+    # Attributes not prefetched are resolved one at a time
+    assert ctx.get_attribute_value("subject", "$.other") is None
+    assert first.calls[-1] == ("subject", ["$.other"])
+
+
+def test_attribute_values_memoized():
+    request = AccessRequest.from_json({
+        "subject": {"id": "a", "attributes": {"firstName": "Carl"}},
+        "resource": {"id": "a", "attributes": {}},
+        "action": {"id": "", "attributes": {}},
+        "context": {}
+    })
+    provider = HRAttributeProvider({("subject", "$.department"): "IT"})
+    ctx = EvaluationContext(request, [provider])
+    for _ in range(3):
+        assert ctx.get_attribute_value("subject", "$.department") == "IT"
+        assert ctx.get_attribute_value("subject", "$.grade") is None
+        assert ctx.get_attribute_value("subject", "$.firstName") == "Carl"
+    assert provider.calls == [("subject", ["$.department"]), ("subject", ["$.grade"])]
+
+    # Lookups made by providers skip the calling provider and are not memoized
+    ctx = EvaluationContext(request, [FaultyAttributeProvider(), EmailAttributeProvider()])
+    assert ctx.get_attribute_value("subject", "$.email") == "carl@gmail.com"
+    assert ctx._attribute_values == {("subject", "$.email"): "carl@gmail.com"}
+
+
+def test_fold_case():
+    request = AccessRequest.from_json({
+        "subject": {"id": "a", "attributes": {}},
+        "resource": {"id": "a", "attributes": {}},
+        "action": {"id": "", "attributes": {}},
+        "context": {}
+    })
+    ctx = EvaluationContext(request)
+    long_value = "HTTPS://EXAMPLE.COM/" * 10
+    assert ctx.fold_case("MaX") == "max"
+    assert ctx.fold_case(long_value) == long_value.lower()
+    assert ctx.fold_case(long_value) is ctx.fold_case(long_value)
+    # Short strings are not kept
+    assert ctx._folded_values == {long_value: long_value.lower()}
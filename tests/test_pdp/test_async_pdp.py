@@ -0,0 +1,180 @@
+"""
+    Asyncio PDP tests
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+from py_abac.cache import DecisionCache
+from py_abac.pdp import PDP, AsyncPDP, EvaluationAlgorithm
+from py_abac.policy import Policy
+from py_abac.provider.base import AsyncAttributeProvider
+from py_abac.request import AccessRequest
+from py_abac.storage.base import AsyncStorageBase
+from py_abac.storage.sql import SQLStorage
+from py_abac.storage.sql.model import Base
+from .test_pdp_batch import create_requests
+from .test_pdp_with_sql import POLICIES, EmailsAttributeProvider
+from ..test_storage.test_sql import create_test_sql_engine
+
+
+class AsyncSQLStorage(AsyncStorageBase):
+    """
+        Asyncio wrapper of SQL storage used for testing
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.lookups = 0
+
+    async def add(self, policy):
+        self.storage.add(policy)
+        self._notify_change(policy.uid)
+
+    async def get(self, uid):
+        return self.storage.get(uid)
+
+    async def get_all(self, limit, offset):
+        return list(self.storage.get_all(limit, offset))
+
+    async def get_for_target(self, subject_id, resource_id, action_id):
+        self.lookups += 1
+        await asyncio.sleep(0)
+        return list(self.storage.get_for_target(subject_id, resource_id, action_id))
+
+    async def update(self, policy):
+        self.storage.update(policy)
+        self._notify_change(policy.uid)
+
+    async def delete(self, uid):
+        self.storage.delete(uid)
+        self._notify_change(uid)
+
+
+class AsyncEmailsAttributeProvider(AsyncAttributeProvider):
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_attribute_value(self, ace, attribute_path, ctx):
+        self.in_flight += 1
+        self.max_in_flight = max(self.in_flight, self.max_in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if ace == "subject" and attribute_path == "$.email":
+            if ctx.get_attribute_value(ace, "$.name") == "Ben":
+                return "ben@gmail.com"
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def sql_storage():
+    engine = create_test_sql_engine()
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine))
+    storage = SQLStorage(scoped_session=session)
+    for policy_json in POLICIES:
+        storage.add(Policy.from_json(policy_json))
+    yield storage
+    Base.metadata.drop_all(engine)
+    session.remove()
+
+
+@pytest.fixture
+def st(sql_storage):
+    return AsyncSQLStorage(sql_storage)
+
+
+@pytest.mark.parametrize("algorithm", list(EvaluationAlgorithm))
+def test_is_allowed(sql_storage, st, algorithm):
+    pdp = PDP(sql_storage, algorithm, [EmailsAttributeProvider()])
+    async_pdp = AsyncPDP(st, algorithm, [AsyncEmailsAttributeProvider()])
+    requests = create_requests()
+    expected = [pdp.is_allowed(request) for request in requests]
+
+    async def decide():
+        return [await async_pdp.is_allowed(request) for request in requests]
+
+    assert run(decide()) == expected
+    assert run(async_pdp.is_allowed_many(requests)) == expected
+
+
+@pytest.mark.parametrize("algorithm", list(EvaluationAlgorithm))
+def test_is_allowed_with_sync_provider(sql_storage, st, algorithm):
+    pdp = PDP(sql_storage, algorithm, [EmailsAttributeProvider()])
+    async_pdp = AsyncPDP(st, algorithm, [EmailsAttributeProvider()])
+    requests = create_requests()
+    assert run(async_pdp.is_allowed_many(requests)) == [pdp.is_allowed(request) for request in requests]
+
+
+def test_concurrent_provider_lookups(st):
+    provider = AsyncEmailsAttributeProvider()
+    pdp = AsyncPDP(st, providers=[provider])
+    requests = create_requests()
+
+    async def decide():
+        return await asyncio.gather(*[pdp.is_allowed(request) for request in requests])
+
+    run(decide())
+    assert provider.max_in_flight > 1
+    assert provider.in_flight == 0
+
+
+def test_is_allowed_many_storage_lookups(st):
+    pdp = AsyncPDP(st)
+    run(pdp.is_allowed_many(create_requests()))
+    assert st.lookups == 4
+
+
+def test_cache(st):
+    pdp = AsyncPDP(st, cache=DecisionCache())
+    request = AccessRequest.from_json({
+        "subject": {"id": "user:1", "attributes": {"name": "Max"}},
+        "resource": {"id": "", "attributes": {"name": "doc"}},
+        "action": {"id": "", "attributes": {"method": "update"}},
+        "context": {}
+    })
+    assert run(pdp.is_allowed(request))
+    assert run(pdp.is_allowed(request))
+    assert run(pdp.is_allowed_many([request])) == [True]
+    assert st.lookups == 1
+
+    policy = Policy.from_json(POLICIES[1])
+    policy.effect = "deny"
+    run(st.update(policy))
+    assert not run(pdp.is_allowed(request))
+    assert st.lookups == 2
+
+
+def test_create_error(sql_storage, st):
+    with pytest.raises(TypeError):
+        AsyncPDP(sql_storage)
+    with pytest.raises(TypeError):
+        PDP(st)
+    with pytest.raises(TypeError):
+        AsyncPDP(st, None)
+    with pytest.raises(TypeError):
+        AsyncPDP(st, EvaluationAlgorithm.DENY_OVERRIDES, [None])
+    # Options are passed as keywords and attribute providers are not called by executor
+    with pytest.raises(TypeError):
+        AsyncPDP(st, EvaluationAlgorithm.DENY_OVERRIDES, [], None)
+    with pytest.raises(TypeError):
+        AsyncPDP(st, executor=None)
+
+
+def test_is_allowed_error(st):
+    pdp = AsyncPDP(st)
+    with pytest.raises(TypeError):
+        run(pdp.is_allowed(None))
+    with pytest.raises(TypeError):
+        run(pdp.is_allowed_many([None]))
@@ -0,0 +1,170 @@
+"""
+    PDP batch decision tests
+"""
+
+import pytest
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+from py_abac.cache import DecisionCache
+from py_abac.pdp import PDP, EvaluationAlgorithm
+from py_abac.policy import Policy
+from py_abac.provider.base import AttributeProvider
+from py_abac.request import AccessRequest
+from py_abac.storage.memory import MemoryStorage
+from py_abac.storage.sql import SQLStorage
+from py_abac.storage.sql.model import Base
+from .test_pdp_with_sql import POLICIES, SUBJECT_IDS, EmailsAttributeProvider
+from ..test_storage.test_sql import create_test_sql_engine
+
+
+class CountingStorage(SQLStorage):
+
+    def __init__(self, scoped_session):
+        super().__init__(scoped_session)
+        self.lookups = 0
+
+    def get_for_target(self, subject_id, resource_id, action_id):
+        self.lookups += 1
+        return super().get_for_target(subject_id, resource_id, action_id)
+
+
+class CountingAttributeProvider(AttributeProvider):
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_attribute_value(self, ace, attribute_path, ctx):
+        self.calls += 1
+        return None
+
+
+class NestedLookupAttributeProvider(AttributeProvider):
+
+    def get_attribute_value(self, ace, attribute_path, ctx):
+        if attribute_path == "$.rank":
+            return 5
+        if attribute_path == "$.level":
+            # Nested lookup skips this provider, so the rank is not found
+            ctx.get_attribute_value("subject", "$.rank")
+            return "high"
+        return None
+
+
+@pytest.fixture
+def st():
+    engine = create_test_sql_engine()
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine))
+    storage = CountingStorage(scoped_session=session)
+    for policy_json in POLICIES:
+        storage.add(Policy.from_json(policy_json))
+    yield storage
+    Base.metadata.drop_all(engine)
+    session.remove()
+
+
+def create_requests():
+    requests = []
+    for name in ["Max", "Nina", "Ben", "Henry"]:
+        for method in ["create", "delete", "get", "update", "print"]:
+            for resource in ["myrn:example.com:resource:123", "00678", "doc:confidential:sales:I3462"]:
+                requests.append(AccessRequest.from_json({
+                    "subject": {"id": SUBJECT_IDS[name], "attributes": {"name": name, "roles": ["manager"]}},
+                    "resource": {"id": "", "attributes": {"name": resource}},
+                    "action": {"id": "", "attributes": {"method": method}},
+                    "context": {"ip": "127.0.0.1"}
+                }))
+    return requests
+
+
+@pytest.mark.parametrize("algorithm", list(EvaluationAlgorithm))
+def test_is_allowed_many(st, algorithm):
+    pdp = PDP(st, algorithm, [EmailsAttributeProvider()])
+    requests = create_requests()
+    expected = [pdp.is_allowed(request) for request in requests]
+    assert any(expected)
+    assert not all(expected)
+    assert pdp.is_allowed_many(requests) == expected
+    assert pdp.is_allowed_many(iter(requests)) == expected
+    assert pdp.is_allowed_many([]) == []
+
+
+def test_is_allowed_many_storage_lookups(st):
+    pdp = PDP(st)
+    st.lookups = 0
+    pdp.is_allowed_many(create_requests())
+    # One lookup per distinct subject target ID
+    assert st.lookups == len(SUBJECT_IDS)
+
+
+def test_is_allowed_many_shares_subject_attributes(st):
+    provider = CountingAttributeProvider()
+    pdp = PDP(st, providers=[provider])
+    request_json = {
+        "subject": {"id": SUBJECT_IDS["Ben"], "attributes": {"name": "Ben"}},
+        "resource": {"id": "", "attributes": {"name": ""}},
+        "action": {"id": "", "attributes": {"method": "print"}},
+        "context": {}
+    }
+    requests = [AccessRequest.from_json(request_json) for _ in range(10)]
+    decision = pdp.is_allowed(requests[0])
+    calls = provider.calls
+    assert calls > 0
+
+    provider.calls = 0
+    assert pdp.is_allowed_many(requests) == [decision] * 10
+    # Subject attributes resolved through provider only once for the whole batch
+    assert provider.calls < 10 * calls
+
+
+def test_is_allowed_many_nested_lookups():
+    storage = MemoryStorage()
+    storage.add(Policy.from_json({
+        "uid": "1",
+        "effect": "allow",
+        "rules": {
+            "subject": {
+                "$.level": {"condition": "Equals", "value": "high"},
+                "$.rank": {"condition": "Eq", "value": 5}
+            }
+        },
+        "targets": {},
+        "priority": 0
+    }))
+    pdp = PDP(storage, providers=[NestedLookupAttributeProvider()])
+    requests = [AccessRequest.from_json({
+        "subject": {"id": "user:1", "attributes": {}},
+        "resource": {"id": "doc:{}".format(idx), "attributes": {}},
+        "action": {"id": "get", "attributes": {}},
+        "context": {}
+    }) for idx in range(2)]
+    expected = [pdp.is_allowed(request) for request in requests]
+    assert expected == [True, True]
+    # Partial values of nested lookups are not shared with the rest of the batch
+    assert pdp.is_allowed_many(requests) == expected
+
+
+def test_is_allowed_many_with_cache(st):
+    pdp = PDP(st, cache=DecisionCache())
+    requests = create_requests()
+    decisions = pdp.is_allowed_many(requests)
+    st.lookups = 0
+    assert pdp.is_allowed_many(requests) == decisions
+    assert st.lookups == 0
+    assert [pdp.is_allowed(request) for request in requests] == decisions
+
+
+def test_is_allowed_many_error(st):
+    pdp = PDP(st)
+    with pytest.raises(TypeError):
+        pdp.is_allowed_many([None])
+
+
+@pytest.mark.parametrize("algorithm", list(EvaluationAlgorithm))
+def test_is_allowed_compiled(st, algorithm):
+    pdp = PDP(st, algorithm, [EmailsAttributeProvider()])
+    compiled_pdp = PDP(st, algorithm, [EmailsAttributeProvider()], compiled=True)
+    requests = create_requests()
+    assert [compiled_pdp.is_allowed(request) for request in requests] == \
+           [pdp.is_allowed(request) for request in requests]
+    assert compiled_pdp.is_allowed_many(requests) == pdp.is_allowed_many(requests)
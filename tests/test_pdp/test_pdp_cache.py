@@ -0,0 +1,101 @@
+"""
+    PDP decision cache tests
+"""
+
+import pytest
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+from py_abac.cache import DecisionCache
+from py_abac.pdp import PDP
+from py_abac.policy import Policy
+from py_abac.request import AccessRequest
+from py_abac.storage.sql import SQLStorage
+from py_abac.storage.sql.model import Base
+from ..test_storage.test_sql import create_test_sql_engine
+
+POLICY = {
+    "uid": "1",
+    "description": "Max is allowed to get any resource",
+    "effect": "allow",
+    "rules": {
+        "subject": {"$.name": {"condition": "Equals", "value": "Max"}},
+        "action": {"$.method": {"condition": "Equals", "value": "get"}}
+    },
+    "targets": {},
+    "priority": 0
+}
+
+REQUEST = {
+    "subject": {"id": "user:1", "attributes": {"name": "Max"}},
+    "resource": {"id": "doc:1", "attributes": {}},
+    "action": {"id": "", "attributes": {"method": "get"}},
+    "context": {}
+}
+
+
+@pytest.fixture
+def st():
+    engine = create_test_sql_engine()
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine))
+    storage = SQLStorage(scoped_session=session)
+    yield storage
+    Base.metadata.drop_all(engine)
+    session.remove()
+
+
+class CountingStorage(SQLStorage):
+
+    def __init__(self, scoped_session):
+        super().__init__(scoped_session)
+        self.lookups = 0
+
+    def get_for_target(self, subject_id, resource_id, action_id):
+        self.lookups += 1
+        return super().get_for_target(subject_id, resource_id, action_id)
+
+
+def test_cache_hit(st):
+    st.add(Policy.from_json(POLICY))
+    storage = CountingStorage(st.session)
+    pdp = PDP(storage, cache=DecisionCache())
+    assert pdp.is_allowed(AccessRequest.from_json(REQUEST))
+    assert pdp.is_allowed(AccessRequest.from_json(REQUEST))
+    assert storage.lookups == 1
+    assert pdp.cache.hits == 1
+    assert pdp.cache.misses == 1
+
+
+def test_cache_invalidated_on_policy_change(st):
+    pdp = PDP(st, cache=DecisionCache())
+    request = AccessRequest.from_json(REQUEST)
+    assert not pdp.is_allowed(request)
+
+    st.add(Policy.from_json(POLICY))
+    assert pdp.is_allowed(request)
+
+    policy = Policy.from_json(POLICY)
+    policy.effect = "deny"
+    st.update(policy)
+    assert not pdp.is_allowed(request)
+
+    st.delete(POLICY["uid"])
+    assert not pdp.is_allowed(request)
+    assert pdp.cache.generation == 3
+    assert pdp.cache.hits == 0
+
+
+def test_cache_unsubscribe(st):
+    cache = DecisionCache()
+    pdp = PDP(st, cache=cache)
+    request = AccessRequest.from_json(REQUEST)
+    assert not pdp.is_allowed(request)
+    st.unsubscribe(cache.invalidate)
+    st.add(Policy.from_json(POLICY))
+    # Stale decision served as cache is no longer invalidated
+    assert not pdp.is_allowed(request)
+
+
+def test_cache_create_error(st):
+    with pytest.raises(TypeError):
+        PDP(st, cache={})
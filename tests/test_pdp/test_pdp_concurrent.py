@@ -0,0 +1,154 @@
+"""
+    PDP concurrent attribute provider tests
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from py_abac.cache import DecisionCache
+from py_abac.pdp import PDP
+from py_abac.policy import Policy
+from py_abac.provider.base import AttributeProvider
+from py_abac.request import AccessRequest
+from py_abac.storage.memory import MemoryStorage
+from .test_pdp_instrumentation import RecordingInstrument
+from .test_pdp_with_sql import EmailsAttributeProvider
+
+POLICIES = [
+    {
+        "uid": "1",
+        "effect": "allow",
+        "rules": {"subject": {"$.department": {"condition": "Equals", "value": "IT"}}},
+        "targets": {"resource_id": "doc:*"},
+        "priority": 0
+    },
+    {
+        "uid": "2",
+        "effect": "deny",
+        "rules": {"subject": {"$.suspended": {"condition": "Exists"}}},
+        "targets": {"resource_id": "doc:*"},
+        "priority": 0
+    },
+    {
+        "uid": "3",
+        "effect": "allow",
+        "rules": {"subject": {"$.email": {"condition": "Equals", "value": "ben@gmail.com"}}},
+        "targets": {"resource_id": "mail:*"},
+        "priority": 0
+    },
+]
+
+
+class SlowProvider(AttributeProvider):
+
+    def __init__(self, values, delay):
+        self.values = values
+        self.delay = delay
+        self.calls = 0
+
+    def get_attribute_value(self, ace, attribute_path, ctx):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.values.get((ace, attribute_path))
+
+
+def create_request(name="Ben", resource_id="doc:1", **attributes):
+    attributes["name"] = name
+    return AccessRequest.from_json({
+        "subject": {"id": "user:{}".format(name.lower()), "attributes": attributes},
+        "resource": {"id": resource_id, "attributes": {}},
+        "action": {"id": "get", "attributes": {}},
+        "context": {}
+    })
+
+
+@pytest.fixture
+def st():
+    storage = MemoryStorage()
+    for policy_json in POLICIES:
+        storage.add(Policy.from_json(policy_json))
+    return storage
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown()
+
+
+def test_first_provider_in_order_wins(st, executor):
+    slow = SlowProvider({("subject", "$.department"): "IT"}, 0.1)
+    fast = SlowProvider({("subject", "$.department"): "HR"}, 0.0)
+    assert PDP(st, providers=[slow, fast], executor=executor).is_allowed(create_request())
+    assert not PDP(st, providers=[fast, slow], executor=executor).is_allowed(create_request())
+
+
+def test_providers_called_concurrently(st, executor):
+    providers = [SlowProvider({}, 0.1), SlowProvider({}, 0.1), SlowProvider({("subject", "$.department"): "IT"}, 0.1)]
+    pdp = PDP(st, providers=providers, executor=executor, compiled=True)
+    start = time.perf_counter()
+    assert pdp.is_allowed(create_request())
+    # Two attributes are resolved each calling three providers at once
+    assert time.perf_counter() - start < 0.5
+    assert all(provider.calls == 2 for provider in providers)
+
+
+def test_deadline_fail_closed(st, executor, caplog):
+    slow = SlowProvider({("subject", "$.department"): "IT"}, 0.5)
+    cache = DecisionCache()
+    pdp = PDP(st, providers=[slow], cache=cache, executor=executor, timeout=0.05)
+    with caplog.at_level(logging.WARNING, logger="py_abac.pdp"):
+        start = time.perf_counter()
+        assert not pdp.is_allowed(create_request())
+        assert time.perf_counter() - start < 0.4
+    assert "not resolved before deadline" in caplog.text
+    # Denials due to deadline are not cached
+    assert len(cache) == 0
+    assert pdp.is_allowed_many([create_request(), create_request("Max")]) == [False, False]
+    assert len(cache) == 0
+
+
+def test_deadline_fail_open(st, executor):
+    slow = SlowProvider({("subject", "$.suspended"): True}, 0.5)
+    pdp = PDP(st, providers=[slow], executor=executor, timeout=1.0)
+    assert not pdp.is_allowed(create_request(department="IT"))
+    # Suspension not resolved in time is treated as missing
+    pdp = PDP(st, providers=[slow], executor=executor, timeout=0.1, fail_closed=False)
+    assert pdp.is_allowed(create_request(department="IT"))
+
+
+def test_nested_attribute_lookups(st):
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        pdp = PDP(st, providers=[EmailsAttributeProvider()], executor=executor, timeout=1.0)
+        assert pdp.is_allowed(create_request("Ben", "mail:1"))
+        assert not pdp.is_allowed(create_request("Max", "mail:1"))
+    finally:
+        executor.shutdown()
+
+
+def test_instrumented(st, executor):
+    instrument = RecordingInstrument()
+    slow = SlowProvider({("subject", "$.department"): "IT"}, 0.01)
+    pdp = PDP(st, providers=[slow], executor=executor, instrument=instrument, compiled=True)
+    assert pdp.is_allowed(create_request())
+    stats, = instrument.stats
+    assert stats.provider_calls == {"SlowProvider": 2}
+    assert stats.durations["providers"] >= 0.02
+
+    pdp = PDP(st, providers=[SlowProvider({}, 0.5)], executor=executor, timeout=0.05, instrument=instrument)
+    assert not pdp.is_allowed(create_request())
+    assert instrument.stats[-1].decision is False
+
+
+def test_invalid_arguments(st, executor):
+    with pytest.raises(TypeError):
+        PDP(st, executor=object())
+    with pytest.raises(ValueError):
+        PDP(st, timeout=1.0)
+    with pytest.raises(ValueError):
+        PDP(st, executor=executor, timeout=0)
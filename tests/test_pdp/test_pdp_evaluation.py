@@ -0,0 +1,144 @@
+"""
+    PDP evaluation algorithm tests
+"""
+
+import pytest
+
+from py_abac.pdp import PDP, EvaluationAlgorithm
+from py_abac.policy import Policy
+from py_abac.request import AccessRequest
+from py_abac.storage.base import StorageBase
+
+
+class ListStorage(StorageBase):
+    """
+        Storage yielding policies in insertion order and counting retrieved policies
+    """
+
+    def __init__(self, policies):
+        self.policies = policies
+        self.retrieved = 0
+
+    def add(self, policy):
+        self.policies.append(policy)
+
+    def get(self, uid):
+        return next((policy for policy in self.policies if policy.uid == uid), None)
+
+    def get_all(self, limit, offset):
+        return iter(self.policies[offset:offset + limit])
+
+    def get_for_target(self, subject_id, resource_id, action_id):
+        for policy in self.policies:
+            self.retrieved += 1
+            yield policy
+
+    def update(self, policy):
+        pass
+
+    def delete(self, uid):
+        pass
+
+
+def create_policy(uid, effect, fits=True, priority=0):
+    return Policy.from_json({
+        "uid": uid,
+        "effect": effect,
+        "rules": {"subject": {"$.name": {"condition": "Equals", "value": "Max" if fits else "Nina"}}},
+        "targets": {},
+        "priority": priority
+    })
+
+
+@pytest.fixture
+def fitted(monkeypatch):
+    evaluated = []
+    fits = Policy.fits
+
+    def counting_fits(self, ctx):
+        evaluated.append(self.uid)
+        return fits(self, ctx)
+
+    monkeypatch.setattr(Policy, "fits", counting_fits)
+    return evaluated
+
+
+@pytest.fixture
+def request_max():
+    return AccessRequest.from_json({
+        "subject": {"id": "1", "attributes": {"name": "Max"}},
+        "resource": {"id": "1"},
+        "action": {"id": "1"}
+    })
+
+
+def test_deny_overrides_stops_at_first_fitting_deny(fitted, request_max):
+    st = ListStorage([
+        create_policy("1", "allow"),
+        create_policy("2", "deny", fits=False),
+        create_policy("3", "deny"),
+        create_policy("4", "deny"),
+        create_policy("5", "allow"),
+    ])
+    pdp = PDP(st, EvaluationAlgorithm.DENY_OVERRIDES)
+    assert not pdp.is_allowed(request_max)
+    assert st.retrieved == 3
+    # Allow policies deferred and never evaluated
+    assert fitted == ["2", "3"]
+
+
+def test_deny_overrides_evaluates_allow_after_denies(fitted, request_max):
+    st = ListStorage([
+        create_policy("1", "allow", fits=False),
+        create_policy("2", "deny", fits=False),
+        create_policy("3", "allow"),
+        create_policy("4", "allow"),
+    ])
+    pdp = PDP(st, EvaluationAlgorithm.DENY_OVERRIDES)
+    assert pdp.is_allowed(request_max)
+    assert fitted == ["2", "1", "3"]
+
+
+def test_allow_overrides_stops_at_first_fitting_allow(fitted, request_max):
+    st = ListStorage([
+        create_policy("1", "deny"),
+        create_policy("2", "allow", fits=False),
+        create_policy("3", "allow"),
+        create_policy("4", "allow"),
+    ])
+    pdp = PDP(st, EvaluationAlgorithm.ALLOW_OVERRIDES)
+    assert pdp.is_allowed(request_max)
+    assert st.retrieved == 3
+    # Deny policies cannot change decision and are never evaluated
+    assert fitted == ["2", "3"]
+
+
+def test_highest_priority_stops_at_first_fitting_priority(fitted, request_max):
+    st = ListStorage([
+        create_policy("1", "deny", priority=1),
+        create_policy("2", "allow", priority=3),
+        create_policy("3", "deny", fits=False, priority=3),
+        create_policy("4", "allow", fits=False, priority=5),
+        create_policy("5", "deny", priority=2),
+    ])
+    pdp = PDP(st, EvaluationAlgorithm.HIGHEST_PRIORITY)
+    assert pdp.is_allowed(request_max)
+    assert fitted == ["4", "3", "2"]
+
+
+@pytest.mark.parametrize("algorithm", list(EvaluationAlgorithm))
+def test_no_fitting_policies(request_max, algorithm):
+    pdp = PDP(ListStorage([create_policy("1", "allow", fits=False)]), algorithm)
+    assert not pdp.is_allowed(request_max)
+    pdp = PDP(ListStorage([]), algorithm)
+    assert not pdp.is_allowed(request_max)
+
+
+def test_get_for_target_ordered():
+    st = ListStorage([
+        create_policy("1", "allow", priority=1),
+        create_policy("2", "deny", priority=1),
+        create_policy("3", "allow", priority=2),
+        create_policy("4", "deny"),
+    ])
+    assert [policy.uid for policy in st.get_for_target_ordered("", "", "")] == ["3", "2", "1", "4"]
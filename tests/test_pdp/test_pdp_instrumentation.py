@@ -0,0 +1,180 @@
+"""
+    PDP instrumentation tests
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from py_abac.cache import DecisionCache
+from py_abac.instrumentation import Instrument, DecisionStats, SlowDecisionLogger, PHASES
+from py_abac.pdp import PDP, AsyncPDP
+from py_abac.policy import Policy
+from py_abac.request import AccessRequest
+from py_abac.storage.memory import MemoryStorage
+from .test_async_pdp import AsyncSQLStorage
+from .test_pdp_with_sql import EmailsAttributeProvider
+
+POLICIES = [
+    {
+        "uid": "1",
+        "description": "Ben is allowed to get any resource using his email",
+        "effect": "allow",
+        "rules": {
+            "subject": {"$.email": {"condition": "Equals", "value": "ben@gmail.com"}},
+            "action": {"$.method": {"condition": "Equals", "value": "get"}}
+        },
+        "targets": {},
+        "priority": 0
+    },
+    {
+        "uid": "2",
+        "description": "Nobody is allowed to delete documents",
+        "effect": "deny",
+        "rules": {
+            "action": {"$.method": {"condition": "Equals", "value": "delete"}}
+        },
+        "targets": {"resource_id": "doc:*"},
+        "priority": 0
+    },
+    {
+        "uid": "3",
+        "description": "Max may print reports",
+        "effect": "allow",
+        "rules": {},
+        "targets": {"subject_id": "user:max", "resource_id": "report:*"},
+        "priority": 0
+    },
+]
+
+
+def create_request(name, resource_id, method):
+    return AccessRequest.from_json({
+        "subject": {"id": "user:{}".format(name.lower()), "attributes": {"name": name}},
+        "resource": {"id": resource_id, "attributes": {}},
+        "action": {"id": method, "attributes": {"method": method}},
+        "context": {}
+    })
+
+
+class RecordingInstrument(Instrument):
+
+    def __init__(self):
+        self.stats = []
+
+    def on_decision(self, stats):
+        self.stats.append(stats)
+
+
+@pytest.fixture
+def st():
+    storage = MemoryStorage()
+    for policy_json in POLICIES:
+        storage.add(Policy.from_json(policy_json))
+    return storage
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_decision_stats(st, compiled):
+    instrument = RecordingInstrument()
+    pdp = PDP(st, providers=[EmailsAttributeProvider()], compiled=compiled, instrument=instrument)
+    assert pdp.instrument is instrument
+
+    assert pdp.is_allowed(create_request("Ben", "doc:1", "get"))
+    stats, = instrument.stats
+    assert stats.decision is True
+    assert not stats.cached
+    assert set(stats.durations) == set(PHASES)
+    assert all(duration >= 0.0 for duration in stats.durations.values())
+    assert stats.durations["total"] >= stats.durations["evaluation"] >= stats.durations["providers"]
+    assert stats.candidates == 2
+    assert stats.evaluated == 2
+    assert stats.fitting == 1
+    assert set(stats.provider_calls) == {"EmailsAttributeProvider"}
+    assert stats.condition_evaluations >= 2
+
+
+def test_decision_stats_to_dict(st):
+    instrument = RecordingInstrument()
+    pdp = PDP(st, instrument=instrument)
+    assert not pdp.is_allowed(create_request("Max", "doc:1", "delete"))
+    data = instrument.stats[0].to_dict()
+    assert data["subject_id"] == "user:max"
+    assert data["resource_id"] == "doc:1"
+    assert data["action_id"] == "delete"
+    assert data["decision"] is False
+    assert data["candidates"] == 2
+    assert data["provider_calls"] == {}
+    assert set(data["durations"]) == set(PHASES)
+
+
+def test_cached_decision_stats(st):
+    instrument = RecordingInstrument()
+    pdp = PDP(st, cache=DecisionCache(), instrument=instrument)
+    request = create_request("Max", "report:1", "print")
+    assert pdp.is_allowed(request)
+    assert pdp.is_allowed(request)
+    first, second = instrument.stats
+    assert not first.cached and first.candidates == 2
+    assert second.cached and second.candidates == 0 and second.decision is True
+
+
+def test_is_allowed_many_stats(st):
+    instrument = RecordingInstrument()
+    pdp = PDP(st, providers=[EmailsAttributeProvider()], cache=DecisionCache(), instrument=instrument)
+    requests = [
+        create_request("Ben", "doc:1", "get"),
+        create_request("Max", "report:1", "print"),
+        create_request("Ben", "doc:1", "get"),
+    ]
+    assert pdp.is_allowed_many(requests) == [True, True, True]
+    assert [stats.request for stats in instrument.stats] == requests
+    assert [stats.candidates for stats in instrument.stats] == [2, 2, 2]
+    assert not any(stats.cached for stats in instrument.stats)
+
+    instrument.stats.clear()
+    assert pdp.is_allowed_many(requests) == [True, True, True]
+    assert len(instrument.stats) == 3
+    assert all(stats.cached for stats in instrument.stats)
+
+
+def test_async_pdp_stats(st):
+    instrument = RecordingInstrument()
+    pdp = AsyncPDP(AsyncSQLStorage(st), providers=[EmailsAttributeProvider()], instrument=instrument)
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(pdp.is_allowed(create_request("Ben", "doc:1", "get")))
+        assert loop.run_until_complete(pdp.is_allowed_many([
+            create_request("Max", "report:1", "print"),
+            create_request("Nina", "doc:1", "get"),
+        ])) == [True, False]
+    finally:
+        loop.close()
+    single, batch_first, batch_second = instrument.stats
+    assert single.decision is True
+    assert single.candidates == 2
+    assert single.fitting == 1
+    assert single.provider_calls == {"EmailsAttributeProvider": 1}
+    assert batch_first.candidates == 2 and batch_first.decision is True
+    assert batch_second.candidates == 2 and batch_second.decision is False
+
+
+def test_create_pdp_with_invalid_instrument(st):
+    with pytest.raises(TypeError):
+        PDP(st, instrument=object())
+
+
+def test_slow_decision_logger(st, caplog):
+    request = create_request("Max", "report:1", "print")
+    with caplog.at_level(logging.INFO, logger="py_abac.instrumentation"):
+        PDP(st, instrument=SlowDecisionLogger(threshold=3600.0)).is_allowed(request)
+        assert not caplog.records
+        PDP(st, instrument=SlowDecisionLogger(threshold=0.0, level=logging.INFO)).is_allowed(request)
+    record, = caplog.records
+    assert record.levelno == logging.INFO
+    assert "user:max" in record.getMessage()
+
+
+def test_instrument_base_is_noop():
+    Instrument().on_decision(DecisionStats(create_request("Max", "doc:1", "get")))
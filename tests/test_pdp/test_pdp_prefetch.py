@@ -0,0 +1,135 @@
+"""
+    PDP attribute prefetch tests
+"""
+
+import asyncio
+
+import pytest
+
+from py_abac.pdp import PDP, AsyncPDP
+from py_abac.policy import Policy
+from py_abac.provider.base import BulkAttributeProvider
+from py_abac.provider.cached import CachedBulkAttributeProvider
+from py_abac.provider.circuit_breaker import CircuitBreakerBulkProvider
+from py_abac.request import AccessRequest
+from py_abac.storage.memory import MemoryStorage
+from .test_async_pdp import AsyncSQLStorage
+
+POLICIES = [
+    {
+        "uid": "1",
+        "effect": "allow",
+        "rules": {
+            "subject": {
+                "$.department": {"condition": "Equals", "value": "IT"},
+                "$.grade": {"condition": "Gte", "value": 3},
+                "$.name": {"condition": "Equals", "value": "Max"}
+            }
+        },
+        "targets": {},
+        "priority": 0
+    },
+    {
+        "uid": "2",
+        "effect": "deny",
+        "rules": {
+            "subject": {"$.suspended": {"condition": "Exists"}},
+            "resource": {"$.owner": {"condition": "EqualsAttribute", "ace": "subject", "path": "$.manager"}}
+        },
+        "targets": {"resource_id": "doc:*"},
+        "priority": 0
+    },
+]
+
+HR = {
+    "Max": {"department": "IT", "grade": 3, "manager": "Nina"},
+    "Ben": {"department": "IT", "grade": 1, "suspended": True, "manager": "Nina"},
+}
+
+
+class HRAttributeProvider(BulkAttributeProvider):
+
+    def __init__(self):
+        self.calls = []
+
+    def get_attribute_values(self, ace, attribute_paths, ctx):
+        self.calls.append((ace, sorted(attribute_paths)))
+        if ace != "subject":
+            return {}
+        record = HR.get(ctx.get_attribute_value("subject", "$.name"), {})
+        return {path: record.get(path[2:]) for path in attribute_paths}
+
+
+def create_request(name, resource_id):
+    return AccessRequest.from_json({
+        "subject": {"id": "user:{}".format(name.lower()), "attributes": {"name": name}},
+        "resource": {"id": resource_id, "attributes": {"owner": "Nina"}},
+        "action": {"id": "get", "attributes": {}},
+        "context": {}
+    })
+
+
+@pytest.fixture
+def st():
+    storage = MemoryStorage()
+    for policy_json in POLICIES:
+        storage.add(Policy.from_json(policy_json))
+    return storage
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_prefetch(st, compiled):
+    provider = HRAttributeProvider()
+    pdp = PDP(st, providers=[provider], compiled=compiled, prefetch=True)
+    assert pdp.is_allowed(create_request("Max", "report:1"))
+    # Single call for all subject attributes of the candidate policy
+    assert provider.calls == [("subject", ["$.department", "$.grade"])]
+
+    provider.calls.clear()
+    assert not pdp.is_allowed(create_request("Ben", "doc:1"))
+    assert provider.calls == [("subject", ["$.department", "$.grade", "$.manager", "$.suspended"])]
+
+
+def test_without_prefetch(st):
+    provider = HRAttributeProvider()
+    pdp = PDP(st, providers=[provider])
+    assert not pdp.is_allowed(create_request("Ben", "doc:1"))
+    assert all(len(paths) == 1 for _, paths in provider.calls)
+    assert len(provider.calls) > 1
+
+
+def test_prefetch_wrapped(st):
+    provider = HRAttributeProvider()
+    cached = CachedBulkAttributeProvider(provider)
+    wrapped = CircuitBreakerBulkProvider(cached)
+    pdp = PDP(st, providers=[wrapped], prefetch=True)
+    assert pdp.is_allowed(create_request("Max", "report:1"))
+    assert provider.calls == [("subject", ["$.department", "$.grade"])]
+
+    # Cached values are not requested again
+    provider.calls.clear()
+    assert pdp.is_allowed(create_request("Max", "doc:1"))
+    assert provider.calls == [("subject", ["$.manager", "$.suspended"])]
+    provider.calls.clear()
+    assert pdp.is_allowed(create_request("Max", "doc:1"))
+    assert provider.calls == []
+    assert cached.stats()["hits"] == 6
+
+
+def test_prefetch_many(st):
+    provider = HRAttributeProvider()
+    pdp = PDP(st, providers=[provider], prefetch=True)
+    requests = [create_request("Max", "report:1"), create_request("Ben", "doc:1"), create_request("Max", "doc:1")]
+    assert pdp.is_allowed_many(requests) == [True, False, True]
+    assert len(provider.calls) == 3
+
+
+def test_async_prefetch(st):
+    provider = HRAttributeProvider()
+    pdp = AsyncPDP(AsyncSQLStorage(st), providers=[provider], prefetch=True)
+    loop = asyncio.new_event_loop()
+    try:
+        assert not loop.run_until_complete(pdp.is_allowed(create_request("Ben", "doc:1")))
+    finally:
+        loop.close()
+    assert provider.calls == [("subject", ["$.department", "$.grade", "$.manager", "$.suspended"])]
@@ -896,6 +896,8 @@ def test_pdp_create_error(st):
         PDP(st, None)
     with pytest.raises(TypeError):
         PDP(st, EvaluationAlgorithm.DENY_OVERRIDES, [None])
+    with pytest.raises(TypeError):
+        PDP(st, compile=True)
 
 
 def test_is_allowed_error(st):
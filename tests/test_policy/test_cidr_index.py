@@ -0,0 +1,72 @@
+"""
+    CIDR index tests
+"""
+
+import ipaddress
+import random
+
+import pytest
+
+from py_abac.policy.cidr_index import CIDRIndex
+
+NETWORKS = ["0.0.0.0/0", "10.0.0.0/8", "10.1.0.0/16", "10.1.2.0/24", "10.1.2.3/32", "192.168.0.0/16",
+            "::/0", "2001:db8::/32", "2001:db8:1::/48", "::ffff:0:0/96"]
+ADDRESSES = ["10.1.2.3", "10.1.2.4", "10.2.0.1", "11.0.0.1", "192.168.1.1", "2001:db8:1::1", "2001:db8:2::1",
+             "::1", "::ffff:10.1.2.3"]
+
+
+@pytest.mark.parametrize("address", ADDRESSES)
+def test_match(address):
+    index = CIDRIndex()
+    for network in NETWORKS:
+        assert index.add(network, network)
+    expected = {network for network in NETWORKS if ipaddress.ip_address(address) in ipaddress.ip_network(network)}
+    assert index.match(address) == expected
+    assert index.match(ipaddress.ip_address(address)) == expected
+    assert index.contains(address)
+
+
+def test_random():
+    rnd = random.Random(0)
+    networks = []
+    for _ in range(300):
+        prefixlen = rnd.randrange(33)
+        networks.append(str(ipaddress.ip_network((rnd.getrandbits(32) >> (32 - prefixlen) << (32 - prefixlen),
+                                                  prefixlen))))
+    index = CIDRIndex()
+    for network in networks:
+        index.add(network, network)
+    for _ in range(300):
+        address = ipaddress.ip_address(rnd.getrandbits(32))
+        expected = {network for network in networks if address in ipaddress.ip_network(network)}
+        assert index.match(str(address)) == expected
+        assert index.contains(address) == bool(expected)
+
+
+def test_remove():
+    index = CIDRIndex()
+    index.add("10.0.0.0/8", "a")
+    index.add("10.1.0.0/16", "b")
+    index.add("10.1.0.0/16", "c")
+    assert len(index) == 3
+    index.remove("10.1.0.0/16", "b")
+    assert index.match("10.1.0.1") == {"a", "c"}
+    index.remove("10.1.0.0/16", "c")
+    index.remove("10.1.0.0/16", "c")
+    index.remove("10.2.0.0/16", "a")
+    index.remove("invalid", "a")
+    assert index.match("10.1.0.1") == {"a"}
+    index.remove("10.0.0.0/8", "a")
+    assert len(index) == 0
+    assert not index.contains("10.1.0.1")
+    assert index._roots[4].children == [None, None]
+
+
+def test_invalid():
+    index = CIDRIndex()
+    assert not index.add("10.0.0.1/8", "a")
+    assert not index.add("invalid", "a")
+    assert len(index) == 0
+    index.add("0.0.0.0/0", "a")
+    assert index.match("invalid") == set()
+    assert not index.contains("::1")
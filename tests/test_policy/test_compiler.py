@@ -0,0 +1,189 @@
+"""
+    Policy compiler tests
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from py_abac.context import EvaluationContext
+from py_abac.policy import Policy
+from py_abac.policy.compiler import compile_condition, compile_rules
+from py_abac.policy.conditions.base import ConditionBase
+from py_abac.policy.conditions.schema import ConditionSchema
+from py_abac.policy.conditions.string import Equals, RegexMatch
+from py_abac.policy.rules import RulesSchema
+from py_abac.request import AccessRequest
+
+CONDITIONS = [
+    {"condition": "Eq", "value": 2},
+    {"condition": "Neq", "value": 2},
+    {"condition": "Gt", "value": 2},
+    {"condition": "Gte", "value": 2},
+    {"condition": "Lt", "value": 2},
+    {"condition": "Lte", "value": 2.0},
+    {"condition": "Equals", "value": "Max"},
+    {"condition": "Equals", "value": "Max", "case_insensitive": True},
+    {"condition": "NotEquals", "value": "Max"},
+    {"condition": "NotEquals", "value": "Max", "case_insensitive": True},
+    {"condition": "Contains", "value": "ax"},
+    {"condition": "Contains", "value": "AX", "case_insensitive": True},
+    {"condition": "NotContains", "value": "ax"},
+    {"condition": "NotContains", "value": "AX", "case_insensitive": True},
+    {"condition": "StartsWith", "value": "Ma"},
+    {"condition": "StartsWith", "value": "ma", "case_insensitive": True},
+    {"condition": "EndsWith", "value": "ax"},
+    {"condition": "EndsWith", "value": "AX", "case_insensitive": True},
+    {"condition": "RegexMatch", "value": "^M.x$"},
+    RegexMatch("^Max", case_insensitive=True),
+    {"condition": "IsIn", "values": ["Max", 2, [1, 2]]},
+    {"condition": "IsNotIn", "values": ["Max", 2, [1, 2]]},
+    {"condition": "AllIn", "values": ["Max", 2, 3]},
+    {"condition": "AllNotIn", "values": ["Max", 2, 3]},
+    {"condition": "AnyIn", "values": ["Max", 2, 3]},
+    {"condition": "AnyNotIn", "values": ["Max", 2, 3]},
+    {"condition": "IsEmpty"},
+    {"condition": "IsNotEmpty"},
+    {"condition": "AllOf", "values": [{"condition": "Gt", "value": 1}, {"condition": "Lt", "value": 3}]},
+    {"condition": "AnyOf", "values": [{"condition": "Equals", "value": "Max"}, {"condition": "Eq", "value": 2}]},
+    {"condition": "AnyOf", "values": [{"condition": "Exists"}]},
+    {"condition": "Not", "value": {"condition": "Equals", "value": "Max"}},
+    {"condition": "Any"},
+    {"condition": "Exists"},
+    {"condition": "NotExists"},
+    {"condition": "EqualsObject", "value": {"a": 1}},
+    {"condition": "EqualsAttribute", "ace": "subject", "path": "$.other"},
+    {"condition": "CIDR", "value": "127.0.0.0/24"},
+    {"condition": "CIDR", "value": "invalid"},
+    {"condition": "AnyOf", "values": [{"condition": "CIDR", "value": "127.0.0.0/24"},
+                                      {"condition": "CIDR", "value": "192.168.0.0/16"},
+                                      {"condition": "CIDR", "value": "invalid"},
+                                      {"condition": "CIDR", "value": "::1/128"}]},
+    {"condition": "AnyOf", "values": [{"condition": "CIDR", "value": "invalid"}] * 4},
+]
+
+VALUES = [None, 1, 2, 2.0, 3, True, "Max", "max", "MAX", "Nina", "", "127.0.0.1", "10.0.0.1", "::1",
+          [], [2], [2, 3], ["Max", 4], [1, 2], {"a": 1}, {}]
+
+
+class OddLength(ConditionBase):
+
+    def is_satisfied(self, ctx) -> bool:
+        return isinstance(ctx.attribute_value, str) and len(ctx.attribute_value) % 2 == 1
+
+
+def create_context(value):
+    request = AccessRequest.from_json({
+        "subject": {"id": "1", "attributes": {"value": value, "other": "Max"}},
+        "resource": {"id": "1"},
+        "action": {"id": "1"}
+    })
+    ctx = EvaluationContext(request)
+    ctx.ace = "subject"
+    ctx.attribute_path = "$.value"
+    return ctx
+
+
+@pytest.mark.parametrize("condition_json", CONDITIONS)
+@pytest.mark.parametrize("value", VALUES)
+def test_compile_condition(condition_json, value):
+    condition = condition_json if isinstance(condition_json, ConditionBase) else ConditionSchema().load(condition_json)
+    predicate = compile_condition(condition, "subject", "$.value")
+    ctx = create_context(value)
+    assert predicate(ctx.attribute_value, ctx) == condition.is_satisfied(ctx)
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_compile_custom_condition(value):
+    condition = OddLength()
+    predicate = compile_condition(condition, "subject", "$.value")
+    ctx = create_context(value)
+    expected = condition.is_satisfied(ctx)
+    ctx.ace = None
+    ctx.attribute_path = None
+    assert predicate(value, ctx) == expected
+
+
+@pytest.mark.parametrize("rules_json", [
+    {},
+    {"subject": []},
+    {"subject": [{}]},
+    {"subject": {"$.name": {"condition": "Any"}}, "context": []},
+    {"subject": {"$.name": {"condition": "Equals", "value": "Max"}}},
+    {"subject": {"$.name": {"condition": "Equals", "value": "Nina"}}},
+    {"subject": [{"$.name": {"condition": "Equals", "value": "Nina"}},
+                 {"$.name": {"condition": "Equals", "value": "Max"}, "$.age": {"condition": "Gt", "value": 18}}]},
+    {"subject": [{"$.name": {"condition": "Equals", "value": "Nina"}}, {}]},
+    {"subject": {"$.name": {"condition": "Any"}},
+     "resource": {"$.name": {"condition": "RegexMatch", "value": "doc:.*"}},
+     "action": [{"$.method": {"condition": "Equals", "value": "get"}}],
+     "context": {"$.ip": {"condition": "CIDR", "value": "127.0.0.0/24"}}},
+    {"subject": {"$.name": {"condition": "Any"}},
+     "resource": {"$.name": {"condition": "RegexMatch", "value": "doc:.*"}},
+     "action": [{"$.method": {"condition": "Equals", "value": "post"}}]},
+    {"resource": {"$.owner": {"condition": "EqualsAttribute", "ace": "subject", "path": "$.name"}}},
+])
+def test_compile_rules(rules_json):
+    rules = RulesSchema().load(rules_json)
+    request = AccessRequest.from_json({
+        "subject": {"id": "1", "attributes": {"name": "Max", "age": 21}},
+        "resource": {"id": "1", "attributes": {"name": "doc:1", "owner": "Max"}},
+        "action": {"id": "1", "attributes": {"method": "get"}},
+        "context": {"ip": "127.0.0.1"}
+    })
+    ctx = EvaluationContext(request)
+    assert compile_rules(rules)(ctx) == rules.is_satisfied(ctx)
+
+
+def test_compile_rules_never_satisfied_branch():
+    # Branch holding an empty disjunction is never satisfied and must not
+    # make the whole disjunction satisfied like an empty conjunction would
+    never = (("subject", None, ()),)
+    nina = (("subject", "$.name", Equals("Nina")),)
+    request = AccessRequest.from_json({
+        "subject": {"id": "1", "attributes": {"name": "Max"}},
+        "resource": {"id": "1"},
+        "action": {"id": "1"}
+    })
+    ctx = EvaluationContext(request)
+    rules = SimpleNamespace(plan=(("subject", None, (never, nina)),), statistics=None)
+    assert not compile_rules(rules)(ctx)
+    rules = SimpleNamespace(plan=(("subject", None, (never, ())),), statistics=None)
+    assert compile_rules(rules)(ctx)
+    rules = SimpleNamespace(plan=(("subject", None, (never,)),), statistics=None)
+    assert not compile_rules(rules)(ctx)
+
+
+def test_policy_fits_compiled():
+    policy = Policy.from_json({
+        "uid": "1",
+        "effect": "allow",
+        "rules": {"subject": {"$.name": {"condition": "Equals", "value": "Max"}}},
+        "targets": {"subject_id": "user:*"}
+    })
+    request = AccessRequest.from_json({
+        "subject": {"id": "user:1", "attributes": {"name": "Max"}},
+        "resource": {"id": "1"},
+        "action": {"id": "1"}
+    })
+    ctx = EvaluationContext(request)
+    assert policy.fits_compiled(ctx)
+
+    # Replacing rules triggers recompilation
+    policy.rules = RulesSchema().load({"subject": {"$.name": {"condition": "Equals", "value": "Nina"}}})
+    assert not policy.fits_compiled(ctx)
+
+    # Assigning access control elements of rules triggers recompilation
+    policy.rules.subject = {}
+    assert policy.fits_compiled(ctx)
+
+    # Rules modified in place require explicit recompilation
+    policy.rules.subject["$.name"] = ConditionSchema().load({"condition": "Equals", "value": "Nina"})
+    assert policy.fits_compiled(ctx)
+    policy.compile()
+    assert not policy.fits_compiled(ctx)
+    policy.rules.subject = {}
+    assert policy.fits_compiled(ctx)
+
+    policy.targets.subject_id = "admin:*"
+    assert not policy.fits_compiled(ctx)
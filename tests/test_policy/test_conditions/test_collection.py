@@ -117,6 +117,21 @@ class TestCollectionCondition(object):
         (IsNotEmpty(), [], False),
         (IsNotEmpty(), [1], True),
         (IsNotEmpty(), None, False),
+
+        (AllIn([{"a": 1}, 2, [3]]), [2, {"a": 1}], True),
+        (AllIn([{"a": 1}, 2, [3]]), [[3], {"a": 2}], False),
+        (AllIn([1, 2]), [1, {"a": 1}], False),
+        (AllNotIn([{"a": 1}, 2]), [{"a": 1}, 3], True),
+        (AnyIn([{"a": 1}, 2]), [[1], {"a": 1}], True),
+        (AnyIn([1, 2]), [[1], {"a": 1}], False),
+        (AnyIn([1, 2]), [[1], 2.0], True),
+        (AnyNotIn([{"a": 1}, 2]), [[2]], True),
+        (IsIn([{"a": 1}, 2]), {"a": 1}, True),
+        (IsIn([{"a": 1}, 2]), 2.0, True),
+        (IsIn([{"a": 1}, 2]), [2], False),
+        (IsIn([1, 2]), {"a": 1}, False),
+        (IsNotIn([[1], 2]), [1], False),
+        (IsNotIn([[1], 2]), True, True),
     ])
     def test_is_satisfied(self, condition, what, result):
         request = AccessRequest(subject={"attributes": {"what": what}}, resource={}, action={}, context={})
@@ -124,3 +139,21 @@ class TestCollectionCondition(object):
         ctx.ace = "subject"
         ctx.attribute_path = "$.what"
         assert condition.is_satisfied(ctx) == result
+
+
+@pytest.mark.parametrize("condition_type, reference", [
+    (AllIn, lambda what, values: all(value in values for value in what)),
+    (AllNotIn, lambda what, values: not all(value in values for value in what)),
+    (AnyIn, lambda what, values: any(value in values for value in what)),
+    (AnyNotIn, lambda what, values: not any(value in values for value in what)),
+    (IsIn, lambda what, values: what in values),
+    (IsNotIn, lambda what, values: what not in values),
+])
+def test_membership_matches_list(condition_type, reference):
+    members = [1, 2.0, True, "a", None, [1], {"a": 1}, []]
+    for size in range(len(members) + 1):
+        values = members[:size]
+        condition = condition_type(values)
+        for what in members + [[], [1, "a"], [1, {"a": 1}], [[1], "b"], [3, {"b": 1}]]:
+            if condition_type in (IsIn, IsNotIn) or isinstance(what, list):
+                assert condition._is_satisfied(what) == reference(what, values)
@@ -2,6 +2,8 @@
     String condition tests
 """
 
+import re
+
 import pytest
 from marshmallow import ValidationError
 
@@ -14,6 +16,7 @@ from py_abac.policy.conditions.string import NotContains
 from py_abac.policy.conditions.string import NotEquals
 from py_abac.policy.conditions.string import RegexMatch
 from py_abac.policy.conditions.string import StartsWith
+from py_abac.policy.conditions.string.regex_match import compile_regex, _literal_search
 from py_abac.request import AccessRequest
 
 
@@ -136,6 +139,8 @@ class TestStringCondition(object):
         (RegexMatch(r"^python\?exe"), "python?exe", True),
         (RegexMatch(r"^python?exe"), "python?exe", False),
         (RegexMatch(r"^python?exe"), None, False),
+        (RegexMatch("^Admin", case_insensitive=True), "Admin", True),
+        (RegexMatch("^Admin", case_insensitive=True), "admin", False),
     ])
     def test_is_satisfied(self, condition, what, result):
         request = AccessRequest(subject={"attributes": {"what": what}}, resource={}, action={}, context={})
@@ -143,3 +148,44 @@ class TestStringCondition(object):
         ctx.ace = "subject"
         ctx.attribute_path = "$.what"
         assert condition.is_satisfied(ctx) == result
+
+
+@pytest.mark.parametrize("pattern, literal", [
+    ("", True),
+    ("doc:", True),
+    ("^doc:", True),
+    ("\\Adoc:", True),
+    ("doc:.*", True),
+    (".*doc:.*?", True),
+    ("^.*doc:", False),
+    ("doc:$", False),
+    ("doc:.+", False),
+    ("(?i)doc:", False),
+    ("doc|file", False),
+    ("doc\\.pdf", True),
+])
+def test_compile_regex(pattern, literal):
+    assert (_literal_search(pattern) is not None) == literal
+    search = compile_regex(pattern)
+    assert search is compile_regex(pattern)
+    for what in ["", "doc:", "doc:1", "my doc:1", "\ndoc:", "x\ndoc:", "DOC:", "doc.pdf", "docxpdf", "file"]:
+        assert search(what) == (re.search(pattern, what) is not None)
+    assert RegexMatch(pattern)._search is search
+
+
+def test_literal_search_legacy_parser(monkeypatch):
+    from py_abac.policy.conditions.string import regex_match
+    parse = regex_match.sre_parse.parse
+
+    class LegacySubPattern(object):
+        # Parser state is held by `pattern` attribute before Python 3.8
+        def __init__(self, parsed):
+            self.pattern = parsed.state
+            self.items = list(parsed)
+
+        def __iter__(self):
+            return iter(self.items)
+
+    monkeypatch.setattr(regex_match.sre_parse, "parse", lambda pattern: LegacySubPattern(parse(pattern)))
+    assert _literal_search("^doc:")("doc:1")
+    assert _literal_search("(?i)doc:") is None
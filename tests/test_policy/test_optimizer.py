@@ -0,0 +1,171 @@
+"""
+    Rules optimizer tests
+"""
+
+import time
+
+import pytest
+
+from py_abac.context import EvaluationContext
+from py_abac.pdp import PDP
+from py_abac.policy import Policy
+from py_abac.policy.conditions.schema import ConditionSchema
+from py_abac.policy.optimizer import RuleStatistics, condition_cost, plan_rules, DEFAULT_CONDITION_COST
+from py_abac.policy.rules import RulesSchema
+from py_abac.provider.base import AttributeProvider
+from py_abac.request import AccessRequest
+from py_abac.storage.memory import MemoryStorage
+from .test_compiler import OddLength
+
+
+class SlowProvider(AttributeProvider):
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_attribute_value(self, ace, attribute_path, ctx):
+        if attribute_path != "$.clearance":
+            return None
+        self.calls += 1
+        time.sleep(0.001)
+        return "secret"
+
+
+def create_request(role):
+    return AccessRequest.from_json({
+        "subject": {"id": "user:max", "attributes": {"role": role}},
+        "resource": {"id": "doc:1", "attributes": {"name": "Calendar"}},
+        "action": {"id": "get", "attributes": {}},
+        "context": {}
+    })
+
+
+def plan_paths(plan):
+    return [(ace, path) if path is not None else [plan_paths(branch) for branch in condition]
+            for ace, path, condition in plan]
+
+
+def test_condition_cost():
+    regex = ConditionSchema().load({"condition": "RegexMatch", "value": "^a"})
+    exists = ConditionSchema().load({"condition": "Exists"})
+    assert condition_cost(exists) < condition_cost(regex)
+    assert condition_cost(ConditionSchema().load({
+        "condition": "AllOf", "values": [{"condition": "Exists"}, {"condition": "RegexMatch", "value": "^a"}]
+    })) == condition_cost(exists) + condition_cost(regex)
+    assert condition_cost(ConditionSchema().load({"condition": "Not", "value": {"condition": "Exists"}})) == \
+           condition_cost(exists)
+    assert condition_cost(OddLength()) == DEFAULT_CONDITION_COST
+
+
+def test_plan_rules():
+    rules = RulesSchema().load({
+        "subject": {
+            "$.name": {"condition": "RegexMatch", "value": "^M"},
+            "$.role": {"condition": "Equals", "value": "admin"}
+        },
+        "resource": [
+            {"$.name": {"condition": "AllIn", "values": ["a"]}, "$.id": {"condition": "Exists"}},
+            {"$.name": {"condition": "Equals", "value": "Calendar"}},
+            {}
+        ],
+        "action": {"$.method": {"condition": "Any"}},
+        "context": {"$.ip": {"condition": "CIDR", "value": "10.0.0.0/8"}}
+    })
+    # Conditions of all elements are merged: cheap conditions first, those always
+    # satisfied last. The always satisfied alternative is tried first.
+    assert plan_paths(rules.plan) == [
+        ("subject", "$.role"),
+        ("subject", "$.name"),
+        ("context", "$.ip"),
+        [[], [("resource", "$.name")], [("resource", "$.id"), ("resource", "$.name")]],
+        ("action", "$.method"),
+    ]
+    assert plan_paths(plan_rules(rules)) == plan_paths(rules.plan)
+    assert rules.is_optimized()
+    assert not rules.is_optimized(RuleStatistics())
+
+
+def test_plan_invalidated():
+    rules = RulesSchema().load({"subject": {"$.role": {"condition": "Equals", "value": "admin"}}})
+    # Planned on first evaluation
+    assert not rules.is_optimized()
+    ctx = EvaluationContext(create_request("admin"))
+    assert rules.is_satisfied(ctx)
+    rules.subject = RulesSchema().load({"subject": {"$.role": {"condition": "Equals", "value": "user"}}}).subject
+    assert not rules.is_optimized()
+    assert not rules.is_satisfied(ctx)
+    assert rules.is_optimized()
+
+    # Conditions modified in place require explicit optimization
+    rules.subject["$.name"] = ConditionSchema().load({"condition": "Exists"})
+    assert rules.is_satisfied(EvaluationContext(create_request("user")))
+    rules.optimize()
+    assert not rules.is_satisfied(EvaluationContext(create_request("user")))
+
+    # Or invalidation of the plan, which is then computed on next evaluation
+    del rules.subject["$.name"]
+    rules.invalidate()
+    assert not rules.is_optimized()
+    assert rules.is_satisfied(EvaluationContext(create_request("user")))
+    assert rules.is_optimized()
+
+
+def test_statistics():
+    condition = ConditionSchema().load({"condition": "Equals", "value": "admin"})
+    statistics = RuleStatistics(refresh_interval=4, min_samples=2)
+    assert statistics.lookup_cost("subject", "$.role") == 1.5
+    assert statistics.pass_rate("subject", "$.role", condition) == 0.5
+    assert statistics.condition_cost("subject", "$.role", condition) == condition_cost(condition)
+    for passed in [True, False, False, False]:
+        statistics.record_lookup("subject", "$.role", 2e-6)
+        statistics.record_condition("subject", "$.role", condition, passed, 1e-6)
+    assert statistics.generation == 1
+    assert statistics.lookup_cost("subject", "$.role") == pytest.approx(2.0)
+    assert statistics.condition_cost("subject", "$.role", condition) == pytest.approx(1.0)
+    assert statistics.pass_rate("subject", "$.role", condition) == 0.25
+    statistics.clear()
+    assert statistics.generation == 2
+    assert statistics.pass_rate("subject", "$.role", condition) == 0.5
+
+
+@pytest.mark.parametrize("kwargs", [{"refresh_interval": 0}, {"min_samples": 0}])
+def test_statistics_create_error(kwargs):
+    with pytest.raises(ValueError):
+        RuleStatistics(**kwargs)
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_with_pdp(compiled):
+    storage = MemoryStorage()
+    storage.add(Policy.from_json({
+        "uid": "1",
+        "effect": "allow",
+        "rules": {
+            "subject": {
+                "$.clearance": {"condition": "Equals", "value": "secret"},
+                "$.role": {"condition": "Equals", "value": "admin"}
+            }
+        },
+        "targets": {},
+        "priority": 0
+    }))
+    provider = SlowProvider()
+    statistics = RuleStatistics(refresh_interval=10, min_samples=5)
+    pdp = PDP(storage, providers=[provider], compiled=compiled, statistics=statistics)
+    for _ in range(10):
+        assert not pdp.is_allowed(create_request("user"))
+    # Rules are optimized again once estimates are published
+    assert provider.calls == 5
+    assert statistics.generation == 1
+
+    # Attribute resolved by slow provider is looked up once the cheap condition passed
+    for _ in range(10):
+        assert not pdp.is_allowed(create_request("user"))
+    assert pdp.is_allowed(create_request("admin"))
+    assert provider.calls == 6
+    assert plan_paths(storage.get("1").rules.plan) == [("subject", "$.role"), ("subject", "$.clearance")]
+
+
+def test_pdp_create_error():
+    with pytest.raises(TypeError):
+        PDP(MemoryStorage(), statistics=object())
@@ -9,6 +9,7 @@ from py_abac.context import EvaluationContext
 from py_abac.policy.conditions.numeric import Eq
 from py_abac.policy.conditions.string import Equals
 from py_abac.policy.rules import Rules, RulesSchema
+from py_abac.provider.base import AttributeProvider
 from py_abac.request import AccessRequest
 
 
@@ -141,3 +142,54 @@ def test_is_satisfied(rules_json, result):
     ctx = EvaluationContext(request)
     rules = RulesSchema().load(rules_json)
     assert rules.is_satisfied(ctx) == result
+
+
+def test_attribute_refs():
+    rules_json = {
+        "subject": {"$.uid": {"condition": "Eq", "value": 1.0}},
+        "resource": [{"$.name": {"condition": "Equals", "value": "test"}},
+                     {"$.name": {"condition": "Not",
+                                 "value": {"condition": "EqualsAttribute", "ace": "subject", "path": "$.name"}}},
+                     {"$.owner": {"condition": "AnyOf",
+                                  "values": [{"condition": "Exists"},
+                                             {"condition": "EqualsAttribute", "ace": "context", "path": "$.user"}]}}],
+        "action": {},
+        "context": {"$.ip": {"condition": "CIDR", "value": "127.0.0.1/32"}}
+    }
+    rules = RulesSchema().load(rules_json)
+    assert rules.attribute_refs() == {
+        ("subject", "$.uid"),
+        ("subject", "$.name"),
+        ("resource", "$.name"),
+        ("resource", "$.owner"),
+        ("context", "$.user"),
+        ("context", "$.ip"),
+    }
+
+
+def test_attribute_resolved_once():
+    class CountingProvider(AttributeProvider):
+        calls = 0
+
+        def get_attribute_value(self, ace, attribute_path, ctx):
+            self.calls += 1
+
+    rules_json = {
+        "subject": [{"$.role": {"condition": "AnyOf",
+                                "values": [{"condition": "Equals", "value": "admin"},
+                                           {"condition": "Not", "value": {"condition": "Exists"}}]}},
+                    {"$.role": {"condition": "AllOf",
+                                "values": [{"condition": "NotExists"}, {"condition": "IsEmpty"}]}}],
+        "resource": {"$.owner": {"condition": "EqualsAttribute", "ace": "subject", "path": "$.role"}}
+    }
+    request = AccessRequest.from_json({
+        "subject": {"id": "a", "attributes": {}},
+        "resource": {"id": "a", "attributes": {}},
+        "action": {"id": "", "attributes": {}},
+        "context": {}
+    })
+    provider = CountingProvider()
+    ctx = EvaluationContext(request, [provider])
+    assert RulesSchema().load(rules_json).is_satisfied(ctx)
+    # Missing values are memoized as well
+    assert provider.calls == 2
@@ -0,0 +1,200 @@
+"""
+    String index tests
+"""
+
+import random
+
+import pytest
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+from py_abac.context import EvaluationContext
+from py_abac.pdp import PDP
+from py_abac.policy import Policy
+from py_abac.policy.string_index import StringIndex, StringConditionIndex, ANYWHERE, START, END
+from py_abac.request import AccessRequest
+from py_abac.storage.memory import MemoryStorage
+from py_abac.storage.sql import SQLStorage
+from py_abac.storage.sql.model import Base
+from ..test_storage.test_sql import create_test_sql_engine
+
+PATTERNS = [("", ANYWHERE), ("chrome", ANYWHERE), ("ome", ANYWHERE), ("Mozilla", START), ("moz", START),
+            ("", END), ("36", END), ("Safari/537.36", END), ("bot", ANYWHERE)]
+USER_AGENTS = ["Mozilla/5.0 Chrome/120.0 Safari/537.36", "mozilla/5.0 chrome/120.0", "Googlebot/2.1", "", "36"]
+
+
+def is_found(text, pattern, position):
+    if position == START:
+        return text.startswith(pattern)
+    if position == END:
+        return text.endswith(pattern)
+    return pattern in text
+
+
+def create_request(user_agent):
+    attributes = {} if user_agent is None else {"user_agent": user_agent}
+    return AccessRequest.from_json({
+        "subject": {"id": "user:max", "attributes": attributes},
+        "resource": {"id": "doc:1", "attributes": {}},
+        "action": {"id": "get", "attributes": {}},
+        "context": {}
+    })
+
+
+@pytest.mark.parametrize("text", USER_AGENTS)
+def test_match(text):
+    index = StringIndex()
+    for pattern, position in PATTERNS:
+        index.add(pattern, (pattern, position), position)
+    assert len(index) == len(PATTERNS)
+    assert index.match(text) == {(p, pos) for p, pos in PATTERNS if is_found(text, p, pos)}
+
+
+@pytest.mark.parametrize("count", [10, 500])
+def test_random(count):
+    rnd = random.Random(count)
+    patterns = []
+    index = StringIndex()
+    for key in range(count):
+        pattern = "".join(rnd.choice("abc") for _ in range(rnd.randrange(7)))
+        position = rnd.choice([ANYWHERE, START, END])
+        patterns.append((pattern, position, key))
+        index.add(pattern, key, position)
+    # Patterns searched anywhere are found by the automaton once there are enough of them
+    assert (index.automaton.goto is not None) == (count > 100)
+    for _ in range(300):
+        text = "".join(rnd.choice("abc") for _ in range(rnd.randrange(20)))
+        assert index.match(text) == {key for pattern, position, key in patterns if is_found(text, pattern, position)}
+
+
+def test_remove():
+    index = StringIndex()
+    index.add("bot", "a")
+    index.add("bot", "b")
+    index.add("Google", "c", START)
+    assert index.match("Googlebot") == {"a", "b", "c"}
+    index.remove("bot", "a")
+    index.remove("bot", "a")
+    index.remove("bot", "c", END)
+    index.remove("crawler", "a")
+    assert len(index) == 2
+    assert index.match("Googlebot") == {"b", "c"}
+    index.remove("bot", "b")
+    index.remove("Google", "c", START)
+    assert len(index) == 0
+    assert index.match("Googlebot") == set()
+
+
+def test_invalid_position():
+    with pytest.raises(ValueError):
+        StringIndex().add("bot", "a", "middle")
+
+
+def test_match_strings_memoized():
+    index = StringIndex()
+    index.add("bot", "a")
+    ctx = EvaluationContext(create_request("Googlebot"))
+    matched = ctx.match_strings(index, "Googlebot")
+    assert matched == {"a"}
+    assert ctx.match_strings(index, "Googlebot") is matched
+    # Matches are not reused once the index changes
+    index.add("Google", "b", START)
+    assert ctx.match_strings(index, "Googlebot") == {"a", "b"}
+
+
+def test_condition_index():
+    policy = Policy.from_json({
+        "uid": "1",
+        "effect": "allow",
+        "rules": {
+            "subject": {
+                "$.user_agent": {"condition": "AllOf", "values": [
+                    {"condition": "StartsWith", "value": "MOZILLA", "case_insensitive": True},
+                    {"condition": "NotContains", "value": "bot"},
+                    {"condition": "AnyOf", "values": [{"condition": "Contains", "value": "Chrome"}]}
+                ]}
+            },
+            "resource": [{"$.name": {"condition": "Contains", "value": "doc"}}]
+        },
+        "targets": {},
+        "priority": 0
+    })
+    index = StringConditionIndex()
+    for user_agent, excluded in [("Mozilla/5.0 Chrome", False), ("mozilla/5.0 Firefox", False),
+                                 ("Mozilla/5.0 bot", True), ("Opera/9.8", True), (None, True)]:
+        assert index.excludes(policy, EvaluationContext(create_request(user_agent))) == excluded
+    assert len(index) == 1
+    assert len(index._indices) == 2
+    index.remove("1")
+    index.remove("1")
+    assert len(index) == 0
+    assert all(len(string_index) == 0 for string_index in index._indices.values())
+    # Bulk change notification removes all policies
+    index.add(policy)
+    index.remove(None)
+    assert len(index) == 0
+    assert not index._indices
+    assert index.excludes(policy, EvaluationContext(create_request("Opera/9.8")))
+    assert len(index) == 1
+
+
+def test_with_pdp():
+    storage = MemoryStorage()
+    for uid, condition, value in [("1", "Contains", "Chrome"), ("2", "StartsWith", "Mozilla"), ("3", "EndsWith", "bot")]:
+        storage.add(Policy.from_json({
+            "uid": uid,
+            "effect": "allow",
+            "rules": {"subject": {"$.user_agent": {"condition": condition, "value": value}}},
+            "targets": {},
+            "priority": 0
+        }))
+    pdp = PDP(storage, compiled=True)
+    assert pdp.is_allowed(create_request("Googlebot"))
+    assert not pdp.is_allowed(create_request("Opera/9.8"))
+    assert not pdp.is_allowed(create_request(None))
+    assert len(pdp._string_index) == 3
+
+    # Changed policies are indexed again
+    storage.update(Policy.from_json({
+        "uid": "3",
+        "effect": "allow",
+        "rules": {"subject": {"$.user_agent": {"condition": "Contains", "value": "Opera"}}},
+        "targets": {},
+        "priority": 0
+    }))
+    assert pdp.is_allowed(create_request("Opera/9.8"))
+    assert not pdp.is_allowed(create_request("Googlebot"))
+    storage.delete("3")
+    assert not pdp.is_allowed(create_request("Opera/9.8"))
+    assert len(pdp._string_index) == 2
+
+
+def test_with_pdp_policy_changed_elsewhere():
+    engine = create_test_sql_engine()
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine))
+    storage = SQLStorage(scoped_session=session)
+    # Storage of another process changing the policy without notifying the PDP
+    other_storage = SQLStorage(scoped_session=scoped_session(sessionmaker(bind=engine)))
+    storage.add(Policy.from_json({"uid": "1", "effect": "allow", "rules": {}, "targets": {}, "priority": 0}))
+    deny_json = {
+        "uid": "2",
+        "effect": "deny",
+        "rules": {"subject": {"$.user_agent": {"condition": "Contains", "value": "bot"}}},
+        "targets": {},
+        "priority": 0
+    }
+    storage.add(Policy.from_json(deny_json))
+    pdp = PDP(storage, compiled=True)
+    interpreted_pdp = PDP(storage)
+    requests = [create_request("Googlebot"), create_request("Opera/9.8")]
+    assert [pdp.is_allowed(request) for request in requests] == [False, True]
+
+    deny_json["rules"]["subject"]["$.user_agent"]["value"] = "Opera"
+    other_storage.update(Policy.from_json(deny_json))
+    expected = [interpreted_pdp.is_allowed(request) for request in requests]
+    assert expected == [True, False]
+    assert [pdp.is_allowed(request) for request in requests] == expected
+    # Pattern of the superseded policy is no longer indexed
+    assert sum(len(index) for index in pdp._string_index._indices.values()) == 1
+    Base.metadata.drop_all(engine)
+    session.remove()
@@ -0,0 +1,84 @@
+"""
+    Policy target index tests
+"""
+
+import fnmatch
+import random
+
+import pytest
+
+from py_abac.policy.target_index import PatternIndex, TargetIndex
+from py_abac.policy.targets import TargetsSchema
+
+PATTERNS = ["*", "a", "ab", "a*", "*b", "a*b", "ab*c", "a?c", "?", "??*", "a**", "*a*b*", "a*?*c",
+            "[ab]c", "[!a]*", "x[", "*.txt", "http://example.com/*/users/*", "http://example.com/?/users/1"]
+IDS = ["", "a", "b", "ab", "abc", "abbc", "acb", "axc", "ac", "bc", "cc", "x[", "aab", "file.txt",
+       "http://example.com/1/users/1", "http://example.com/12/users/", "http://example.com/users/1"]
+
+
+@pytest.mark.parametrize("ace_id", IDS)
+def test_pattern_index_match(ace_id):
+    index = PatternIndex()
+    for pattern in PATTERNS:
+        index.add(pattern, pattern)
+    assert index.match(ace_id) == {pattern for pattern in PATTERNS if fnmatch.fnmatch(ace_id, pattern)}
+
+
+def test_pattern_index_random():
+    rnd = random.Random(0)
+    patterns = ["".join(rnd.choice("ab*?") for _ in range(rnd.randrange(1, 6))) for _ in range(200)]
+    index = PatternIndex()
+    for idx, pattern in enumerate(patterns):
+        index.add(pattern, idx)
+    for _ in range(200):
+        ace_id = "".join(rnd.choice("abc") for _ in range(rnd.randrange(8)))
+        expected = {idx for idx, pattern in enumerate(patterns) if fnmatch.fnmatch(ace_id, pattern)}
+        assert index.match(ace_id) == expected
+
+
+def test_pattern_index_remove():
+    index = PatternIndex()
+    for pattern in PATTERNS:
+        index.add(pattern, 1)
+        index.add(pattern, 2)
+    for pattern in PATTERNS:
+        index.remove(pattern, 1)
+    assert index.match("abc") == {2}
+    for pattern in PATTERNS:
+        index.remove(pattern, 2)
+        # Unknown keys and patterns are ignored
+        index.remove(pattern, 3)
+    index.remove("a*x", 2)
+    assert index.match("abc") == set()
+    # Emptied trie nodes are pruned
+    assert index._root.is_empty()
+
+
+def create_targets(targets_json):
+    return TargetsSchema().load(targets_json)
+
+
+def test_target_index():
+    index = TargetIndex()
+    index.add("1", create_targets({}))
+    index.add("2", create_targets({"subject_id": "user:*", "resource_id": ["doc:?", "img:*"]}))
+    index.add("3", create_targets({"subject_id": "user:1", "action_id": "get"}))
+    assert 3 == len(index)
+    assert "2" in index
+    assert index.match("user:1", "doc:1", "get") == {"1", "2", "3"}
+    assert index.match("user:1", "doc:12", "put") == {"1"}
+    assert index.match("user:2", "img:12", "get") == {"1", "2"}
+
+    copied = index.copy()
+    index.add("3", create_targets({"subject_id": "user:2"}))
+    index.remove("1")
+    index.remove("4")
+    assert index.match("user:1", "doc:1", "get") == {"2"}
+    assert index.match("user:2", "", "") == {"3"}
+    assert copied.match("user:1", "doc:1", "get") == {"1", "2", "3"}
+    assert 2 == len(index)
+
+
+def test_target_index_add_error():
+    with pytest.raises(TypeError):
+        TargetIndex().add("1", {"subject_id": "*"})
@@ -2,11 +2,13 @@
     Policy target tests
 """
 
+import fnmatch
+
 import pytest
 from marshmallow import ValidationError
 
 from py_abac.context import EvaluationContext
-from py_abac.policy.targets import Targets, TargetsSchema
+from py_abac.policy.targets import Targets, TargetsSchema, compile_target_pattern
 from py_abac.request import AccessRequest
 
 
@@ -68,3 +70,17 @@ def test_match(targets_json, result):
     ctx = EvaluationContext(request)
     targets = TargetsSchema().load(targets_json)
     assert targets.match(ctx) == result
+
+
+@pytest.mark.parametrize("pattern, ace_id", [
+    ("abc", "abc"),
+    ("abc", "abd"),
+    ("ab*", "abc"),
+    ("a?c", "abc"),
+    ("a?c", "ac"),
+    ("[ab]c", "bc"),
+    ("[!ab]c", "bc"),
+    ("a[", "a["),
+])
+def test_compile_target_pattern(pattern, ace_id):
+    assert compile_target_pattern(pattern)(ace_id) == fnmatch.fnmatch(ace_id, pattern)
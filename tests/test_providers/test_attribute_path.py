@@ -0,0 +1,91 @@
+"""
+    Compiled attribute path tests
+"""
+
+import pytest
+from objectpath import Tree
+
+from py_abac.provider.attribute_path import compile_attribute_path, _parse_simple_path
+
+DATA = {
+    "name": "Max",
+    "email": None,
+    "x-y": 3,
+    "roles": ["admin", "manager"],
+    "empty": [],
+    "address": {"city": "Berlin", "zip": None, "lines": [{"text": "Main St 1"}]},
+    "matrix": [[1, 2], [3]],
+    "level": 5,
+}
+
+
+@pytest.mark.parametrize("path, steps", [
+    ("$.name", ("name",)),
+    ("$.address.city", ("address", "city")),
+    ("$.roles[0]", ("roles", 0)),
+    ("$.roles[-1]", ("roles", -1)),
+    ("$.address.lines[0].text", ("address", "lines", 0, "text")),
+    ("$.matrix[0][1]", ("matrix", 0, 1)),
+    ('$."x-y"', ("x-y",)),
+    ("$", None),
+    ("$..city", None),
+    ("$.address.*", None),
+    ('$.address["city"]', None),
+    ("$.roles[1.0]", None),
+    ("$.roles[@ is 'admin']", None),
+    ("$.t", None),
+    ("$.__class__", None),
+    ("$ss.name", None),
+    (")", None),
+])
+def test_parse_simple_path(path, steps):
+    assert _parse_simple_path(path) == steps
+
+
+@pytest.mark.parametrize("path", [
+    "$.name",
+    "$.email",
+    "$.email.address",
+    '$."x-y"',
+    "$.roles",
+    "$.roles[0]",
+    "$.roles[-1]",
+    "$.roles[5]",
+    "$.roles.name",
+    "$.empty[0]",
+    "$.empty[0].name",
+    "$.address.city",
+    "$.address.zip",
+    "$.address.zip[0]",
+    "$.address.lines[0].text",
+    "$.address.lines[1].text",
+    "$.address[0]",
+    "$.matrix[0][1]",
+    "$.name[0]",
+    "$.name.first",
+    "$.level.value",
+    "$.missing",
+    "$.missing.value[0]",
+    "$..city",
+    "$.roles[@ is 'admin']",
+])
+def test_compiled_path_matches_objectpath(path):
+    expected = Tree(DATA).execute(path)
+    value = compile_attribute_path(path)(DATA)
+    if type(expected).__name__ in ("generator", "chain"):
+        expected, value = list(expected), list(value)
+    assert value == expected
+
+
+def test_compiled_path_returns_data_objects():
+    assert compile_attribute_path("$.address")(DATA) is DATA["address"]
+    assert compile_attribute_path("$.address.lines")(DATA) is DATA["address"]["lines"]
+
+
+def test_compiled_path_is_shared():
+    assert compile_attribute_path("$.address.city") is compile_attribute_path("$.address.city")
+
+
+def test_invalid_path():
+    with pytest.raises(Exception):
+        compile_attribute_path(")")(DATA)
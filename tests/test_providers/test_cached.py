@@ -0,0 +1,189 @@
+"""
+    Caching attribute provider tests
+"""
+
+import threading
+import time
+
+import pytest
+
+from py_abac.context import EvaluationContext
+from py_abac.pdp import PDP
+from py_abac.policy import Policy
+from py_abac.provider.base import AttributeProvider
+from py_abac.provider.cached import CachedAttributeProvider, CachedBulkAttributeProvider
+from py_abac.request import AccessRequest
+from py_abac.storage.memory import MemoryStorage
+
+
+class GroupsProvider(AttributeProvider):
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def get_attribute_value(self, ace, attribute_path, ctx):
+        self.calls += 1
+        time.sleep(self.delay)
+        if ace == "subject" and attribute_path == "$.groups" and ctx.subject_id == "user:max":
+            return ["admin"]
+        return None
+
+
+class FakeTimer(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def create_context(subject_id, **attributes):
+    return EvaluationContext(AccessRequest.from_json({
+        "subject": {"id": subject_id, "attributes": attributes},
+        "resource": {"id": "doc:1", "attributes": {}},
+        "action": {"id": "get", "attributes": {}},
+        "context": {}
+    }))
+
+
+def test_cache_values_per_entity():
+    groups = GroupsProvider()
+    provider = CachedAttributeProvider(groups)
+    assert provider.provider is groups
+
+    for _ in range(3):
+        assert provider.get_attribute_value("subject", "$.groups", create_context("user:max")) == ["admin"]
+    assert groups.calls == 1
+    assert provider.get_attribute_value("subject", "$.groups", create_context("user:nina")) is None
+    assert provider.get_attribute_value("resource", "$.groups", create_context("user:max")) is None
+    assert groups.calls == 3
+    assert len(provider) == 3
+    assert provider.stats() == {
+        "hits": 2, "negative_hits": 0, "misses": 3, "coalesced": 0, "bypassed": 0,
+        "evictions": 0, "size": 3, "maxsize": 1024
+    }
+
+
+def test_negative_caching():
+    groups = GroupsProvider()
+    provider = CachedAttributeProvider(groups)
+    for _ in range(3):
+        assert provider.get_attribute_value("subject", "$.groups", create_context("user:nina")) is None
+    assert groups.calls == 1
+    assert provider.stats()["negative_hits"] == 2
+
+    groups = GroupsProvider()
+    provider = CachedAttributeProvider(groups, cache_none=False)
+    for _ in range(3):
+        assert provider.get_attribute_value("subject", "$.groups", create_context("user:nina")) is None
+    assert groups.calls == 3
+
+
+def test_context_attributes_bypass_cache():
+    groups = GroupsProvider()
+    provider = CachedAttributeProvider(groups)
+    for _ in range(2):
+        assert provider.get_attribute_value("context", "$.groups", create_context("user:max")) is None
+    assert groups.calls == 2
+    assert provider.stats()["bypassed"] == 2
+
+
+def test_custom_key():
+    groups = GroupsProvider()
+    provider = CachedAttributeProvider(
+        groups, key=lambda ace, path, ctx: (ace, path, ctx.get_attribute_value("subject", "$.tenant"))
+    )
+    provider.get_attribute_value("subject", "$.groups", create_context("user:max", tenant=1))
+    provider.get_attribute_value("subject", "$.groups", create_context("user:nina", tenant=1))
+    provider.get_attribute_value("subject", "$.groups", create_context("user:max", tenant=2))
+    assert groups.calls == 2
+
+
+def test_ttl_and_eviction():
+    timer = FakeTimer()
+    groups = GroupsProvider()
+    provider = CachedAttributeProvider(groups, maxsize=2, ttl=10, timer=timer)
+    ctx = create_context("user:max")
+    provider.get_attribute_value("subject", "$.groups", ctx)
+    timer.now = 5
+    provider.get_attribute_value("subject", "$.groups", ctx)
+    assert groups.calls == 1
+    timer.now = 11
+    provider.get_attribute_value("subject", "$.groups", ctx)
+    assert groups.calls == 2
+
+    provider.get_attribute_value("subject", "$.a", ctx)
+    provider.get_attribute_value("subject", "$.b", ctx)
+    assert len(provider) == 2
+    assert provider.stats()["evictions"] == 1
+
+    provider.clear()
+    assert len(provider) == 0
+
+
+def test_stampede_protection():
+    groups = GroupsProvider(delay=0.05)
+    provider = CachedAttributeProvider(groups)
+    results = []
+
+    def lookup():
+        results.append(provider.get_attribute_value("subject", "$.groups", create_context("user:max")))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [["admin"]] * 8
+    assert groups.calls == 1
+    assert provider.stats()["misses"] == 1
+    assert provider.stats()["hits"] + provider.stats()["coalesced"] == 7
+
+
+def test_provider_errors_not_cached():
+    class FailingProvider(AttributeProvider):
+        calls = 0
+
+        def get_attribute_value(self, ace, attribute_path, ctx):
+            self.calls += 1
+            raise ValueError()
+
+    failing = FailingProvider()
+    provider = CachedAttributeProvider(failing)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            provider.get_attribute_value("subject", "$.groups", create_context("user:max"))
+    assert failing.calls == 2
+    assert len(provider) == 0
+
+
+def test_with_pdp():
+    storage = MemoryStorage()
+    storage.add(Policy.from_json({
+        "uid": "1",
+        "effect": "allow",
+        "rules": {"subject": {"$.groups": {"condition": "AnyIn", "values": ["admin"]}}},
+        "targets": {},
+        "priority": 0
+    }))
+    groups = GroupsProvider()
+    pdp = PDP(storage, providers=[CachedAttributeProvider(groups)])
+    for subject_id, allowed in [("user:max", True), ("user:nina", False)] * 3:
+        request = AccessRequest.from_json({
+            "subject": {"id": subject_id, "attributes": {}},
+            "resource": {"id": "doc:1", "attributes": {}},
+            "action": {"id": "get", "attributes": {}},
+            "context": {}
+        })
+        assert pdp.is_allowed(request) == allowed
+    assert groups.calls == 2
+
+
+def test_create_with_invalid_provider():
+    with pytest.raises(TypeError):
+        CachedAttributeProvider(object())
+    # Bulk wrapper requires bulk attribute provider
+    with pytest.raises(TypeError):
+        CachedBulkAttributeProvider(GroupsProvider())
@@ -0,0 +1,208 @@
+"""
+    Circuit breaking attribute provider tests
+"""
+
+import pytest
+
+from py_abac.context import EvaluationContext
+from py_abac.instrumentation import DecisionStats
+from py_abac.pdp import PDP
+from py_abac.policy import Policy
+from py_abac.provider.base import AttributeProvider
+from py_abac.provider.circuit_breaker import CircuitBreakerProvider, CircuitBreakerBulkProvider
+from py_abac.request import AccessRequest
+from py_abac.storage.memory import MemoryStorage
+from ..test_pdp.test_pdp_instrumentation import RecordingInstrument
+
+
+class FakeTimer(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyProvider(AttributeProvider):
+
+    def __init__(self, timer):
+        self.timer = timer
+        self.calls = 0
+        self.failing = False
+        self.delay = 0.0
+
+    def get_attribute_value(self, ace, attribute_path, ctx):
+        self.calls += 1
+        self.timer.now += self.delay
+        if self.failing:
+            raise ConnectionError()
+        return "IT"
+
+
+def create_request():
+    return AccessRequest.from_json({
+        "subject": {"id": "user:max", "attributes": {}},
+        "resource": {"id": "doc:1", "attributes": {}},
+        "action": {"id": "get", "attributes": {}},
+        "context": {}
+    })
+
+
+def create_context():
+    return EvaluationContext(create_request(), stats=DecisionStats(create_request()))
+
+
+def lookup(provider, ctx=None):
+    return provider.get_attribute_value("subject", "$.department", ctx or create_context())
+
+
+def test_circuit_opens_and_recovers():
+    timer = FakeTimer()
+    flaky = FlakyProvider(timer)
+    provider = CircuitBreakerProvider(
+        flaky, failure_threshold=0.5, window_size=4, min_calls=4, recovery_timeout=10, default="none", timer=timer
+    )
+    assert provider.provider is flaky
+    assert lookup(provider) == "IT"
+    flaky.failing = True
+    # Failures return the default value until the failure rate reaches threshold
+    assert [lookup(provider) for _ in range(3)] == ["none"] * 3
+    assert provider.state == "open"
+    assert flaky.calls == 4
+
+    # Open circuit skips the provider
+    ctx = create_context()
+    assert lookup(provider, ctx) == "none"
+    assert flaky.calls == 4
+    assert ctx.stats.short_circuits == {"FlakyProvider": 1}
+
+    # Failed probe opens circuit again
+    timer.now += 10
+    assert provider.state == "half_open"
+    assert lookup(provider) == "none"
+    assert flaky.calls == 5
+    assert provider.state == "open"
+
+    # Successful probe closes circuit
+    flaky.failing = False
+    timer.now += 10
+    assert lookup(provider) == "IT"
+    assert provider.state == "closed"
+    assert provider.stats() == {
+        "state": "closed", "calls": 6, "failures": 4, "slow_calls": 0, "short_circuits": 1, "opened": 2,
+        "failure_rate": 0.0, "mean_duration": 0.0
+    }
+
+
+def test_min_calls():
+    timer = FakeTimer()
+    flaky = FlakyProvider(timer)
+    flaky.failing = True
+    provider = CircuitBreakerProvider(flaky, window_size=10, min_calls=5, timer=timer)
+    ctx = create_context()
+    for _ in range(4):
+        assert lookup(provider, ctx) is None
+    assert provider.state == "closed"
+    assert ctx.stats.provider_failures == {"FlakyProvider": 4}
+    lookup(provider)
+    assert provider.state == "open"
+
+
+def test_slow_calls():
+    timer = FakeTimer()
+    flaky = FlakyProvider(timer)
+    flaky.delay = 1.0
+    provider = CircuitBreakerProvider(flaky, window_size=2, min_calls=2, slow_call_duration=0.5, timer=timer)
+    # Values of slow calls are returned while they count as failures
+    assert lookup(provider) == "IT"
+    assert lookup(provider) == "IT"
+    assert provider.state == "open"
+    assert provider.stats()["slow_calls"] == 2
+    assert provider.stats()["mean_duration"] == 0.0
+
+
+def test_half_open_single_probe():
+    timer = FakeTimer()
+
+    class ProbingProvider(FlakyProvider):
+        def get_attribute_value(self, ace, attribute_path, ctx):
+            if not self.failing:
+                # Lookup made while the probe is in flight is skipped
+                nested.append(lookup(provider))
+            return super().get_attribute_value(ace, attribute_path, ctx)
+
+    nested = []
+    probing = ProbingProvider(timer)
+    probing.failing = True
+    provider = CircuitBreakerProvider(probing, window_size=1, min_calls=1, recovery_timeout=1, timer=timer)
+    lookup(provider)
+    assert provider.state == "open"
+    timer.now += 1
+    probing.failing = False
+    assert lookup(provider) == "IT"
+    assert nested == [None]
+    assert probing.calls == 2
+    assert provider.stats()["short_circuits"] == 1
+
+
+def test_interrupted_probe():
+    timer = FakeTimer()
+    flaky = FlakyProvider(timer)
+    flaky.failing = True
+    provider = CircuitBreakerProvider(flaky, window_size=1, min_calls=1, recovery_timeout=1, timer=timer)
+    lookup(provider)
+    timer.now += 1
+
+    def interrupt(*_):
+        raise KeyboardInterrupt()
+
+    flaky.get_attribute_value = interrupt
+    with pytest.raises(KeyboardInterrupt):
+        lookup(provider)
+    # Next lookup probes again
+    del flaky.get_attribute_value
+    flaky.failing = False
+    assert lookup(provider) == "IT"
+    assert provider.state == "closed"
+
+
+def test_with_pdp():
+    storage = MemoryStorage()
+    storage.add(Policy.from_json({
+        "uid": "1",
+        "effect": "allow",
+        "rules": {"subject": {"$.department": {"condition": "Equals", "value": "IT"}}},
+        "targets": {},
+        "priority": 0
+    }))
+    timer = FakeTimer()
+    flaky = FlakyProvider(timer)
+    flaky.failing = True
+    instrument = RecordingInstrument()
+    provider = CircuitBreakerProvider(flaky, window_size=2, min_calls=2, timer=timer)
+    pdp = PDP(storage, providers=[provider], instrument=instrument)
+    for _ in range(3):
+        assert not pdp.is_allowed(create_request())
+    assert flaky.calls == 2
+    assert [stats.to_dict()["provider_failures"] for stats in instrument.stats] == \
+           [{"FlakyProvider": 1}, {"FlakyProvider": 1}, {}]
+    assert instrument.stats[-1].to_dict()["short_circuits"] == {"FlakyProvider": 1}
+
+
+@pytest.mark.parametrize("kwargs, error", [
+    ({"provider": object()}, TypeError),
+    ({"failure_threshold": 0}, ValueError),
+    ({"failure_threshold": 1.5}, ValueError),
+    ({"window_size": 0}, ValueError),
+    ({"window_size": 5, "min_calls": 6}, ValueError),
+])
+def test_create_error(kwargs, error):
+    kwargs.setdefault("provider", FlakyProvider(FakeTimer()))
+    with pytest.raises(error):
+        CircuitBreakerProvider(**kwargs)
+
+
+def test_create_bulk_with_invalid_provider():
+    with pytest.raises(TypeError):
+        CircuitBreakerBulkProvider(FlakyProvider(FakeTimer()))
@@ -100,3 +100,35 @@ def test_invalid_attribute_path_error():
     provider = RequestAttributeProvider(request)
     with pytest.raises(InvalidAttributePathError):
         provider.get_attribute_value("subject", ")", ctx)
+
+
+def test_lazy_element_creation():
+    request = AccessRequest.from_json({
+        "subject": {"id": "a", "attributes": {"firstName": "Carl"}},
+        "resource": {"id": "a", "attributes": {"name": "Calendar"}},
+        "action": {"id": "", "attributes": {}},
+        "context": {}
+    })
+    # Counters are disabled by default
+    RequestAttributeProvider(request).get_attribute_value("subject", "$.firstName", EvaluationContext(request))
+    assert RequestAttributeProvider.counters() == {"providers": 0, "elements": 0, "elements_skipped": 0}
+
+    RequestAttributeProvider.enable_counters()
+    provider = RequestAttributeProvider(request)
+    assert RequestAttributeProvider.counters() == {"providers": 1, "elements": 0, "elements_skipped": 4}
+
+    ctx = EvaluationContext(request)
+    assert provider.get_attribute_value("subject", "$.firstName", ctx) == "Carl"
+    assert provider.get_attribute_value("subject", "$.lastName", ctx) is None
+    assert RequestAttributeProvider.counters() == {"providers": 1, "elements": 1, "elements_skipped": 3}
+
+    # Evaluation context creates its request provider on first attribute lookup
+    assert RequestAttributeProvider.counters()["providers"] == 1
+    assert ctx.get_attribute_value("resource", "$.name") == "Calendar"
+    assert RequestAttributeProvider.counters() == {"providers": 2, "elements": 2, "elements_skipped": 6}
+
+    RequestAttributeProvider.reset_counters()
+    assert RequestAttributeProvider.counters() == {"providers": 0, "elements": 0, "elements_skipped": 0}
+    RequestAttributeProvider.enable_counters(False)
+    RequestAttributeProvider(request)
+    assert RequestAttributeProvider.counters()["providers"] == 0
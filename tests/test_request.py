@@ -2,10 +2,31 @@
     Unit test for authorization request
 """
 
+import pickle
+
 import pytest
+from marshmallow import Schema, fields, validate, ValidationError
 
 from py_abac.exceptions import RequestCreateError
-from py_abac.request import AccessRequest, Request
+from py_abac.request import AccessRequest, AttributePool, Request
+
+
+class _AccessElementSchema(Schema):
+    """
+        JSON schema for access element
+    """
+    id = fields.String(required=True, validate=validate.Length(max=400))
+    attributes = fields.Dict(default={}, missing={})
+
+
+class _RequestSchema(Schema):
+    """
+        Reference JSON schema of access request validation
+    """
+    subject = fields.Nested(_AccessElementSchema, required=True)
+    resource = fields.Nested(_AccessElementSchema, required=True)
+    action = fields.Nested(_AccessElementSchema, required=True)
+    context = fields.Dict(default={}, missing={})
 
 
 def test_create():
@@ -146,3 +167,115 @@ def test_create():
 def test_create_error(request_json):
     with pytest.raises(RequestCreateError):
         AccessRequest.from_json(request_json)
+
+
+def create_request_json(subject_attributes, context=None):
+    return {
+        "subject": {"id": "a", "attributes": subject_attributes},
+        "resource": {"id": "b", "attributes": {"name": "Calendar"}},
+        "action": {"id": "c", "attributes": {}},
+        "context": context or {}
+    }
+
+
+def test_immutable():
+    request = AccessRequest.from_json(create_request_json({"name": "Carl"}))
+    with pytest.raises(AttributeError):
+        request._subject_id = "b"
+    with pytest.raises(AttributeError):
+        request.subject_id = "b"
+    with pytest.raises(AttributeError):
+        del request._subject
+    with pytest.raises(AttributeError):
+        request.other = 1
+    assert not hasattr(request, "__dict__")
+
+    copy = pickle.loads(pickle.dumps(request))
+    assert copy.subject_id == "a" and copy.subject == {"name": "Carl"}
+    assert copy.fingerprint == request.fingerprint
+
+
+def test_fingerprint():
+    request = AccessRequest.from_json(create_request_json({"x": 1, "y": {"b": 2, "a": 1}}))
+    same = AccessRequest.from_json(create_request_json({"y": {"a": 1, "b": 2}, "x": 1}))
+    assert request.fingerprint == same.fingerprint
+    assert request.fingerprint is request.fingerprint
+    assert isinstance(request.fingerprint, str)
+
+    for subject_attributes, context in [
+        ({"x": 1.0, "y": {"b": 2, "a": 1}}, None),
+        ({"x": True, "y": {"b": 2, "a": 1}}, None),
+        ({"x": 1, "y": {"b": 2, "a": [1]}}, None),
+        ({"x": 1, "y": {"b": 2, "a": 1}}, {"ip": "127.0.0.1"}),
+    ]:
+        other = AccessRequest.from_json(create_request_json(subject_attributes, context))
+        assert other.fingerprint != request.fingerprint
+
+    request = AccessRequest({"id": "a", "attributes": {"x": object()}}, {"id": "b"}, {"id": "c"}, {})
+    assert request.fingerprint is None
+
+
+def test_attribute_pool():
+    pool = AttributePool(maxsize=2)
+    first = AccessRequest.from_json(create_request_json({"x": 1, "y": [1, 2]}), pool=pool)
+    second = AccessRequest.from_json(create_request_json({"y": [1, 2], "x": 1}), pool=pool)
+    assert second.subject is first.subject
+    assert second.resource is first.resource
+    assert len(pool) == 2
+    assert pool.hits == 2 and pool.misses == 2
+    # Pooled requests have the same fingerprint as those created without pool
+    assert first.fingerprint == AccessRequest.from_json(create_request_json({"x": 1, "y": [1, 2]})).fingerprint
+
+    # Least recently used attributes are evicted
+    third = AccessRequest.from_json(create_request_json({"x": 2}), pool=pool)
+    assert len(pool) == 2
+    assert AccessRequest.from_json(create_request_json({"x": 1, "y": [1, 2]}), pool=pool).subject is not first.subject
+
+    unserializable = {"x": object()}
+    request = AccessRequest({"id": "a", "attributes": unserializable}, {"id": "b"}, {"id": "c"}, {}, pool=pool)
+    assert request.subject is unserializable
+    assert request.fingerprint is None
+    assert third.fingerprint is not None
+
+    pool.clear()
+    assert len(pool) == 0
+    with pytest.raises(ValueError):
+        AttributePool(maxsize=0)
+
+
+@pytest.mark.parametrize("request_json", [
+    None,
+    [],
+    {},
+    create_request_json({"name": "Carl"}),
+    {"subject": {"id": b"a"}, "resource": {"id": "b", "attributes": {}}, "action": {"id": ""}},
+    {"subject": None, "resource": 1, "action": {"id": b"\xff", "x": 1, "attributes": None}, "context": [],
+     "extra": 1},
+    {"subject": {"id": "a" * 401, "attributes": []}, "resource": {}, "action": {"id": 1}},
+    {"subject": {"id": "a" * 400}, "resource": {"id": None}, "action": {"id": "c"}, "context": None},
+])
+def test_validation_matches_schema(request_json):
+    try:
+        expected = _RequestSchema().load(request_json)
+    except ValidationError as err:
+        with pytest.raises(RequestCreateError) as exc_info:
+            AccessRequest.from_json(request_json)
+        assert exc_info.value.args == err.args
+    else:
+        request = AccessRequest.from_json(request_json)
+        assert request.subject_id == expected["subject"]["id"]
+        assert request.subject == expected["subject"]["attributes"]
+        assert request.resource == expected["resource"]["attributes"]
+        assert request.context == expected["context"]
+
+
+def test_create_trusted():
+    request_json = create_request_json({"name": "Carl"})
+    request = AccessRequest.from_json(request_json, trusted=True)
+    assert request.subject_id == "a"
+    assert request.subject is request_json["subject"]["attributes"]
+    assert request.fingerprint == AccessRequest.from_json(request_json).fingerprint
+
+    request = AccessRequest.from_json({"subject": {}, "resource": {}, "action": {"id": "c"}}, trusted=True)
+    assert request.subject_id == "" and request.action_id == "c"
+    assert request.subject == {} and request.context == {}
@@ -0,0 +1,247 @@
+"""
+    In-Memory storage tests
+"""
+
+import threading
+import uuid
+
+import pytest
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+from py_abac.context import EvaluationContext
+from py_abac.exceptions import PolicyExistsError
+from py_abac.pdp import PDP, EvaluationAlgorithm
+from py_abac.policy import Policy
+from py_abac.request import AccessRequest
+from py_abac.storage import MemoryStorage
+from py_abac.storage.sql import SQLStorage
+from py_abac.storage.sql.model import Base
+from ..test_sql import create_test_sql_engine
+from ...test_pdp.test_pdp_batch import create_requests
+from ...test_pdp.test_pdp_with_sql import POLICIES, EmailsAttributeProvider
+
+
+@pytest.fixture
+def st():
+    return MemoryStorage()
+
+
+@pytest.fixture
+def sql_storage():
+    engine = create_test_sql_engine()
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine))
+    yield SQLStorage(scoped_session=session)
+    Base.metadata.drop_all(engine)
+    session.remove()
+
+
+def test_add(st):
+    policy = Policy.from_json({
+        "uid": "1",
+        "description": "Policy create test 1",
+        "rules": {"action": [{"$.method": {"condition": "Equals", "value": "GET"}},
+                             {"$.method": {"condition": "Equals", "value": "POST"}}]},
+        "targets": {"subject_id": ["abc", "a*"], "resource_id": ["123"], "action_id": "*"},
+        "effect": "deny"
+    })
+    st.add(policy)
+    assert "1" == st.get("1").uid
+    assert "Policy create test 1" == st.get("1").description
+    assert 2 == len(st.get("1").rules.action)
+    assert ["abc", "a*"] == st.get("1").targets.subject_id
+    assert 1 == len(st)
+
+    # Changes to added policy do not bypass the storage
+    policy.targets.subject_id = "xyz"
+    assert ["abc", "a*"] == st.get("1").targets.subject_id
+    assert 1 == len(list(st.get_for_target("abc", "123", "get")))
+
+
+def test_policy_create_existing(st):
+    st.add(Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "deny"}))
+    with pytest.raises(PolicyExistsError):
+        st.add(Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "deny"}))
+
+
+def test_get(st):
+    st.add(Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "deny"}))
+    st.add(Policy.from_json({"uid": "2", "description": "some text", "rules": {}, "targets": {}, "effect": "deny"}))
+    assert isinstance(st.get("1"), Policy)
+    assert "1" == st.get("1").uid
+    assert "some text" == st.get("2").description
+    assert st.get("3") is None
+
+
+@pytest.mark.parametrize("limit, offset, result", [
+    (500, 0, 200),
+    (101, 1, 101),
+    (200, 50, 150),
+    (0, 0, 0),
+    (5, 4, 5),
+    (200, 300, 0),
+])
+def test_get_all(st, limit, offset, result):
+    for i in range(200):
+        st.add(Policy.from_json({"uid": str(i), "rules": {}, "targets": {}, "effect": "deny"}))
+    policies = list(st.get_all(limit, offset))
+    assert result == len(policies)
+    assert [str(i) for i in range(offset, offset + result)] == [policy.uid for policy in policies]
+
+
+def test_get_all_with_incorrect_args(st):
+    with pytest.raises(ValueError) as e:
+        list(st.get_all(-1, 90))
+    assert "Limit can't be negative" == str(e.value)
+
+    with pytest.raises(ValueError) as e:
+        list(st.get_all(0, -34))
+    assert "Offset can't be negative" == str(e.value)
+
+
+@pytest.mark.parametrize("subject_id, resource_id, action_id, uids", [
+    ("a", str(uuid.uuid4()), str(uuid.uuid4()), ["1"]),
+    ("ab", str(uuid.uuid4()), str(uuid.uuid4()), ["1", "2", "3"]),
+    ("abc", str(uuid.uuid4()), str(uuid.uuid4()), ["1", "2", "4"]),
+    ("acb", str(uuid.uuid4()), str(uuid.uuid4()), ["1", "3"]),
+    ("axc", str(uuid.uuid4()), str(uuid.uuid4()), ["1"]),
+    ("ab", "doc:1", "get", ["1", "2", "3", "5"]),
+    ("ab", "doc:10", "get", ["1", "2", "3"]),
+    ("x", "doc:1", "put", ["1", "5"]),
+    ("x", "doc:1", "delete", ["1"]),
+    ("x", "doc:2", "get", ["1", "5", "6"]),
+    ("y", "doc:20", "get", ["1"]),
+])
+def test_find_for_target(st, subject_id, resource_id, action_id, uids):
+    st.add(Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "deny"}))
+    st.add(Policy.from_json({"uid": "2", "rules": {}, "targets": {"subject_id": "ab*"}, "effect": "deny"}))
+    st.add(Policy.from_json({"uid": "3", "rules": {}, "targets": {"subject_id": "a*b"}, "effect": "deny"}))
+    st.add(Policy.from_json({"uid": "4", "rules": {}, "targets": {"subject_id": "ab*c"}, "effect": "deny"}))
+    st.add(Policy.from_json({"uid": "5", "rules": {},
+                             "targets": {"resource_id": "doc:?", "action_id": ["get", "put"]},
+                             "effect": "deny"}))
+    st.add(Policy.from_json({"uid": "6", "rules": {},
+                             "targets": {"subject_id": ["x", "[z]"], "resource_id": "doc:2", "action_id": "get"},
+                             "effect": "deny"}))
+
+    found = st.get_for_target(subject_id, resource_id, action_id)
+    assert uids == [policy.uid for policy in found]
+    # Same policies as matched by targets of all policies
+    request = AccessRequest.from_json({
+        "subject": {"id": subject_id}, "resource": {"id": resource_id}, "action": {"id": action_id}
+    })
+    ctx = EvaluationContext(request)
+    assert uids == [policy.uid for policy in st.get_all(100, 0) if policy.targets.match(ctx)]
+
+
+def test_get_for_target_ordered(st):
+    st.add(Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "allow", "priority": 1}))
+    st.add(Policy.from_json({"uid": "2", "rules": {}, "targets": {"subject_id": "a*"}, "effect": "deny",
+                             "priority": 1}))
+    st.add(Policy.from_json({"uid": "3", "rules": {}, "targets": {}, "effect": "allow", "priority": 2}))
+    st.add(Policy.from_json({"uid": "4", "rules": {}, "targets": {"subject_id": "b"}, "effect": "deny"}))
+    assert ["3", "2", "1"] == [policy.uid for policy in st.get_for_target_ordered("a", "", "")]
+
+
+def test_update(st):
+    policy = Policy.from_json({"uid": "1", "rules": {}, "targets": {"subject_id": "a"}, "effect": "deny"})
+    # Test update before insert
+    st.update(policy)
+    assert st.get(policy.uid) is None
+    st.add(policy)
+    assert "" == st.get("1").description
+    policy.description = "foo"
+    policy.targets.subject_id = "b*"
+    st.update(policy)
+    assert "foo" == st.get("1").description
+    # Target index follows the update
+    assert [] == list(st.get_for_target("a", "", ""))
+    assert ["1"] == [policy.uid for policy in st.get_for_target("bc", "", "")]
+    assert 1 == len(st)
+
+
+def test_delete(st):
+    policy = Policy.from_json({"uid": "1", "rules": {}, "targets": {"subject_id": "a*"}, "effect": "deny"})
+    # Test non-existing
+    st.delete("1")
+    assert None is st.get("1")
+    st.add(policy)
+    assert "1" == st.get("1").uid
+    st.delete("1")
+    assert None is st.get("1")
+    assert [] == list(st.get_for_target("a", "", ""))
+    assert 0 == len(st)
+
+
+def test_change_notifications(st):
+    changes = []
+    st.subscribe(changes.append)
+    policy = Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "deny"})
+    st.add(policy)
+    st.update(policy)
+    st.delete("1")
+    assert ["1", "1", "1"] == changes
+    # Nothing changed
+    st.update(policy)
+    st.delete("1")
+    assert ["1", "1", "1"] == changes
+
+
+def test_load(st, sql_storage):
+    for policy_json in POLICIES:
+        sql_storage.add(Policy.from_json(policy_json))
+    st.add(Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "deny"}))
+    changes = []
+    st.subscribe(changes.append)
+    st.load(sql_storage, batch_size=2)
+    assert len(POLICIES) == len(st)
+    assert [None] == changes
+    # Nothing to load
+    st.load(MemoryStorage())
+    assert [None] == changes
+    # Loaded policy replaces existing one
+    assert POLICIES[0]["effect"] == st.get("1").effect
+
+    for algorithm in EvaluationAlgorithm:
+        sql_pdp = PDP(sql_storage, algorithm, [EmailsAttributeProvider()])
+        memory_pdp = PDP(st, algorithm, [EmailsAttributeProvider()])
+        requests = create_requests()
+        assert [sql_pdp.is_allowed(request) for request in requests] == memory_pdp.is_allowed_many(requests)
+
+
+def test_load_error(st):
+    with pytest.raises(TypeError):
+        st.load(None)
+    with pytest.raises(ValueError):
+        st.load(MemoryStorage(), batch_size=0)
+
+
+def test_concurrent_reads_and_writes(st):
+    for i in range(50):
+        st.add(Policy.from_json({"uid": str(i), "rules": {}, "targets": {"subject_id": "user:*"},
+                                 "effect": "deny"}))
+    errors = []
+
+    def read():
+        try:
+            for _ in range(200):
+                found = list(st.get_for_target("user:1", "", ""))
+                assert len(found) >= 50
+                assert all(policy is not None for policy in found)
+        except Exception as error:  # pragma: no cover
+            errors.append(error)
+
+    def write(offset):
+        for i in range(offset, offset + 50):
+            st.add(Policy.from_json({"uid": str(i), "rules": {}, "targets": {"subject_id": "user:*"},
+                                     "effect": "deny"}))
+            st.delete(str(i))
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    threads += [threading.Thread(target=write, args=(offset,)) for offset in (100, 200)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert 50 == len(st)
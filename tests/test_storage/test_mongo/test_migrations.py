@@ -5,7 +5,9 @@
 import pytest
 
 from py_abac.storage.mongo import MongoStorage
-from py_abac.storage.mongo.migrations import MongoMigrationSet, MongoMigration0To0x2x0
+from py_abac.cache import PolicyCache
+from py_abac.policy import Policy
+from py_abac.storage.mongo.migrations import MongoMigrationSet, MongoMigration0To0x2x0, MongoMigration0x2x0To0x4x0
 from . import create_client
 
 DB_NAME = 'db_test'
@@ -38,9 +40,9 @@ class TestMongoMigrationSet:
     def test_up_and_down(self, migration_set):
         migration_set.save_applied_number(0)
         migration_set.up()
-        assert 1 == migration_set.last_applied()
+        assert 2 == migration_set.last_applied()
         migration_set.up()
-        assert 1 == migration_set.last_applied()
+        assert 2 == migration_set.last_applied()
         migration_set.down()
         assert 0 == migration_set.last_applied()
         migration_set.down()
@@ -78,3 +80,31 @@ class TestMongoMigration0To0x2x0:
         assert 'tags_action_id_idx' not in index_info
         assert 'tags_subject_id_idx' not in index_info
         assert 'tags_resource_id_idx' not in index_info
+
+
+class TestMongoMigration0x2x0To0x4x0:
+
+    @pytest.fixture
+    def storage(self, client):
+        yield MongoStorage(client, DB_NAME, collection=COLLECTION)
+        client[DB_NAME][COLLECTION].drop()
+        client.close()
+
+    @pytest.fixture
+    def migration(self, storage):
+        yield MongoMigration0x2x0To0x4x0(storage)
+
+    def test_order(self, migration):
+        assert 2 == migration.order
+
+    def test_up_and_down(self, migration, storage):
+        policy = Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "allow", "priority": 2})
+        storage.add(policy)
+        migration.down()
+        doc = storage.collection.find_one("1")
+        assert "version" not in doc and "priority" not in doc and "is_allowed" not in doc
+        migration.up()
+        doc = storage.collection.find_one("1")
+        assert PolicyCache.version(policy.to_json()) == doc["version"]
+        assert 2 == doc["priority"]
+        assert doc["is_allowed"] is True
@@ -6,6 +6,7 @@ import json
 
 import pytest
 
+from py_abac.cache import PolicyCache
 from py_abac.policy import Policy
 from py_abac.storage.mongo.model import PolicyModel
 
@@ -32,6 +33,9 @@ def test_from_policy():
     assert isinstance(model.tags, dict)
     assert model.policy_str == json.dumps(policy.to_json())
     assert model._id == policy.uid
+    assert model.version == PolicyCache.version(policy.to_json())
+    assert model.priority == 0
+    assert model.is_allowed is False
     assert model.tags == {"subject": [{"id": ["user::b90b2998-9e1b-4ac5-a743-b060b2634dbb"]}],
                           "resource": [{"id": ["*"]}],
                           "action": [{"id": ["*"]}]}
@@ -96,7 +100,8 @@ def test_to_doc():
         "effect": "deny"
     }
     policy = Policy.from_json(policy_json)
-    policy_doc = {"_id": policy.uid, "policy_str": json.dumps(policy.to_json()), "tags": {}}
+    policy_doc = {"_id": policy.uid, "policy_str": json.dumps(policy.to_json()), "tags": {}, "version": "1",
+                  "priority": 0, "is_allowed": False}
     model = PolicyModel.from_doc(policy_doc)
     new_policy_doc = model.to_doc()
     assert policy_doc == new_policy_doc
@@ -6,6 +6,7 @@ import uuid
 
 import pytest
 
+from py_abac.cache import PolicyCache
 from py_abac.exceptions import PolicyExistsError
 from py_abac.policy import Policy
 from py_abac.policy.conditions.numeric import Eq
@@ -217,3 +218,47 @@ def test_delete(st):
     assert '1' == st.get('1').uid
     st.delete('1')
     assert None is st.get('1')
+
+
+def test_policy_cache(st):
+    policy_cache = PolicyCache()
+    st.policy_cache = policy_cache
+    st.add(Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "deny"}))
+    st.add(Policy.from_json({"uid": "2", "rules": {}, "targets": {"subject_id": "a*"}, "effect": "deny"}))
+    st.add(Policy.from_json({"uid": "3", "rules": {}, "targets": {"subject_id": "b"}, "effect": "deny"}))
+
+    found = sorted(st.get_for_target("ab", "", ""), key=lambda x: x.uid)
+    assert ["1", "2"] == [policy.uid for policy in found]
+    assert 2 == len(policy_cache)
+    # Unchanged policies are reused
+    found_again = sorted(st.get_for_target("ab", "", ""), key=lambda x: x.uid)
+    assert found[0] is found_again[0] and found[1] is found_again[1]
+    assert 2 == policy_cache.hits
+
+    # Updated policy gets built again
+    st.update(Policy.from_json({"uid": "2", "description": "foo", "rules": {}, "targets": {"subject_id": "a*"},
+                                "effect": "deny"}))
+    found_again = sorted(st.get_for_target("ab", "", ""), key=lambda x: x.uid)
+    assert found[0] is found_again[0]
+    assert found[1] is not found_again[1]
+    assert "foo" == found_again[1].description
+
+    # Deleted policy no longer retrieved
+    st.delete("1")
+    assert ["2"] == [policy.uid for policy in st.get_for_target("ab", "", "")]
+
+
+@pytest.mark.parametrize("policy_cache", [None, PolicyCache()])
+def test_get_for_target_ordered(st, policy_cache):
+    st.policy_cache = policy_cache
+    st.add(Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "allow"}))
+    st.add(Policy.from_json({"uid": "2", "rules": {}, "targets": {}, "effect": "deny"}))
+    st.add(Policy.from_json({"uid": "3", "rules": {}, "targets": {}, "effect": "allow", "priority": 5}))
+    st.add(Policy.from_json({"uid": "4", "rules": {}, "targets": {}, "effect": "deny", "priority": 1}))
+    st.add(Policy.from_json({"uid": "5", "rules": {}, "targets": {"subject_id": "b"}, "effect": "deny"}))
+    assert ["3", "4", "2", "1"] == [policy.uid for policy in st.get_for_target_ordered("a", "", "")]
+
+
+def test_create_with_policy_cache_error(st):
+    with pytest.raises(TypeError):
+        MongoStorage(st.client, DB_NAME, COLLECTION, policy_cache={})
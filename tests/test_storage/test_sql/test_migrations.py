@@ -1,8 +1,11 @@
 import pytest
+from sqlalchemy import inspect
 from sqlalchemy.orm import sessionmaker, scoped_session
 
+from py_abac.cache import PolicyCache
+from py_abac.policy import Policy
 from py_abac.storage.sql import SQLStorage
-from py_abac.storage.sql.migrations import SQLMigrationSet, Migration0To0x2x1
+from py_abac.storage.sql.migrations import SQLMigrationSet, Migration0To0x2x1, Migration0x2x1To0x4x0
 from py_abac.storage.sql.model import Base, PolicyModel, SubjectTargetModel, ResourceTargetModel, ActionTargetModel
 from . import create_test_sql_engine
 
@@ -37,9 +40,9 @@ class TestSQLMigrationSet:
     def test_up_and_down(self, migration_set):
         migration_set.save_applied_number(0)
         migration_set.up()
-        assert 1 == migration_set.last_applied()
+        assert 2 == migration_set.last_applied()
         migration_set.up()
-        assert 1 == migration_set.last_applied()
+        assert 2 == migration_set.last_applied()
         migration_set.down()
         assert 0 == migration_set.last_applied()
         migration_set.down()
@@ -73,3 +76,46 @@ class TestMigration0To0x2x1:
         assert not Base.metadata.tables[SubjectTargetModel.__tablename__].exists(engine)
         assert not Base.metadata.tables[ResourceTargetModel.__tablename__].exists(engine)
         assert not Base.metadata.tables[ActionTargetModel.__tablename__].exists(engine)
+
+
+class TestMigration0x2x1To0x4x0:
+
+    @pytest.fixture
+    def storage(self, session):
+        storage = SQLStorage(scoped_session=session)
+        Migration0To0x2x1(storage).up()
+        yield storage
+        session.remove()
+
+    @pytest.fixture
+    def migration(self, storage):
+        yield Migration0x2x1To0x4x0(storage)
+
+    @staticmethod
+    def has_added_columns(engine):
+        columns = [column["name"] for column in inspect(engine).get_columns(PolicyModel.__tablename__)]
+        return {"version", "priority", "is_allowed"}.issubset(columns)
+
+    @staticmethod
+    def has_no_added_columns(engine):
+        columns = [column["name"] for column in inspect(engine).get_columns(PolicyModel.__tablename__)]
+        return not {"version", "priority", "is_allowed"}.intersection(columns)
+
+    def test_order(self, migration):
+        assert 2 == migration.order
+
+    def test_up_and_down(self, migration, storage, engine):
+        policy = Policy.from_json({"uid": "1", "rules": {}, "targets": {}, "effect": "allow", "priority": 2})
+        storage.add(policy)
+        migration.down()
+        assert self.has_no_added_columns(engine)
+        migration.down()
+
+        migration.up()
+        assert self.has_added_columns(engine)
+        policy_model = storage.session.query(PolicyModel).get("1")
+        assert PolicyCache.version(policy.to_json()) == policy_model.version
+        assert 2 == policy_model.priority
+        assert policy_model.is_allowed is True
+        migration.up()
+        assert self.has_added_columns(engine)